@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+종합 분석 실행 이력 조회/가져오기 (core.analysis_archive)
+
+- 기본: 보관소 요약 (파티션/run 수/기간/크기)
+- 심볼 지정: run 별 다음 목표/이격도/H 추이 (--field 를 주면 심볼별 열로 펼침)
+- --import: 기존 output/coin_analysis_*.xlsx 를 보관소로 (시간순, 직전 run 과 같으면 건너뜀)
+  --remove 면 보관소에 반영된(또는 이미 있던) xlsx 삭제
+
+사용 예:
+  python analysis_history.py
+  python analysis_history.py SOL --from 2025-10-01
+  python analysis_history.py SOL ETH BTC --field distance_pct --csv output/distance.csv
+  python analysis_history.py --import --remove
+"""
+from __future__ import annotations
+
+import argparse
+import glob
+import os
+import pathlib
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+
+from core.analysis_archive import COLUMNS, DEFAULT_ROOT, EXCEL_NAME, AnalysisArchive, import_excel
+
+TREND_COLUMNS = ["run", "symbol", "price", "H", "next_target", "target_price", "distance_pct", "status"]
+
+
+def import_files(archive: AnalysisArchive, files: list[str], remove: bool) -> None:
+    files = sorted((f for f in files if EXCEL_NAME.search(f)), key=lambda f: EXCEL_NAME.search(f).group(1))
+    added = 0
+    for f in files:
+        try:
+            run, rows = import_excel(pathlib.Path(f))
+        except Exception as e:
+            print(f"  {f}: 건너뜀 ({e})")
+            continue
+        ok = archive.append(run, rows)
+        added += ok
+        print(f"  {f}: {len(rows)}개 {'추가' if ok else '중복 (직전 run 과 같거나 이미 있음)'}")
+        if remove:
+            os.remove(f)
+    print(f"{len(files)}개 중 {added}개 run 추가 → {archive.root}")
+
+
+def summary(archive: AnalysisArchive) -> None:
+    parts = archive.parts()
+    if not parts:
+        print(f"분석 이력 없음: {archive.root}")
+        return
+    print(f"{'파티션':<28} {'run':>5} {'행':>7} {'크기(KB)':>9}  기간")
+    for p in parts:
+        cols = archive.load_part(p)
+        runs = pd.unique(cols["run"])
+        span = f"{runs[0]} ~ {runs[-1]}" if len(runs) else "-"
+        print(f"{p.name:<28} {len(runs):5d} {len(cols['run']):7d} {p.stat().st_size / 1024:9.1f}  {span}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="종합 분석 실행 이력 (이격도/다음 목표/H 추이)")
+    parser.add_argument("symbols", nargs="*", help="조회할 심볼 (예: SOL ETH)")
+    parser.add_argument("--from", dest="start", help="시작 (YYYY-MM-DD 또는 YYYY-MM-DDTHH:MM)")
+    parser.add_argument("--to", dest="end", help="끝 (날짜만 주면 그날 끝까지)")
+    parser.add_argument("--field", choices=[c for c in COLUMNS if c not in ("run", "symbol")],
+                        help="이 값만 run × 심볼 표로")
+    parser.add_argument("--csv", help="조회 결과 CSV 저장 경로")
+    parser.add_argument("--root", default=DEFAULT_ROOT, help="보관소 폴더")
+    parser.add_argument("--import", dest="import_files", nargs="*", metavar="XLSX",
+                        help="분석 엑셀 가져오기 (파일 생략 시 output/coin_analysis_*.xlsx)")
+    parser.add_argument("--remove", action="store_true", help="--import 후 xlsx 삭제")
+    args = parser.parse_args()
+
+    archive = AnalysisArchive(args.root)
+    if args.import_files is not None:
+        import_files(archive, args.import_files or glob.glob("output/coin_analysis_*.xlsx"), args.remove)
+        return
+    if not args.symbols:
+        summary(archive)
+        return
+
+    if args.field:
+        df = archive.pivot(args.field, args.symbols, args.start, args.end)
+    else:
+        df = archive.query(args.symbols, args.start, args.end)[TREND_COLUMNS]
+    if df.empty:
+        print("조회 결과 없음")
+        return
+    with pd.option_context("display.max_rows", None, "display.width", 200):
+        print(df.to_string(index=args.field is not None, float_format=lambda v: f"{v:,.6g}"))
+    if args.csv:
+        pathlib.Path(args.csv).parent.mkdir(parents=True, exist_ok=True)
+        df.to_csv(args.csv, index=args.field is not None)
+        print(f"저장: {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,12 @@
 import os
 import glob
+import pathlib
 import pandas as pd
 import numpy as np
 from datetime import datetime
 
+from core.compact_debug import find_debug, source as debug_source
+
 # STOP LOSS 발생 코인들
 stop_loss_coins = ['ARB', 'BONK', 'ENA', 'FIL', 'ICP', 'PENGU', 'PEPE', 'SEI', 'TRUMP', 'VET', 'WLD']
 
@@ -108,7 +111,7 @@ print("-" * 40)
 volatility_analysis = []
 for coin in stop_loss_coins:
     try:
-        df = pd.read_csv(f'debug/{coin}_debug.csv')
+        df = pd.read_csv(debug_source(find_debug(pathlib.Path('debug'), coin)))
         if not df.empty and 'close' in df.columns:
             # 최근 30일 변동성 계산
             recent_30 = df.tail(30)
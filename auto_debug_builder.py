@@ -1,6 +1,7 @@
 from __future__ import annotations
 import os
 import pathlib
+import time
 from typing import Optional
 
 import pandas as pd
@@ -11,11 +12,29 @@ from openpyxl.utils import get_column_letter
 
 from config.adapters import BinanceClient
 from universe_selector import get_top30_coins, get_top30_symbols
+from core.change_feed import ChangeFeed
+from core.compact_debug import COMPACT_SUFFIX, enabled as compact_enabled, find_debug, write_compact
 from core.phase1_5_core import run_phase1_5_simulation
+from core.fixed_point import enabled as fixed_point_enabled, run_fixed_simulation, scale_for
+from core.ohlc_ingest import ingest
+from core.metrics import BUILD_LAST_DURATION, BUILD_STAGE_SECONDS, start_metrics_server
+from core.profiling import PROFILER
+from core.state_index import state_index
+from core.symbol_index import symbol_index
+from core.timeaxis import KST_OFFSET_MS, day_str
+from core.universe_store import universe_store
 
 
 OUTPUT_DIR = pathlib.Path("debug")
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+UNIVERSE_CONSUMER = "auto_debug_builder"  # core.universe_store 커서 이름 (마지막으로 처리한 유니버스 버전)
+
+# 거래는 되지만 분석 대상이 아닌 페어 (미상장/데이터 없음은 core.symbol_index 가 걸러냄)
+EXCLUDE_PAIRS = {
+    "USDTUSDT", "USDCUSDT", "USDEUSDT", "USDSUSDT", "DAIUSDT", "USD1USDT", "BFUSDUSDT",  # 스테이블코인
+    "WBTCUSDT", "WBETHUSDT", "WEETHUSDT", "STETHUSDT", "WSTETHUSDT", "BNSOLUSDT",  # 래핑/스테이킹 토큰
+    "BNBUSDT", "ENAUSDT",  # 추가 제외 코인
+}
 
 
 def convert_csv_to_excel(csv_path: pathlib.Path) -> pathlib.Path:
@@ -53,37 +72,74 @@ def convert_csv_to_excel(csv_path: pathlib.Path) -> pathlib.Path:
     return excel_path
 
 
-def build_all(limit_days: int = 1200, symbols: Optional[list[str]] = None, top_n: int = 100) -> list[str]:
+def retire_symbols(pairs: list[str]) -> list[str]:
+    """유니버스에서 이탈한 심볼의 디버그 파일을 debug/retired/ 로 이동 (재빌드 없이 모니터링 대상에서 제외)"""
+    retired_dir = OUTPUT_DIR / "retired"
+    moved = []
+    for pair in pairs:
+        for path in OUTPUT_DIR.glob(f"{pair.replace('USDT', '')}_debug.*"):
+            retired_dir.mkdir(parents=True, exist_ok=True)
+            os.replace(path, retired_dir / path.name)
+            moved.append(path.name)
+    return moved
+
+
+def build_all(
+    limit_days: int = 1200, symbols: Optional[list[str]] = None, top_n: int = 100, retire_exited: bool = False,
+    fixed_point: bool = False, compact: bool = False, notify_changes: bool = False,
+) -> list[str]:
     """
     Build per-symbol debug CSVs for Top N (or provided symbols).
     - Downloads 일봉 OHLCV from Binance.
     - Computes Phase 1.5 debug table (H 루프 보정/리셋 포함).
-    - Saves to debug/{SYMBOL}_debug.csv
+    - Saves to debug/{SYMBOL}_debug.csv (+ cache/state_index/{SYMBOL}.npz checkpoints for state_as_of)
+    - fixed_point=True (or OMG_FIXED_POINT=1): int64 tick-scaled engine for symbols with a known tickSize.
+    - compact=True (or OMG_COMPACT_DEBUG=1): debug/{SYMBOL}_debug.npz (events + checkpoints, no Excel copy);
+      the symbol's old CSV/xlsx is removed. Fixed-point symbols still get a full CSV.
+    - Writes a change feed (output/changes, core.change_feed) of symbols whose events/mode/next target/H changed;
+      notify_changes=True sends it to Telegram when anything changed.
     - Excludes stablecoins, wrapped tokens, and unsupported symbols.
     Returns list of produced file paths (as str).
     """
     client = BinanceClient()
+    build_started = time.perf_counter()
     
     if symbols:
         syms = symbols
         print(f"[INFO] Using provided symbols: {len(syms)}개")
     else:
         # Top N 코인 리스트 가져오기
-        coins = get_top30_coins()  # universe_selector에서 TOP_N=100으로 설정됨
+        with PROFILER.stage("universe_fetch"):
+            coins = get_top30_coins()  # universe_selector에서 TOP_N=100으로 설정됨
         syms = [coin["Symbol"] for coin in coins[:top_n]]
         print(f"[INFO] Using Top {top_n} coins: {len(syms)}개")
+        # 지난 빌드가 처리한 유니버스 이후에 새 버전이 있을 때만 (TTL 재사용 시 같은 편입/이탈 반복 방지)
+        store = universe_store()
+        diff = store.diff_since(UNIVERSE_CONSUMER)
+        if diff is not None:
+            if diff.from_version is not None:
+                if diff.entered:
+                    print(f"[INFO] 신규 편입 (전체 이력 필요): {', '.join(diff.entered)}")
+                if retire_exited and diff.exited:
+                    moved = retire_symbols(diff.exited)
+                    print(f"[INFO] 이탈 심볼 은퇴: {len(moved)}개 파일 → {OUTPUT_DIR / 'retired'}")
+            store.advance(UNIVERSE_CONSUMER, diff.to_version)
     
-    # Binance API 미지원 심볼 제외 (스테이블코인, 래핑 토큰, 데이터 없음)
-    exclude_symbols = {
-        "USDTUSDT", "USDCUSDT", "USDEUSDT", "USDSUSDT", "DAIUSDT",  # 스테이블코인
-        "WBTCUSDT", "WBETHUSDT", "WEETHUSDT", "STETHUSDT", "WSTETHUSDT",  # 래핑 토큰
-        "FIGR_HELOCUSDT", "HYPEUSDT", "LEOUSDT", "USDT0USDT", "SUSDEUSDT",  # API 에러
-        "MUSDT", "OKBUSDT", "WLFIUSDT", "BGBUSDT", "MNTUSDT", "CROUSDT",  # 데이터 없음
-        "USD1USDT", "BFUSDUSDT", "BNSOLUSDT", "BNBUSDT", "ENAUSDT"  # 추가 제외 코인
-    }
-    syms = [s for s in syms if s not in exclude_symbols]
+    # 정책상 제외 (스테이블코인, 래핑 토큰 등) + Binance 미상장/거래중지 페어 (exchangeInfo 인덱스)
+    syms = [s for s in syms if s not in EXCLUDE_PAIRS]
+    index = symbol_index()
+    syms, rejected = index.filter_tradable(syms)
+    if rejected:
+        print(f"[INFO] 거래 불가 {len(rejected)}개 제외: " + ", ".join(f"{s}({r})" for s, r in sorted(rejected.items())))
 
     produced: list[str] = []
+    use_fixed = fixed_point_enabled(fixed_point)
+    if use_fixed:
+        print("[INFO] 고정소수점 엔진 (tickSize 기준 int64, tickSize 모르는 심볼은 float 엔진)")
+    use_compact = compact_enabled(compact)
+    if use_compact:
+        print("[INFO] 압축 디버그 형식 (이벤트 + 체크포인트 .npz, Excel 변환 생략)")
+    feed = ChangeFeed()
     total_syms = len(syms)
     successful = 0
     failed = 0
@@ -99,55 +155,95 @@ def build_all(limit_days: int = 1200, symbols: Optional[list[str]] = None, top_n
         sym_name = sym.replace("USDT", "")
         print(f"[{i:3d}/{total_syms}] {sym_name:<8} ({sym}) 처리 중...", end=" ")
         
-        try:
-            # OHLC 데이터 가져오기
-            df = client.get_ohlc_daily(sym, limit=limit_days)
-            if df.empty:
-                print("FAIL 데이터 없음")
-                failed += 1
-                continue
+        with PROFILER.symbol(sym):
+            try:
+                # OHLC 데이터 가져오기
+                with BUILD_STAGE_SECONDS.time(stage="fetch"):
+                    df = client.get_ohlc_daily(sym, limit=limit_days)
+                if df.empty:
+                    print("FAIL 데이터 없음")
+                    failed += 1
+                    continue
+                if len(df) < min(limit_days, 1500):  # 요청보다 짧은 이력 = 첫 일봉이 상장일
+                    index.note_listing(sym, day_str(int(df['day'].iloc[0])))
             
-            # Convert DataFrame to list of dictionaries for run_phase1_5_simulation
-            ohlc_data = []
-            for _, row in df.iterrows():
-                # Convert date to timestamp in milliseconds
-                timestamp_ms = int(row['date'].timestamp() * 1000)
-                
-                # 2025-10-09 날짜의 저가 데이터를 종가로 대체 (이상 데이터 보정)
-                date_str = row['date'].strftime('%Y-%m-%d')
-                low_value = float(row['close']) if date_str == '2025-10-09' else float(row['low'])
-                
-                ohlc_data.append({
-                    'closeTime': timestamp_ms,  # Use closeTime as expected by run_phase1_5_simulation
-                    'open': float(row['open']),
-                    'high': float(row['high']),
-                    'low': low_value,
-                    'close': float(row['close']),
-                    'volume': float(row['volume'])
-                })
+                # Convert DataFrame to list of dictionaries for run_phase1_5_simulation
+                with PROFILER.stage("kline_parse"):
+                    # openTime = 실제 UTC 시가 시각 (보정표/연속성 검사 기준)
+                    # closeTime = 그 날짜의 KST 자정 (엔진 라벨 = closeTime 의 UTC 날짜, 기존 출력 유지)
+                    cols = ['openTime', 'open', 'high', 'low', 'close', 'volume']
+                    ohlc_data = [
+                        {'openTime': int(t), 'closeTime': int(t) - KST_OFFSET_MS, 'open': o, 'high': h, 'low': l, 'close': c, 'volume': v}
+                        for t, o, h, l, c, v in zip(*(df[col].tolist() for col in cols))
+                    ]
+
+                # 검증 + 보정 오버레이 (config/ohlc_corrections.json)
+                with PROFILER.stage("ingest"):
+                    ohlc_data, report = ingest(sym, ohlc_data)
+                if not report.ok:
+                    print(f"\n      [ingest] {report.summary()}", end=" ")
             
-            # Phase 1.5 시뮬레이션 실행
-            out_path = OUTPUT_DIR / f"{sym_name}_debug.csv"
+                # Phase 1.5 시뮬레이션 실행
+                out_path = OUTPUT_DIR / f"{sym_name}_debug.csv"
+                with PROFILER.stage("change_feed"):
+                    feed.before(sym_name, find_debug(OUTPUT_DIR, sym_name))
             
-            run_phase1_5_simulation(
-                symbol=sym,
-                ohlc=ohlc_data,
-                seed_H=None,  # H는 첫 사이클 시작 시 자동 설정
-                out_csv=out_path,
-                limit_days=limit_days
-            )
+                scale = scale_for(sym) if use_fixed else None
+                if use_compact and scale is None:
+                    packed_path = OUTPUT_DIR / f"{sym_name}{COMPACT_SUFFIX}"
+                    with BUILD_STAGE_SECONDS.time(stage="simulate"), PROFILER.stage("simulation"):
+                        write_compact(sym, ohlc_data, packed_path)
+                    for stale in (out_path, out_path.with_suffix(".xlsx")):
+                        stale.unlink(missing_ok=True)
+                    with PROFILER.stage("change_feed"):
+                        feed.after(sym_name, packed_path)
+                    produced.append(str(packed_path))
+                    successful += 1
+                    print(f"OK 완료 ({len(ohlc_data)}일 데이터, 압축 저장)")
+                    continue
+
+                with BUILD_STAGE_SECONDS.time(stage="simulate"), PROFILER.stage("simulation"):
+                    if scale is not None:
+                        run_fixed_simulation(sym, ohlc_data, scale, out_path)
+                    else:
+                        run_phase1_5_simulation(
+                            symbol=sym,
+                            ohlc=ohlc_data,
+                            seed_H=None,  # H는 첫 사이클 시작 시 자동 설정
+                            out_csv=out_path,
+                            limit_days=limit_days
+                        )
+
+                # as-of 조회용 체크포인트 인덱스 (core.state_index, 압축 형식은 파일 자체가 인덱스)
+                if scale is None:
+                    with PROFILER.stage("state_index"):
+                        state_index().record(sym, ohlc_data, out_path)
             
-            # CSV를 Excel로 변환
-            excel_path = convert_csv_to_excel(out_path)
+                with PROFILER.stage("change_feed"):
+                    feed.after(sym_name, out_path)
+
+                # CSV를 Excel로 변환
+                with BUILD_STAGE_SECONDS.time(stage="excel"), PROFILER.stage("excel_convert"):
+                    excel_path = convert_csv_to_excel(out_path)
             
-            produced.append(str(excel_path))
-            successful += 1
-            print(f"OK 완료 ({len(ohlc_data)}일 데이터, Excel 변환)")
+                produced.append(str(excel_path))
+                successful += 1
+                print(f"OK 완료 ({len(ohlc_data)}일 데이터, Excel 변환)")
             
-        except Exception as e:
-            failed += 1
-            print(f"FAIL 실패: {str(e)[:50]}...")
-            continue
+            except Exception as e:
+                failed += 1
+                print(f"FAIL 실패: {str(e)[:50]}...")
+                continue
+    
+    feed_path = feed.write()
+    print(f"[INFO] 변경 피드: {len(feed.changed)}/{len(feed.built)}개 심볼 변경 → {feed_path}")
+    if notify_changes and feed.changed:
+        from telegram_notifier import send_telegram_message
+
+        send_telegram_message(feed.message())
+
+    BUILD_LAST_DURATION.set(time.perf_counter() - build_started)
+    PROFILER.finish()
     
     # 결과 요약
     print(f"\n{'='*60}")
@@ -167,12 +263,28 @@ if __name__ == "__main__":
     parser.add_argument("--top-n", type=int, default=100, help="처리할 Top N 코인 수 (기본: 100)")
     parser.add_argument("--limit-days", type=int, default=1200, help="데이터 기간 (기본: 1200일)")
     parser.add_argument("--symbols", nargs="+", help="특정 심볼들만 처리 (예: BTCUSDT ETHUSDT)")
+    parser.add_argument("--retire-exited", action="store_true", help="유니버스에서 이탈한 심볼의 디버그 파일을 debug/retired/ 로 이동")
+    parser.add_argument("--metrics-port", type=int, help="빌드 중 메트릭 HTTP 엔드포인트 포트 (/metrics)")
+    parser.add_argument("--fixed-point", action="store_true", help="tickSize 기준 정수 가격 엔진 사용 (환경변수 OMG_FIXED_POINT=1 과 동일)")
+    parser.add_argument("--compact", action="store_true", help="이벤트 + 체크포인트만 저장하는 압축 디버그 형식 (환경변수 OMG_COMPACT_DEBUG=1 과 동일)")
+    parser.add_argument("--notify-changes", action="store_true", help="상태가 바뀐 심볼이 있으면 변경 피드 요약을 텔레그램으로 전송")
+    parser.add_argument("--profile", action="store_true", help="단계별 프로파일링 리포트 저장 (output/profile, 환경변수 OMG_PROFILE=1 과 동일)")
     
     args = parser.parse_args()
+    PROFILER.enable_from_env("auto_debug_builder", args.profile)
+    
+    if args.metrics_port:
+        start_metrics_server(args.metrics_port)
     
     if args.symbols:
-        files = build_all(limit_days=args.limit_days, symbols=args.symbols)
+        files = build_all(
+            limit_days=args.limit_days, symbols=args.symbols,
+            fixed_point=args.fixed_point, compact=args.compact, notify_changes=args.notify_changes,
+        )
     else:
-        files = build_all(limit_days=args.limit_days, top_n=args.top_n)
+        files = build_all(
+            limit_days=args.limit_days, top_n=args.top_n, retire_exited=args.retire_exited,
+            fixed_point=args.fixed_point, compact=args.compact, notify_changes=args.notify_changes,
+        )
     
     print(f"\n완료! 총 {len(files)}개 파일 생성 완료!")
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+일봉(또는 --interval 1h/5m) 전체 이력 백필 → 로컬 저장소 (data/klines/<interval>)
+
+상장일부터 저장소에 없는 구간만 1000캔들 단위로 나눠 병렬 조회하고, 병합/중복 제거 후
+누락 구간을 다시 조회한다. 속도는 분당 weight 예산(--weight-per-minute)이 결정한다.
+
+사용 예:
+  python backfill_klines.py --top-n 100                    # 유니버스 전체 (콜드 스타트)
+  python backfill_klines.py --entrants                     # 직전 유니버스 대비 신규 편입만
+  python backfill_klines.py --symbols BTCUSDT ETHUSDT --since 2020-01-01
+  OMG_SIM_EXCHANGE=http://127.0.0.1:8900 python backfill_klines.py --top-n 100 --workers 16
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.backfill import DEFAULT_WEIGHT_PER_MINUTE, Backfiller
+from core.kline_store import DEFAULT_ROOT, INTERVAL_MS, KlineStore
+from core.timeaxis import day_to_ms, ms_str, parse_day
+
+
+def main():
+    parser = argparse.ArgumentParser(description="일봉 전체 이력 병렬 백필 (로컬 저장소)")
+    parser.add_argument("--symbols", nargs="+", help="백필할 페어 (예: BTCUSDT ETHUSDT)")
+    parser.add_argument("--top-n", type=int, help="유니버스 Top N 전체")
+    parser.add_argument("--entrants", action="store_true", help="유니버스 diff 의 신규 편입 심볼만")
+    parser.add_argument("--since", help="이 날짜 이후만 (YYYY-MM-DD, 기본: 상장일부터)")
+    parser.add_argument("--root", default=DEFAULT_ROOT, help="저장소 경로")
+    parser.add_argument("--interval", default="1d", choices=sorted(INTERVAL_MS), help="캔들 간격 (세션 봉 재구성용 1h/5m 등)")
+    parser.add_argument("--workers", type=int, default=8, help="동시 요청 수")
+    parser.add_argument("--weight-per-minute", type=int, default=DEFAULT_WEIGHT_PER_MINUTE, help="분당 weight 예산")
+    parser.add_argument("--rounds", type=int, default=3, help="누락 재조회 최대 라운드")
+    args = parser.parse_args()
+
+    if args.symbols:
+        symbols = args.symbols
+    elif args.entrants:
+        from core.universe_store import universe_store
+
+        diff = universe_store().diff()
+        symbols = diff.entered if diff else []
+        print(diff.summary() if diff else "유니버스 스냅샷이 없습니다.")
+    elif args.top_n:
+        from universe_selector import get_top30_coins
+
+        symbols = [c["Symbol"] for c in get_top30_coins()[: args.top_n]]
+    else:
+        parser.error("--symbols, --top-n, --entrants 중 하나가 필요합니다")
+    if not symbols:
+        print("백필 대상이 없습니다.")
+        return
+
+    since_ms = None
+    if args.since:
+        since_ms = day_to_ms(parse_day(args.since))
+
+    backfiller = Backfiller(KlineStore(args.root, args.interval), args.workers, args.weight_per_minute, args.rounds)
+    print(f"백필 대상: {len(symbols)}개 심볼, 동시 {args.workers}, 분당 weight {args.weight_per_minute}")
+    started = time.perf_counter()
+    results = backfiller.run(symbols, since_ms)
+    elapsed = time.perf_counter() - started
+
+    print(f"\n{'='*60}")
+    incomplete = 0
+    for sym, res in sorted(results.items()):
+        meta = backfiller.store.meta(sym)
+        listed = ms_str(meta["listed"]) if meta.get("listed") else "-"
+        flag = ""
+        if res.gaps or res.failed:
+            incomplete += 1
+            flag = f"  누락 {len(res.gaps)}구간, 실패 {res.failed}건"
+        print(f"{sym:<14} 상장 {listed}  {res.candles:>5}캔들 (+{res.added}){flag}")
+    added = sum(r.added for r in results.values())
+    print(f"{'='*60}")
+    print(f"요청 {backfiller.requests}건, 추가 {added:,}캔들, {elapsed:.1f}s "
+          f"(예산 대기 {backfiller.budget.waited_sec:.1f}s)")
+    if incomplete:
+        print(f"불완전: {incomplete}개 심볼 — 다시 실행하면 남은 구간만 조회")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
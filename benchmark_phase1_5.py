@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Phase 1.5 오프라인 벤치마크 (합성 시장 데이터, 네트워크 불필요)
+
+스위트:
+  engine    run_phase1_5_simulation (디버그 CSV 생성)        → candles/s
+            (--engine array: core.array_engine, 기준값 키에 -array 접미사)
+  analysis  CoinAnalysisExcel.get_latest_buy_progress       → symbols/s
+  monitor   TriggerTable 평가 + 리더보드 갱신 (틱 단위)       → evaluations/s
+
+규모 프리셋 (--scale):
+  s = 100 심볼 × 1,000일 / m = 1,000 × 2,000 / l = 10,000 × 5,000
+  (--symbols / --days 로 직접 지정 가능)
+
+기준값(benchmark_baselines.json)과 비교해 처리량이 --tolerance 이상 떨어지거나
+peak RSS 가 그만큼 늘면 회귀로 표시하고 종료 코드 1 을 반환한다.
+해당 규모/엔진의 기준값이 없으면 종료 코드 2 (저장소에는 s 규모 reference/array 기준값이 들어 있음).
+
+사용 예:
+  python benchmark_phase1_5.py --scale s
+  python benchmark_phase1_5.py --scale m --workers 4
+  python benchmark_phase1_5.py --scale s --save-baseline
+  python benchmark_phase1_5.py --scale s --engine array
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import multiprocessing as mp
+import os
+import pathlib
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.leaderboard import DivergenceLeaderboard
+from core.array_engine import run_array_simulation
+from core.phase1_5_core import run_phase1_5_simulation
+from core.phase1_5_state import CSV_HEADER, state_from_snapshot
+from core.profiling import RssSampler, psutil
+from core.synthetic_market import event_counts, generate_ohlc, synthetic_symbols
+from core.triggers import TriggerTable
+
+SCALES = {
+    "s": (100, 1000),
+    "m": (1000, 2000),
+    "l": (10000, 5000),
+}
+BASELINE_FILE = pathlib.Path("benchmark_baselines.json")
+REPORT_DIR = pathlib.Path("output/benchmarks")
+MONITOR_TICKS = 100  # 심볼당 가격 틱 수
+
+
+def _rss_mb() -> Optional[float]:
+    if not psutil:
+        return None
+    return round(psutil.Process().memory_info().rss / 1024 / 1024, 1)
+
+
+# ===== 심볼 단위 작업 (워커 프로세스에서 실행) =====
+
+def _run_symbol(args: Tuple[str, int, int, str, str]) -> Dict[str, Any]:
+    """합성 일봉 생성 → 엔진 → 분석 1회. 디버그 CSV 는 분석 후 삭제 (디스크 사용량 고정)"""
+    from coin_analysis_excel import CoinAnalysisExcel
+
+    symbol, days, seed, work_dir, engine = args
+    name = symbol.replace("USDT", "")
+    ohlc = generate_ohlc(days, seed=seed, symbol=symbol)
+    out_csv = pathlib.Path(work_dir) / f"{name}_debug.csv"
+
+    t0 = time.perf_counter()
+    if engine == "array":
+        run_array_simulation(symbol, ohlc, out_csv)
+    else:
+        run_phase1_5_simulation(symbol=symbol, ohlc=ohlc, seed_H=None, out_csv=out_csv, limit_days=0)
+    engine_sec = time.perf_counter() - t0
+
+    analyzer = CoinAnalysisExcel()
+    analyzer.state_dir = pathlib.Path(work_dir)
+    t0 = time.perf_counter()
+    progress = analyzer.get_latest_buy_progress(name)
+    analysis_sec = time.perf_counter() - t0
+
+    with open(out_csv, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))[1:]
+    out_csv.unlink()
+    last = dict(zip(CSV_HEADER, rows[-1])) if rows else {}
+    return {
+        "symbol": symbol,
+        "candles": len(ohlc) - 1,  # 첫 캔들은 엔진이 건너뜀
+        "engine_sec": engine_sec,
+        "analysis_sec": analysis_sec,
+        "analysis_status": progress.get("status"),
+        "events": event_counts(rows),
+        "snapshot": last,
+        "close": ohlc[-1]["close"],
+        "rss_mb": _rss_mb(),
+    }
+
+
+# ===== 스위트 =====
+
+def bench_engine_and_analysis(
+    n: int, days: int, seed: int, workers: int, engine_name: str = "reference"
+) -> Tuple[Dict, Dict, List[Dict]]:
+    work_dir = tempfile.mkdtemp(prefix="omg_bench_")
+    jobs = [(sym, days, seed, work_dir, engine_name) for sym in synthetic_symbols(n)]
+    sampler = RssSampler()
+    sampler.start()
+    started = time.perf_counter()
+    try:
+        if workers > 1:
+            with mp.Pool(workers) as pool:
+                results = list(pool.imap_unordered(_run_symbol, jobs, chunksize=max(1, n // (workers * 8))))
+        else:
+            results = [_run_symbol(job) for job in jobs]
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    wall = time.perf_counter() - started
+    sampler.stop()
+
+    candles = sum(r["candles"] for r in results)
+    engine_cpu = sum(r["engine_sec"] for r in results)
+    analysis_cpu = sum(r["analysis_sec"] for r in results)
+    events: Dict[str, int] = {}
+    for r in results:
+        for k, v in r["events"].items():
+            events[k] = events.get(k, 0) + v
+    worker_rss = [r["rss_mb"] for r in results if r["rss_mb"] is not None]
+    peak_rss = max([sampler.peak / 1024 / 1024] + worker_rss) if (worker_rss or sampler.peak) else None
+
+    engine = {
+        "symbols": n,
+        "days": days,
+        "candles": candles,
+        "cpu_sec": round(engine_cpu, 3),
+        "wall_sec": round(wall, 3),
+        "throughput": round(candles / engine_cpu, 1) if engine_cpu else None,  # candles/s (워커 1개 기준)
+        "wall_throughput": round(candles / wall, 1) if wall else None,
+        "peak_rss_mb": round(peak_rss, 1) if peak_rss else None,
+        "events": events,
+    }
+    statuses: Dict[str, int] = {}
+    for r in results:
+        statuses[r["analysis_status"]] = statuses.get(r["analysis_status"], 0) + 1
+    analysis = {
+        "symbols": n,
+        "days": days,
+        "cpu_sec": round(analysis_cpu, 3),
+        "throughput": round(n / analysis_cpu, 1) if analysis_cpu else None,  # symbols/s
+        "peak_rss_mb": engine["peak_rss_mb"],
+        "statuses": statuses,
+    }
+    return engine, analysis, results
+
+
+def bench_monitor(results: List[Dict], seed: int, ticks: int = MONITOR_TICKS) -> Dict:
+    """마지막 스냅샷 상태로 트리거 테이블을 만들고 랜덤워크 가격 틱으로 평가"""
+    sampler = RssSampler()
+    sampler.start()
+    table = TriggerTable(near_pct=5.0)
+    board = DivergenceLeaderboard()
+    prices: Dict[str, float] = {}
+
+    t0 = time.perf_counter()
+    for r in results:
+        if r["snapshot"]:
+            table.compile(r["symbol"], state_from_snapshot(r["snapshot"]))
+            prices[r["symbol"]] = r["close"]
+    compile_sec = time.perf_counter() - t0
+
+    rng = random.Random(seed)
+    steps = [[rng.gauss(0.0, 0.004) for _ in range(len(prices))] for _ in range(ticks)]
+    symbols = list(prices)
+    evaluations = hits = 0
+    t0 = time.perf_counter()
+    for step in steps:
+        for sym, move in zip(symbols, step):
+            price = prices[sym] = prices[sym] * (1.0 + move)
+            found = table.evaluate(sym, price)
+            evaluations += 1
+            hits += len(found)
+            trg = table.next_buy(sym)
+            if trg:
+                board.update(sym, price, trg.name, trg.price)
+        board.top(10)
+    eval_sec = time.perf_counter() - t0
+    sampler.stop()
+    return {
+        "symbols": len(symbols),
+        "ticks": ticks,
+        "compile_sec": round(compile_sec, 4),
+        "cpu_sec": round(eval_sec, 3),
+        "throughput": round(evaluations / eval_sec, 1) if eval_sec else None,  # evaluations/s
+        "hits": hits,
+        "peak_rss_mb": round(sampler.peak / 1024 / 1024, 1) if sampler.peak else None,
+    }
+
+
+# ===== 기준값 비교 =====
+
+def load_baselines(path: pathlib.Path = BASELINE_FILE) -> Dict[str, Dict]:
+    if path.exists():
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            print(f"기준값 파일 읽기 실패: {e}")
+    return {}
+
+
+def compare(name: str, current: Dict, baseline: Optional[Dict], tolerance: float) -> List[str]:
+    """회귀 항목 목록 (처리량 감소 / 메모리 증가)"""
+    if not baseline:
+        return []
+    problems = []
+    base_tp, cur_tp = baseline.get("throughput"), current.get("throughput")
+    if base_tp and cur_tp and cur_tp < base_tp * (1.0 - tolerance):
+        problems.append(f"{name}: 처리량 {cur_tp:,.0f}/s < 기준 {base_tp:,.0f}/s ({(cur_tp / base_tp - 1) * 100:+.1f}%)")
+    base_mem, cur_mem = baseline.get("peak_rss_mb"), current.get("peak_rss_mb")
+    if base_mem and cur_mem and cur_mem > base_mem * (1.0 + tolerance):
+        problems.append(f"{name}: peak RSS {cur_mem:.0f}MB > 기준 {base_mem:.0f}MB ({(cur_mem / base_mem - 1) * 100:+.1f}%)")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Phase 1.5 오프라인 벤치마크 (합성 데이터)")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="s", help="규모 프리셋 (s/m/l)")
+    parser.add_argument("--symbols", type=int, help="심볼 수 (프리셋 대신)")
+    parser.add_argument("--days", type=int, help="심볼당 일수 (프리셋 대신)")
+    parser.add_argument("--seed", type=int, default=0, help="합성 데이터 seed")
+    parser.add_argument("--workers", type=int, default=1, help="엔진/분석 워커 프로세스 수")
+    parser.add_argument("--engine", choices=("reference", "array"), default="reference", help="engine 스위트 구현 (기준값은 엔진별로 따로 저장)")
+    parser.add_argument("--ticks", type=int, default=MONITOR_TICKS, help="모니터 스위트 심볼당 틱 수")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="회귀 판정 허용 오차 (기본 20%%)")
+    parser.add_argument("--baseline", default=str(BASELINE_FILE), help="기준값 JSON 경로")
+    parser.add_argument("--save-baseline", action="store_true", help="이번 결과를 기준값으로 저장")
+    args = parser.parse_args()
+
+    n, days = SCALES[args.scale]
+    n = args.symbols or n
+    days = args.days or days
+    key = f"{n}x{days}" + ("" if args.engine == "reference" else f"-{args.engine}")
+
+    print(f"{'='*60}")
+    print(f"Phase 1.5 벤치마크: {n:,} 심볼 × {days:,}일 (seed={args.seed}, workers={args.workers}, engine={args.engine})")
+    print(f"{'='*60}")
+
+    engine, analysis, results = bench_engine_and_analysis(n, days, args.seed, args.workers, args.engine)
+    print(f"engine   : {engine['throughput']:>12,.0f} candles/s  (wall {engine['wall_throughput']:,.0f}/s, {engine['candles']:,} candles, peak {engine['peak_rss_mb']} MB)")
+    print(f"           이벤트: {engine['events']}")
+    print(f"analysis : {analysis['throughput']:>12,.1f} symbols/s  ({analysis['cpu_sec']:.2f}s)")
+    monitor = bench_monitor(results, args.seed, args.ticks)
+    print(f"monitor  : {monitor['throughput']:>12,.0f} evals/s    ({monitor['symbols']:,} 심볼 × {monitor['ticks']} 틱, hit {monitor['hits']:,})")
+
+    suites = {"engine": engine, "analysis": analysis, "monitor": monitor}
+    baseline_path = pathlib.Path(args.baseline)
+    baselines = load_baselines(baseline_path)
+    problems: List[str] = []
+    for name, cur in suites.items():
+        problems += compare(name, cur, baselines.get(key, {}).get(name), args.tolerance)
+
+    REPORT_DIR.mkdir(parents=True, exist_ok=True)
+    report = {
+        "started": datetime.now().isoformat(timespec="seconds"),
+        "host": platform.node(),
+        "python": platform.python_version(),
+        "scale": key,
+        "seed": args.seed,
+        "workers": args.workers,
+        "engine": args.engine,
+        "suites": suites,
+        "regressions": problems,
+    }
+    report_path = REPORT_DIR / f"bench_{key}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    report_path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"리포트 저장: {report_path}")
+
+    if args.save_baseline:
+        baselines[key] = {
+            name: {"throughput": cur["throughput"], "peak_rss_mb": cur["peak_rss_mb"]}
+            for name, cur in suites.items()
+        }
+        baselines[key]["recorded"] = {"at": report["started"], "host": report["host"], "workers": args.workers}
+        baseline_path.write_text(json.dumps(baselines, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"기준값 저장: {baseline_path} [{key}]")
+    elif key not in baselines:
+        # 기준값이 없으면 회귀 판정을 할 수 없으므로 통과로 취급하지 않는다
+        print(f"\n⚠ 기준값 없음 [{key}] ({baseline_path}) — 회귀 판정 불가. --save-baseline 으로 먼저 기록하세요")
+        sys.exit(2)
+
+    if problems:
+        print("\n⚠ 성능 회귀:")
+        for p in problems:
+            print(f"  - {p}")
+        sys.exit(1)
+    print("회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,17 @@
 import os
-import glob
+import pathlib
+import sys
+
+import numpy as np
 import pandas as pd
-from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.compact_debug import debug_files as debug_paths, source as debug_source
+from core.timeaxis import day_str, months, parse_days, years
 
 # DEBUG 파일들에서 날짜 범위 확인
-debug_files = glob.glob('debug/*_debug.csv')
+debug_files = [str(p) for p in debug_paths(pathlib.Path('debug')).values()]  # CSV 또는 압축(.npz)
 
 if not debug_files:
     print("DEBUG 파일을 찾을 수 없습니다.")
@@ -19,20 +26,17 @@ valid_files = 0
 
 for file in debug_files:
     try:
-        df = pd.read_csv(file)
+        df = pd.read_csv(debug_source(file))
         if 'date' in df.columns and not df.empty:
-            # 날짜 컬럼을 datetime으로 변환
-            df['date'] = pd.to_datetime(df['date'])
-            dates = df['date'].tolist()
-            all_dates.extend(dates)
+            # 날짜 컬럼을 epoch-day 정수로 변환 (core.timeaxis)
+            days = parse_days(df['date'].to_numpy())
+            all_dates.append(days)
             valid_files += 1
             
             if file_count < 5:  # 처음 5개 파일만 상세 출력
-                coin_name = os.path.basename(file).replace('_debug.csv', '')
-                min_date = df['date'].min()
-                max_date = df['date'].max()
+                coin_name = os.path.basename(file).rsplit('_debug.', 1)[0]
                 row_count = len(df)
-                print(f"{coin_name:8}: {min_date.strftime('%Y-%m-%d')} ~ {max_date.strftime('%Y-%m-%d')} ({row_count}일)")
+                print(f"{coin_name:8}: {day_str(days.min())} ~ {day_str(days.max())} ({row_count}일)")
             
             file_count += 1
     except Exception as e:
@@ -41,28 +45,28 @@ for file in debug_files:
 print(f"\n처리된 파일: {valid_files}개")
 
 if all_dates:
-    all_dates = pd.to_datetime(all_dates)
-    min_date = all_dates.min()
-    max_date = all_dates.max()
-    total_days = (max_date - min_date).days + 1
+    all_dates = np.concatenate(all_dates)
+    min_date = int(all_dates.min())
+    max_date = int(all_dates.max())
+    total_days = max_date - min_date + 1
     
     print(f"\n전체 날짜 범위:")
-    print(f"시작일: {min_date.strftime('%Y-%m-%d')}")
-    print(f"종료일: {max_date.strftime('%Y-%m-%d')}")
+    print(f"시작일: {day_str(min_date)}")
+    print(f"종료일: {day_str(max_date)}")
     print(f"총 기간: {total_days}일")
-    print(f"년도 범위: {min_date.year}년 ~ {max_date.year}년")
+    print(f"년도 범위: {day_str(min_date)[:4]}년 ~ {day_str(max_date)[:4]}년")
     
     # 년도별 데이터 분포
     print(f"\n년도별 데이터 분포:")
-    year_counts = all_dates.dt.year.value_counts().sort_index()
+    year_counts = pd.Series(years(all_dates)).value_counts().sort_index()
     for year, count in year_counts.items():
         print(f"{year}년: {count:,}개 데이터")
     
     # 월별 데이터 분포 (최근 2년)
-    recent_dates = all_dates[all_dates >= '2023-01-01']
-    if not recent_dates.empty:
+    recent_dates = all_dates[all_dates >= parse_days(['2023-01-01'])[0]]
+    if recent_dates.size:
         print(f"\n월별 데이터 분포 (2023년 이후):")
-        month_counts = recent_dates.dt.to_period('M').value_counts().sort_index()
+        month_counts = pd.Series(months(recent_dates)).value_counts().sort_index()
         for month, count in month_counts.items():
             print(f"{month}: {count:,}개 데이터")
 
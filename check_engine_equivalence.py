@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Phase 1.5 엔진 동등성 검사
+
+run_phase1_5_simulation(reference) 과 후보 엔진의 디버그 CSV 출력을
+무작위 합성 시계열 + debug/*.csv 실데이터로 행 단위 비교한다.
+불일치가 나오면 최소 재현 시계열로 줄여 output/equivalence/ 에 저장하고 종료 코드 1.
+
+사용 예:
+  python check_engine_equivalence.py                       # 등록된 모든 후보, 무작위 200개
+  python check_engine_equivalence.py --engine stepper --random 1000 --days 3000
+  python check_engine_equivalence.py --no-recorded --seed 7
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import pathlib
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Tuple
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.equivalence import ABS_TOL, ENGINES, REL_TOL, check, random_series, recorded_series, shrink
+
+REPRO_DIR = pathlib.Path("output/equivalence")
+
+
+def save_repro(engine: str, symbol: str, ohlc: List[Dict[str, Any]], mismatch) -> pathlib.Path:
+    REPRO_DIR.mkdir(parents=True, exist_ok=True)
+    path = REPRO_DIR / f"repro_{engine}_{symbol}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    path.write_text(json.dumps({
+        "engine": engine,
+        "symbol": symbol,
+        "mismatch": str(mismatch),
+        "ohlc": ohlc,
+    }, ensure_ascii=False, indent=1), encoding="utf-8")
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Phase 1.5 엔진 동등성 검사 (reference vs candidate)")
+    parser.add_argument("--engine", nargs="+", choices=sorted(ENGINES), help="검사할 후보 엔진 (기본: 전체)")
+    parser.add_argument("--random", type=int, default=200, help="무작위 시계열 개수")
+    parser.add_argument("--days", type=int, default=1500, help="무작위 시계열 최대 길이")
+    parser.add_argument("--seed", type=int, default=0, help="무작위 seed")
+    parser.add_argument("--debug-dir", default="debug", help="실데이터 디버그 CSV 폴더")
+    parser.add_argument("--no-recorded", action="store_true", help="실데이터 시계열 생략")
+    parser.add_argument("--rel-tol", type=float, default=REL_TOL, help="숫자 상대 허용 오차")
+    parser.add_argument("--abs-tol", type=float, default=ABS_TOL, help="숫자 절대 허용 오차")
+    parser.add_argument("--no-shrink", action="store_true", help="불일치 시 최소화 생략")
+    args = parser.parse_args()
+
+    engines = args.engine or sorted(ENGINES)
+
+    def series() -> Iterator[Tuple[str, str, List[Dict[str, Any]]]]:
+        for sym, ohlc in random_series(args.random, args.days, args.seed):
+            yield "random", sym, ohlc
+        if not args.no_recorded:
+            for sym, ohlc in recorded_series(pathlib.Path(args.debug_dir)):
+                yield "recorded", sym, ohlc
+
+    failures = 0
+    for name in engines:
+        engine = ENGINES[name]
+        checked = candles = 0
+        started = time.perf_counter()
+        print(f"\n[{name}] reference 대비 검사 중...")
+        for source, sym, ohlc in series():
+            mismatch = check(engine, sym, ohlc, args.rel_tol, args.abs_tol)
+            checked += 1
+            candles += len(ohlc)
+            if mismatch is None:
+                continue
+            failures += 1
+            print(f"  FAIL {source} {sym} ({len(ohlc)}캔들): {mismatch}")
+            if not args.no_shrink:
+                small, small_mismatch = shrink(engine, sym, ohlc, args.rel_tol, args.abs_tol)
+                path = save_repro(name, sym, small, small_mismatch)
+                print(f"       최소 재현 {len(small)}캔들: {small_mismatch}")
+                print(f"       저장: {path}")
+            break  # 엔진별 첫 실패만 최소화
+        print(f"[{name}] {checked}개 시계열, {candles:,} 캔들, {time.perf_counter() - started:.1f}s")
+
+    if failures:
+        print(f"\n불일치 발견: {failures}건")
+        sys.exit(1)
+    print("\n모든 후보 엔진이 reference 와 일치")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,14 +11,22 @@ Top 50 코인 분석 엑셀 생성기
 5. 종합 엑셀 파일 생성
 """
 
+import json
 import os
 import pandas as pd
 import pathlib
 from typing import Dict, List, Optional, Tuple
-import requests
-import time
 from datetime import datetime
 
+from core.analysis_archive import analysis_archive, row_from_progress
+from core.change_feed import changes_since, latest_feed
+from core.compact_debug import find_debug
+from core.next_target import gather as gather_latest, resolve as resolve_next_targets
+from core.profiling import PROFILER
+from universe_selector import get_market_page
+
+PROGRESS_CACHE = pathlib.Path("cache/analysis_progress.json")  # 변경 피드 기준 재사용하는 심볼별 매수 진행 결과
+
 # 제외할 심볼들 (래핑된 토큰)
 EXCLUDE_SYMBOLS = {"WBTC", "WETH", "WBETH", "STETH", "WSTETH", "WEETH"}
 EXCLUDE_NAME_KEYWORDS = {"WRAPPED", "BRIDGE"}
@@ -31,22 +39,11 @@ class CoinAnalysisExcel:
         
     def get_top100_coins_with_prices(self) -> List[Dict]:
         """CoinGecko에서 Top 100 코인 정보와 현재가를 가져옴"""
-        url = "https://api.coingecko.com/api/v3/coins/markets"
-        params = {
-            "vs_currency": "usd",
-            "order": "market_cap_desc",
-            "per_page": 100,
-            "page": 1,
-            "price_change_percentage": "24h",
-            "locale": "en",
-        }
-        
-        headers = {"User-Agent": "Mozilla/5.0"}
-        
         try:
-            response = requests.get(url, params=params, headers=headers, timeout=20)
-            response.raise_for_status()
-            data = response.json()
+            # 일일 빌드가 방금 받은 markets 페이지를 재사용 (core.universe_store TTL)
+            data = get_market_page(1)
+            if not data:
+                raise RuntimeError("CoinGecko markets 응답 없음")
             
             coins = []
             rank = 1
@@ -81,137 +78,61 @@ class CoinAnalysisExcel:
             return []
     
     def get_latest_buy_progress(self, symbol: str) -> Dict:
-        """EVENT 기반으로 다음 매수 목표를 결정하는 새로운 로직"""
-        debug_file = self.state_dir / f"{symbol}_debug.csv"
-        
-        if not debug_file.exists():
-            return {"status": "no_debug_file", "next_buy_target": None, "current_price": None, "h_value": None}
-            
+        """EVENT 기반으로 다음 매수 목표를 결정 (심볼 1개 — batch_buy_progress 참고)"""
+        return self.batch_buy_progress([symbol])[symbol]
+
+    def batch_buy_progress(self, symbols: List[str]) -> Dict[str, Dict]:
+        """전 심볼의 다음 매수 목표를 한 번에 (core.next_target: 마지막 행만 읽고 배열 규칙 1회 적용)"""
+        paths = {s: find_debug(self.state_dir, s) for s in symbols}  # CSV 또는 압축(.npz)
+        return dict(zip(paths, resolve_next_targets(gather_latest(paths)).as_dicts()))
+
+    @staticmethod
+    def _plain(value):
+        """JSON 저장용 (numpy 스칼라 → 파이썬 값)"""
+        if isinstance(value, dict):
+            return {k: CoinAnalysisExcel._plain(v) for k, v in value.items()}
+        return value.item() if hasattr(value, "item") else value
+
+    def reusable_progress(self) -> Tuple[Dict[str, Dict], Optional[str]]:
+        """
+        변경 피드(core.change_feed) 기준 재사용 가능한 매수 진행 결과와 현재 피드 run.
+        마지막 분석 이후 상태가 바뀌지 않은 심볼은 캐시 결과에 피드 종가로 이격도만 갱신한다.
+        피드가 이어지지 않으면 빈 dict → 전체 재계산
+        """
+        latest = latest_feed()
+        run = latest["run"] if latest else None
         try:
-            df = pd.read_csv(debug_file)
-            if df.empty:
-                return {"status": "empty_debug", "next_buy_target": None, "current_price": None, "h_value": None}
-            
-            # 가장 최근 데이터
-            latest_row = df.iloc[-1]
-            current_price = latest_row['close']
-            h_value = latest_row['H'] if pd.notna(latest_row['H']) else None
-            
-            if not h_value:
-                return {"status": "no_h_value", "next_buy_target": None, "current_price": current_price, "h_value": None}
-            
-            # DEBUG 파일에서 B1~B7 값과 Stop_Loss 값 직접 가져오기
-            buy_levels = {
-                'B1': latest_row['B1'] if pd.notna(latest_row['B1']) else None,
-                'B2': latest_row['B2'] if pd.notna(latest_row['B2']) else None,
-                'B3': latest_row['B3'] if pd.notna(latest_row['B3']) else None,
-                'B4': latest_row['B4'] if pd.notna(latest_row['B4']) else None,
-                'B5': latest_row['B5'] if pd.notna(latest_row['B5']) else None,
-                'B6': latest_row['B6'] if pd.notna(latest_row['B6']) else None,
-                'B7': latest_row['B7'] if pd.notna(latest_row['B7']) else None,
-                'Stop_Loss': latest_row['Stop_Loss'] if pd.notna(latest_row['Stop_Loss']) else None,
-            }
-            
-            # EVENT가 있는 행들만 필터링
-            events_df = df[df['event'].notna() & (df['event'] != '')]
-            
-            if events_df.empty:
-                # EVENT가 없으면 B1이 다음 목표
-                next_buy_target = "B1"
-                next_buy_price = buy_levels['B1']
-                status = "no_events_b1_target"
-            else:
-                # 가장 최근 EVENT 분석
-                latest_event_row = events_df.iloc[-1]
-                latest_event = latest_event_row['event']
-                
-                if latest_event.startswith('BUY') or latest_event.startswith('ADD'):
-                    # BUY/ADD 이벤트: 한 차수 아래가 다음 목표
-                    stage = latest_event_row['stage']
-                    if pd.notna(stage) and str(stage).replace('.0', '').isdigit():
-                        stage_num = int(stage)
-                        if stage_num < 7:
-                            next_buy_target = f"B{stage_num + 1}"
-                            next_buy_price = buy_levels[next_buy_target]
-                            status = f"buy_add_next_target_{next_buy_target}"
-                        else:
-                            # B7까지 완료된 경우 - STOP LOSS 대기 상태 (실행 전)
-                            next_buy_target = "STOP LOSS (실행 전)"
-                            next_buy_price = buy_levels['Stop_Loss'] if buy_levels['Stop_Loss'] is not None else h_value * 0.19
-                            status = "buy_add_max"
-                    else:
-                        # stage 정보가 없으면 B2가 목표
-                        next_buy_target = "B2"
-                        next_buy_price = buy_levels['B2']
-                        status = "buy_add_no_stage_b2"
-                
-                elif latest_event.startswith('SELL'):
-                    # SELL 이벤트: forbidden_levels_above_last_sell 값에 따라 다음 목표 결정
-                    forbidden_levels = latest_event_row['forbidden_levels_above_last_sell']
-                    if pd.notna(forbidden_levels) and str(forbidden_levels).isdigit():
-                        forbidden_num = int(forbidden_levels)
-                        if forbidden_num == 0:
-                            # 모든 레벨이 금지된 경우 (매수 금지)
-                            next_buy_target = None
-                            next_buy_price = None
-                            status = "sell_all_forbidden"
-                        elif forbidden_num == 7:
-                            # 금지 레벨 없음, B1이 목표
-                            next_buy_target = "B1"
-                            next_buy_price = buy_levels['B1']
-                            status = "sell_no_forbidden_b1"
-                        else:
-                            # forbidden_num = 6이면 B1 금지, B2가 목표
-                            # forbidden_num = 5이면 B1-B2 금지, B3이 목표
-                            # forbidden_num = 1이면 B1-B6 금지, B7이 목표
-                            # 공식: B{8 - forbidden_num}
-                            next_buy_target = f"B{8 - forbidden_num}"
-                            next_buy_price = buy_levels[next_buy_target]
-                            status = f"sell_forbidden_next_{next_buy_target}"
-                    else:
-                        # forbidden 정보가 없으면 B1이 목표
-                        next_buy_target = "B1"
-                        next_buy_price = buy_levels['B1']
-                        status = "sell_no_forbidden_b1"
-                
-                elif latest_event == 'RESTART_+98.5pct':
-                    # RESTART 이벤트: 사이클 초기화로 B1이 목표
-                    next_buy_target = "B1"
-                    next_buy_price = buy_levels['B1']
-                    status = "restart_b1_target"
-                
-                elif latest_event == 'STOP LOSS':
-                    # STOP LOSS 이벤트: 손절 상태, 추가 매수 금지 (실행됨)
-                    next_buy_target = "STOP LOSS (실행됨)"
-                    next_buy_price = buy_levels['Stop_Loss'] if buy_levels['Stop_Loss'] is not None else h_value * 0.19
-                    status = "level_stop_loss"
-                
-                else:
-                    # 기타 이벤트: B1이 목표
-                    next_buy_target = "B1"
-                    next_buy_price = buy_levels['B1']
-                    status = "other_event_b1_target"
-            
-            if next_buy_price is not None:
-                distance_pct = ((current_price - next_buy_price) / next_buy_price) * 100
-                return {
-                    "status": status,
-                    "next_buy_target": next_buy_target,
-                    "next_buy_price": next_buy_price,
-                    "current_price": current_price,
-                    "h_value": h_value,
-                    "buy_levels": buy_levels,
-                    "distance_pct": distance_pct
-                }
-            else:
-                return {"status": "no_target_price", "next_buy_target": None, "current_price": current_price, "h_value": h_value, "buy_levels": buy_levels}
-            
+            cache = json.loads(PROGRESS_CACHE.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}, run
+        since = changes_since(cache.get("run"))
+        if since is None:
+            return {}, run
+        run, changed, built = since
+        reuse = {}
+        for symbol, progress in cache.get("progress", {}).items():
+            if symbol in changed or symbol not in built:
+                continue
+            progress = dict(progress, current_price=float(built[symbol]["close"]))
+            if progress.get("next_buy_price") is not None and "distance_pct" in progress:
+                progress["distance_pct"] = (progress["current_price"] - progress["next_buy_price"]) / progress["next_buy_price"] * 100
+            reuse[symbol] = progress
+        return reuse, run
+
+    def save_progress(self, run: Optional[str], progress: Dict[str, Dict]) -> None:
+        PROGRESS_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        keep = {s: self._plain(p) for s, p in progress.items() if p["status"] != "error"}
+        PROGRESS_CACHE.write_text(json.dumps({"run": run, "progress": keep}, ensure_ascii=False), encoding="utf-8")
+
+    def archive_run(self, run_at: datetime, coins: List[Dict], progress: Dict[str, Dict]) -> None:
+        """분석 결과를 시계열 보관소에 추가 (core.analysis_archive, 직전 run 과 같으면 생략)"""
+        try:
+            rows = [row_from_progress(c, progress[c["심볼"]]) for c in coins if c["심볼"] in progress]
+            added = analysis_archive().append(run_at, rows)
+            print(f"분석 이력 {'저장' if added else '생략 (직전 run 과 동일)'}: {analysis_archive().root}")
         except Exception as e:
-            print(f"{symbol} 매수 진행 상황 분석 실패: {e}")
-            return {"status": "error", "next_buy_target": None, "current_price": None, "h_value": None}
-    
-    
-    
+            print(f"분석 이력 저장 실패: {e}")
+
     def format_market_cap(self, market_cap: float) -> str:
         """시가총액을 억 단위로 포맷팅"""
         if market_cap >= 1e8:  # 1억 이상
@@ -238,7 +159,8 @@ class CoinAnalysisExcel:
     def create_analysis_excel(self):
         """종합 분석 엑셀 파일 생성"""
         print("Top 100 코인 정보 수집 중...")
-        coins = self.get_top100_coins_with_prices()
+        with PROFILER.stage("http_fetch"):
+            coins = self.get_top100_coins_with_prices()
         
         if not coins:
             print("코인 정보를 가져올 수 없습니다.")
@@ -248,6 +170,12 @@ class CoinAnalysisExcel:
         
         # 분석 데이터 준비
         analysis_data = []
+        reuse, feed_run = self.reusable_progress()
+        progress_by_symbol: Dict[str, Dict] = {}
+        if reuse:
+            print(f"변경 피드 기준 재사용: {len(reuse)}개 (상태 변화 없음, 이격도만 갱신)")
+        with PROFILER.stage("analysis_read"):
+            fresh = self.batch_buy_progress([c["심볼"] for c in coins if c["심볼"] not in reuse])
         
         for coin in coins:
             symbol = coin["심볼"]
@@ -256,7 +184,8 @@ class CoinAnalysisExcel:
             print(f"{symbol} 분석 중...")
             
             # 매수 진행 상황 분석
-            buy_progress = self.get_latest_buy_progress(symbol)
+            buy_progress = reuse[symbol] if symbol in reuse else fresh[symbol]
+            progress_by_symbol[symbol] = buy_progress
             
             if buy_progress["status"] in ["no_debug_file", "empty_debug", "no_h_value", "error"]:
                 print(f"  {symbol}: {buy_progress['status']}")
@@ -297,9 +226,8 @@ class CoinAnalysisExcel:
                 "이격도(%)": distance_pct,
                 "상태": buy_progress["status"]
             })
-            
-            # API 호출 제한 방지
-            time.sleep(0.1)
+        
+        self.save_progress(feed_run, progress_by_symbol)
         
         # DataFrame 생성
         df = pd.DataFrame(analysis_data)
@@ -314,10 +242,11 @@ class CoinAnalysisExcel:
         df = df[columns]
         
         # 엑셀 파일 저장
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        run_at = datetime.now().replace(microsecond=0)
+        timestamp = run_at.strftime("%Y%m%d_%H%M%S")
         excel_path = self.output_dir / f"coin_analysis_{timestamp}.xlsx"
         
-        with pd.ExcelWriter(excel_path, engine='openpyxl') as writer:
+        with PROFILER.stage("excel_write"), pd.ExcelWriter(excel_path, engine='openpyxl') as writer:
             df.to_excel(writer, sheet_name='코인분석', index=False)
             
             # 워크시트 포맷팅
@@ -365,6 +294,7 @@ class CoinAnalysisExcel:
                 worksheet.column_dimensions[col].width = width
         
         print(f"\n분석 완료! 엑셀 파일 저장: {excel_path}")
+        self.archive_run(run_at, coins, progress_by_symbol)
         print(f"총 {len(analysis_data)}개 코인 분석")
         
         # 요약 정보 출력
@@ -380,8 +310,16 @@ class CoinAnalysisExcel:
         return excel_path
 
 def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Top 100 코인 분석 엑셀 생성")
+    parser.add_argument("--profile", action="store_true", help="단계별 프로파일링 리포트 저장 (output/profile, 환경변수 OMG_PROFILE=1 과 동일)")
+    args = parser.parse_args()
+    PROFILER.enable_from_env("coin_analysis_excel", args.profile)
+
     analyzer = CoinAnalysisExcel()
     analyzer.create_analysis_excel()
+    PROFILER.finish()
 
 if __name__ == "__main__":
     main()
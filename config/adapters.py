@@ -6,8 +6,13 @@ import pathlib
 from typing import List, Optional
 
 import requests
+import numpy as np
 import pandas as pd
-from datetime import datetime, timezone, timedelta
+from datetime import timezone, timedelta
+
+from core import http_client
+from core.profiling import PROFILER
+from core.timeaxis import day_to_ms, days_of_ms, parse_day
 
 KST = timezone(timedelta(hours=9))
 BINANCE_BASE = "https://api.binance.com"
@@ -18,17 +23,20 @@ class BinanceClient:
     Minimal Binance public client for daily OHLCV.
     - No API key required.
     - Interval fixed to 1d as per project spec (일봉 고정).
-    - Timestamps returned as KST-normalized pandas.DatetimeIndex (date only).
+    - Rows carry openTime (epoch-ms) and day (int32 epoch-day, core.timeaxis);
+      the KST-normalized `date` column is kept for display/export.
     """
 
     def __init__(self, base_url: str = BINANCE_BASE, session: Optional[requests.Session] = None):
         self.base_url = base_url.rstrip("/")
-        self.sess = session or requests.Session()
-        self.sess.headers.update({"User-Agent": "phase1.5/0.1"})
+        self.sess = session  # None 이면 core.http_client 의 호스트별 keep-alive 풀 사용
+        self.headers = {"User-Agent": "phase1.5/0.1"}
 
     def _get(self, path: str, params: dict | None = None) -> requests.Response:
         url = f"{self.base_url}{path}"
-        r = self.sess.get(url, params=params, timeout=20)
+        r = http_client.get(
+            url, params=params, headers=self.headers, timeout=20, session=self.sess, retry=http_client.DEFAULT_RETRY
+        )
         r.raise_for_status()
         return r
 
@@ -40,10 +48,12 @@ class BinanceClient:
     def get_ohlc_daily(self, symbol: str, start: Optional[str] = None, end: Optional[str] = None, limit: int = 1500) -> pd.DataFrame:
         """
         Fetch daily klines for `symbol` from Binance. Returns DataFrame with columns:
-        ['date','open','high','low','close','volume']
-        - date: datetime64[ns, Asia/Seoul] (normalized to 00:00:00 KST)
+        ['openTime','day','date','open','high','low','close','volume']
+        - openTime: int64 epoch-ms (UTC 00:00 of the candle)
+        - day: int32 epoch-day of openTime — use this for joins/engine input
+        - date: datetime64[ns, Asia/Seoul] (normalized to 00:00:00 KST, display only)
         Notes:
-          * Binance kline open time is in ms UTC. We shift to KST and drop time.
+          * Binance daily candles open at UTC 00:00 = KST 09:00, so the KST date equals the UTC date.
         """
         params = {
             "symbol": symbol,
@@ -52,10 +62,7 @@ class BinanceClient:
         }
         # Convert start/end ("YYYY-MM-DD") to ms if provided
         def _to_ms(s: Optional[str]):
-            if not s:
-                return None
-            dt = datetime.fromisoformat(s).replace(tzinfo=timezone.utc)
-            return int(dt.timestamp() * 1000)
+            return day_to_ms(parse_day(s)) if s else None
 
         start_ms = _to_ms(start)
         end_ms = _to_ms(end)
@@ -67,31 +74,25 @@ class BinanceClient:
         r = self._get("/api/v3/klines", params=params)
         raw = r.json()
         if not raw:
-            return pd.DataFrame(columns=["date", "open", "high", "low", "close", "volume"]).astype({
+            return pd.DataFrame(columns=["openTime", "day", "date", "open", "high", "low", "close", "volume"]).astype({
                 "open": float, "high": float, "low": float, "close": float, "volume": float
             })
 
-        # columns per kline: [openTime, open, high, low, close, volume, closeTime, ...]
-        rows = []
-        for k in raw:
-            open_ts = int(k[0]) // 1000
-            # Shift UTC open time to KST and normalize date
-            dt_kst = datetime.fromtimestamp(open_ts, tz=timezone.utc).astimezone(KST)
-            
-            # 일봉 시작 시간 고려: UTC 00:00 = KST 09:00
-            # 한국시간 09:00 이전이면 전날 일봉으로 처리
-            if dt_kst.hour < 9:  # 아직 전날 일봉
-                date_only = datetime(dt_kst.year, dt_kst.month, dt_kst.day - 1, tzinfo=KST)
-            else:  # 오늘 일봉
-                date_only = datetime(dt_kst.year, dt_kst.month, dt_kst.day, tzinfo=KST)
-            
-            rows.append({
-                "date": date_only,
-                "open": float(k[1]),
-                "high": float(k[2]),
-                "low": float(k[3]),
-                "close": float(k[4]),
-                "volume": float(k[5]),
+        with PROFILER.stage("kline_parse"):
+            # columns per kline: [openTime, open, high, low, close, volume, closeTime, ...]
+            # 일봉 시작 = UTC 00:00 = KST 09:00 → 날짜는 openTime 의 epoch-day 그대로
+            open_ms = np.fromiter((int(k[0]) for k in raw), dtype=np.int64, count=len(raw))
+            prices = np.array([k[1:6] for k in raw], dtype=np.float64)
+            day = days_of_ms(open_ms)
+            df = pd.DataFrame({
+                "openTime": open_ms,
+                "day": day,
+                "date": pd.to_datetime(day.astype(np.int64), unit="D").tz_localize(KST),
+                "open": prices[:, 0],
+                "high": prices[:, 1],
+                "low": prices[:, 2],
+                "close": prices[:, 3],
+                "volume": prices[:, 4],
             })
-        df = pd.DataFrame(rows).drop_duplicates(subset=["date"]).sort_values("date").reset_index(drop=True)
+            df = df.drop_duplicates(subset=["day"]).sort_values("day").reset_index(drop=True)
         return df
\ No newline at end of file
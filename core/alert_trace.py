@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+알람 지연 추적 (가격 관측 → 평가 → 대기열 → 채널별 전송 완료)
+
+알람 1건마다 AlertTrace 를 붙여 단계별 시각(epoch 초)을 기록하고,
+전송이 끝나면 alert_traces.jsonl 에 한 줄씩 추가한다.
+
+  exchange  거래소 이벤트 시각 (ticker closeTime, 없으면 응답 Date 헤더)
+  received  가격 응답 수신 시각
+  evaluated 알람 조건 평가 완료 시각
+  enqueued  전송 대기열 투입 시각 (샤딩 모드: outbox.put)
+  acks      채널별 전송 완료 시각 {"telegram": ts, "slack": ts}
+
+AlertTraceLog.summary() 는 채널별 end-to-end 지연(p50/p95/p99)과
+단계별 지연 중앙값을 반환한다.
+"""
+from __future__ import annotations
+
+import json
+import math
+import pathlib
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+TRACE_LOG_FILE = "alert_traces.jsonl"
+PERCENTILES = (50, 95, 99)
+
+# (단계 이름, 시작 필드, 끝 필드)
+STAGES = (
+    ("receive", "exchange", "received"),
+    ("evaluate", "received", "evaluated"),
+    ("queue", "evaluated", "enqueued"),
+)
+
+
+def exchange_time_from_headers(headers) -> Optional[float]:
+    """HTTP Date 헤더 → epoch 초 (초 단위 정밀도, 이벤트 시각이 없는 응답용)"""
+    value = headers.get("Date") if headers else None
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class AlertTrace:
+    symbol: str
+    kind: str
+    target: str = ""
+    exchange: Optional[float] = None
+    received: Optional[float] = None
+    evaluated: Optional[float] = None
+    enqueued: Optional[float] = None
+    acks: Dict[str, float] = field(default_factory=dict)
+    ok: Dict[str, bool] = field(default_factory=dict)
+    trace_id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+
+    def mark(self, stage: str, ts: Optional[float] = None) -> None:
+        """단계 시각 기록 (이미 기록된 단계는 덮어쓰지 않음)"""
+        if getattr(self, stage) is None:
+            setattr(self, stage, time.time() if ts is None else ts)
+
+    def ack(self, channel: str, success: bool, ts: Optional[float] = None) -> None:
+        self.acks[channel] = time.time() if ts is None else ts
+        self.ok[channel] = bool(success)
+
+    @property
+    def origin(self) -> Optional[float]:
+        return self.exchange if self.exchange is not None else self.received
+
+    def latency(self, channel: str) -> Optional[float]:
+        """거래소 이벤트(없으면 수신) → 채널 전송 완료까지 초"""
+        if channel not in self.acks or self.origin is None:
+            return None
+        return self.acks[channel] - self.origin
+
+    def stage_latencies(self) -> Dict[str, float]:
+        out: Dict[str, float] = {}
+        for name, start, end in STAGES:
+            a, b = getattr(self, start), getattr(self, end)
+            if a is not None and b is not None:
+                out[name] = b - a
+        for channel, ts in self.acks.items():
+            if self.enqueued is not None:
+                out[f"deliver_{channel}"] = ts - self.enqueued
+        return out
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = asdict(self)
+        d["latency"] = {ch: self.latency(ch) for ch in self.acks}
+        return d
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "AlertTrace":
+        known = {k: v for k, v in d.items() if k in cls.__dataclass_fields__}
+        return cls(**known)
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """선형 보간 백분위수"""
+    if not values:
+        return None
+    xs = sorted(values)
+    pos = (len(xs) - 1) * q / 100.0
+    lo, hi = math.floor(pos), math.ceil(pos)
+    return xs[lo] + (xs[hi] - xs[lo]) * (pos - lo)
+
+
+class AlertTraceLog:
+    """JSONL 추적 로그 (추가 전용)"""
+
+    def __init__(self, path: str = TRACE_LOG_FILE):
+        self.path = pathlib.Path(path)
+
+    def append(self, trace: AlertTrace) -> None:
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(trace.to_dict(), ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"알람 추적 로그 기록 실패: {e}")
+
+    def __iter__(self) -> Iterator[AlertTrace]:
+        if not self.path.exists():
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield AlertTrace.from_dict(json.loads(line))
+                except (ValueError, TypeError):
+                    continue  # 기록 중 잘린 줄 등은 건너뜀
+
+    def query(
+        self,
+        symbol: Optional[str] = None,
+        kind: Optional[str] = None,
+        channel: Optional[str] = None,
+        since: Optional[float] = None,
+    ) -> List[AlertTrace]:
+        """조건에 맞는 추적 목록 (since: epoch 초, received 기준)"""
+        out = []
+        for tr in self:
+            if symbol and tr.symbol != symbol:
+                continue
+            if kind and tr.kind != kind:
+                continue
+            if channel and channel not in tr.acks:
+                continue
+            if since is not None and (tr.received or 0) < since:
+                continue
+            out.append(tr)
+        return out
+
+    def summary(self, since: Optional[float] = None, kind: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        채널별 지연 요약
+        {"telegram": {"count", "failed", "p50", "p95", "p99", "stages": {단계: p50}}}
+        """
+        per_channel: Dict[str, List[float]] = {}
+        failed: Dict[str, int] = {}
+        stages: Dict[str, Dict[str, List[float]]] = {}
+        for tr in self.query(kind=kind, since=since):
+            stage_lat = tr.stage_latencies()
+            for channel in tr.acks:
+                lat = tr.latency(channel)
+                if lat is None:
+                    continue
+                per_channel.setdefault(channel, []).append(lat)
+                if not tr.ok.get(channel, True):
+                    failed[channel] = failed.get(channel, 0) + 1
+                bucket = stages.setdefault(channel, {})
+                for name, value in stage_lat.items():
+                    if not name.startswith("deliver_") or name == f"deliver_{channel}":
+                        bucket.setdefault(name, []).append(value)
+
+        result: Dict[str, Dict[str, Any]] = {}
+        for channel, values in sorted(per_channel.items()):
+            row: Dict[str, Any] = {"count": len(values), "failed": failed.get(channel, 0)}
+            for q in PERCENTILES:
+                row[f"p{q}"] = percentile(values, q)
+            row["stages"] = {name: percentile(v, 50) for name, v in stages.get(channel, {}).items()}
+            result[channel] = row
+        return result
+
+
+def print_summary(path: str = TRACE_LOG_FILE, hours: Optional[float] = None) -> None:
+    since = time.time() - hours * 3600 if hours else None
+    summary = AlertTraceLog(path).summary(since=since)
+    if not summary:
+        print("알람 추적 기록이 없습니다.")
+        return
+    scope = f"최근 {hours:g}시간" if hours else "전체"
+    print(f"\n알람 지연 요약 ({scope}, 거래소 이벤트 → 전송 완료, 초)")
+    print(f"{'채널':<10} {'건수':>6} {'실패':>5} {'p50':>8} {'p95':>8} {'p99':>8}   단계별 p50")
+    for channel, row in summary.items():
+        stages = ", ".join(f"{k} {v:.2f}" for k, v in row["stages"].items())
+        print(
+            f"{channel:<10} {row['count']:>6} {row['failed']:>5} "
+            f"{row['p50']:>8.2f} {row['p95']:>8.2f} {row['p99']:>8.2f}   {stages}"
+        )
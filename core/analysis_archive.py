@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+종합 분석(coin_analysis_excel) 실행 이력 — 열 단위 시계열 보관소
+
+  output/analysis_archive/analysis_<YYYY-MM>.npz     월별 파티션, 키 = (run, symbol)
+    run datetime64[s] / symbol / name / rank / market_cap / price / change_24h
+    H / B1..B7 / Stop_Loss / next_target / target_price / distance_pct / status   (숫자 없음 = NaN, 문자열 없음 = "")
+
+- append(run, rows): 분석 1회 = run 1개. 직전 run 과 값이 전부 같으면 저장하지 않음 (중복 제거)
+  같은 run 시각이 이미 있으면 건너뜀 (xlsx 가져오기 반복 실행 안전)
+- query(symbols, start, end): 필요한 월 파티션만 열 단위로 읽어 마스크 → DataFrame (파티션은 프로세스 내 재사용)
+  pivot("distance_pct", ["SOL", "ETH"]) → 행 = run, 열 = 심볼
+- import_excel(path): 기존 coin_analysis_*.xlsx → 행 (화면 표시용 문자열 "1,234.56"/"21,424.7억" 을 숫자로,
+  초기 형식 열 가장가까운매수선/매수선가격/거리(%) 도 인식). 값 정밀도는 엑셀에 표시된 자릿수까지
+"""
+from __future__ import annotations
+
+import os
+import pathlib
+import re
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.phase1_5_state import LEVEL_NAMES
+
+FORMAT_VERSION = 1
+DEFAULT_ROOT = "output/analysis_archive"
+LEVEL_COLUMNS = (*LEVEL_NAMES, "Stop_Loss")
+COLUMNS: Dict[str, str] = {
+    "run": "datetime64[s]",
+    "symbol": "U16",
+    "name": "U64",
+    "rank": "i2",
+    "market_cap": "f8",
+    "price": "f8",
+    "change_24h": "f8",
+    "H": "f8",
+    **{c: "f8" for c in LEVEL_COLUMNS},
+    "next_target": "U24",
+    "target_price": "f8",
+    "distance_pct": "f8",
+    "status": "U32",
+}
+VALUE_COLUMNS = tuple(c for c in COLUMNS if c != "run")
+EXCEL_NAME = re.compile(r"coin_analysis_(\d{8}_\d{6})\.xlsx$")
+
+Columns = Dict[str, np.ndarray]
+
+
+def _blank(dtype: str) -> Any:
+    return "" if dtype.startswith("U") else (0 if dtype.startswith("i") else np.nan)
+
+
+def _columns(run: np.datetime64, rows: Sequence[Dict[str, Any]]) -> Columns:
+    cols = {"run": np.full(len(rows), run, dtype=COLUMNS["run"])}
+    for c in VALUE_COLUMNS:
+        blank = _blank(COLUMNS[c])
+        cols[c] = np.array([blank if r.get(c) is None else r[c] for r in rows], dtype=COLUMNS[c])
+    return cols
+
+
+def _same(a: Columns, b: Columns) -> bool:
+    """두 run 의 값이 전부 같은지 (NaN 끼리는 같음)"""
+    if len(a["symbol"]) != len(b["symbol"]):
+        return False
+    for c in VALUE_COLUMNS:
+        if COLUMNS[c] == "f8":
+            if not np.array_equal(a[c], b[c], equal_nan=True):
+                return False
+        elif not np.array_equal(a[c], b[c]):
+            return False
+    return True
+
+
+def _take(cols: Columns, mask: np.ndarray) -> Columns:
+    return {c: v[mask] for c, v in cols.items()}
+
+
+def _time(t: Any, end: bool = False) -> Optional[np.datetime64]:
+    """날짜/시각 문자열 (2025-10-19, 2025-10-19T21:30) 또는 datetime → datetime64[s]. 날짜만 준 end 는 그날 끝까지"""
+    if t is None:
+        return None
+    if isinstance(t, str) and len(t) == 10 and end:
+        return np.datetime64(t, "D") + np.timedelta64(1, "D") - np.timedelta64(1, "s")
+    return np.datetime64(t, "s")
+
+
+def _month(t: np.datetime64) -> str:
+    return str(t.astype("datetime64[M]"))
+
+
+# ===== 분석 결과 → 행 =====
+
+def row_from_progress(coin: Dict[str, Any], progress: Dict[str, Any]) -> Dict[str, Any]:
+    """create_analysis_excel 의 코인 정보 + get_latest_buy_progress 결과 → 보관 행"""
+    levels = progress.get("buy_levels") or {}
+    return {
+        "symbol": coin["심볼"],
+        "name": coin.get("코인명"),
+        "rank": coin.get("순위"),
+        "market_cap": coin.get("시가총액"),
+        "price": coin.get("현재가"),
+        "change_24h": coin.get("24h변동률"),
+        "H": progress.get("h_value"),
+        **{c: levels.get(c) for c in LEVEL_COLUMNS},
+        "next_target": progress.get("next_buy_target"),
+        "target_price": progress.get("next_buy_price"),
+        "distance_pct": progress.get("distance_pct"),
+        "status": progress.get("status"),
+    }
+
+
+_UNITS = {"억": 1e8, "만": 1e4}
+
+
+def _number(v: Any) -> Optional[float]:
+    """엑셀 표시 문자열 → 숫자 ("1,234.56", "21,424.7억", "" → None)"""
+    if v is None or (isinstance(v, float) and v != v):
+        return None
+    if isinstance(v, (int, float, np.integer, np.floating)):
+        return float(v)
+    text = str(v).replace(",", "").strip()
+    if not text:
+        return None
+    scale = _UNITS.get(text[-1], 1.0)
+    try:
+        return float(text.rstrip("억만")) * scale
+    except ValueError:
+        return None
+
+
+def _text(v: Any) -> Optional[str]:
+    return None if v is None or (isinstance(v, float) and v != v) else str(v)
+
+
+def import_excel(path: pathlib.Path) -> Tuple[datetime, List[Dict[str, Any]]]:
+    """coin_analysis_<YYYYmmdd_HHMMSS>.xlsx → (run, 행)"""
+    m = EXCEL_NAME.search(pathlib.Path(path).name)
+    if not m:
+        raise ValueError(f"분석 엑셀 파일명이 아님: {path}")
+    run = datetime.strptime(m.group(1), "%Y%m%d_%H%M%S")
+    df = pd.read_excel(path)
+
+    def col(*names: str) -> List[Any]:
+        for n in names:
+            if n in df.columns:
+                return df[n].tolist()
+        return [None] * len(df)
+
+    rows = []
+    table = zip(
+        col("심볼"), col("코인명"), col("순위"), col("시가총액($)", "시가총액"), col("현재가"), col("24h변동률"), col("H값"),
+        *(col(c) for c in LEVEL_COLUMNS),
+        col("다음매수목표", "가장가까운매수선"), col("목표가격", "매수선가격"), col("이격도(%)", "거리(%)"), col("상태"),
+    )
+    for symbol, name, rank, cap, price, change, H, *rest in table:
+        levels, (target, target_price, distance, status) = rest[: len(LEVEL_COLUMNS)], rest[len(LEVEL_COLUMNS):]
+        rows.append({
+            "symbol": _text(symbol), "name": _text(name), "rank": int(rank) if _number(rank) is not None else None,
+            "market_cap": _number(cap), "price": _number(price), "change_24h": _number(change), "H": _number(H),
+            **{c: _number(v) for c, v in zip(LEVEL_COLUMNS, levels)},
+            "next_target": _text(target), "target_price": _number(target_price),
+            "distance_pct": _number(distance), "status": _text(status),
+        })
+    return run, [r for r in rows if r["symbol"]]
+
+
+# ===== 보관소 =====
+
+class AnalysisArchive:
+    def __init__(self, root: str = DEFAULT_ROOT):
+        self.root = pathlib.Path(root)
+        self._loaded: Dict[pathlib.Path, Tuple[int, Columns]] = {}
+        self._lock = threading.Lock()
+
+    def part_path(self, month: str) -> pathlib.Path:
+        return self.root / f"analysis_{month}.npz"
+
+    def parts(self) -> List[pathlib.Path]:
+        return sorted(self.root.glob("analysis_*.npz"))
+
+    def load_part(self, path: pathlib.Path) -> Columns:
+        """파티션 열 (파일이 바뀌지 않았으면 프로세스 내 재사용)"""
+        if not path.exists():
+            return _columns(np.datetime64("NaT", "s"), [])
+        stamp = path.stat().st_mtime_ns
+        with self._lock:
+            hit = self._loaded.get(path)
+            if hit is not None and hit[0] == stamp:
+                return hit[1]
+            with np.load(path) as z:
+                if int(z["version"]) != FORMAT_VERSION:
+                    raise ValueError(f"지원하지 않는 분석 이력 버전 {int(z['version'])}: {path}")
+                cols = {c: z[c] for c in COLUMNS}
+            self._loaded[path] = (stamp, cols)
+            return cols
+
+    def _save(self, path: pathlib.Path, cols: Columns) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            np.savez_compressed(f, version=FORMAT_VERSION, **cols)
+        os.replace(tmp, path)
+
+    def runs(self) -> np.ndarray:
+        """보관된 run 시각 (오름차순, 중복 없음)"""
+        out = [np.unique(self.load_part(p)["run"]) for p in self.parts()]
+        return np.concatenate(out) if out else np.empty(0, dtype=COLUMNS["run"])
+
+    def run_rows(self, run: np.datetime64) -> Columns:
+        cols = self.load_part(self.part_path(_month(run)))
+        return _take(cols, cols["run"] == run)
+
+    # ----- 기록 -----
+
+    def append(self, run: datetime, rows: Sequence[Dict[str, Any]]) -> bool:
+        """분석 1회 추가 — 저장했으면 True (직전 run 과 같거나 이미 있는 run 이면 False)"""
+        t = np.datetime64(run, "s")
+        runs = self.runs()
+        if not rows or t in runs:
+            return False
+        new = _columns(t, rows)
+        earlier = runs[runs < t]
+        if len(earlier) and _same(self.run_rows(earlier[-1]), new):
+            return False
+        path = self.part_path(_month(t))
+        old = self.load_part(path)
+        cols = {c: np.concatenate([old[c], new[c]]) for c in COLUMNS}
+        order = np.argsort(cols["run"], kind="stable")
+        self._save(path, {c: v[order] for c, v in cols.items()})
+        return True
+
+    # ----- 조회 -----
+
+    def columns(self, symbols: Optional[Iterable[str]] = None, start: Any = None, end: Any = None) -> Columns:
+        """(symbols, [start, end]) 구간의 열 배열 — 겹치는 월 파티션만 읽음"""
+        s, e = _time(start), _time(end, end=True)
+        picked = []
+        for path in self.parts():
+            month = path.stem[len("analysis_"):]
+            if (s is not None and month < _month(s)) or (e is not None and month > _month(e)):
+                continue
+            cols = self.load_part(path)
+            mask = np.ones(len(cols["run"]), dtype=bool)
+            if symbols is not None:
+                mask &= np.isin(cols["symbol"], [x.upper() for x in symbols])
+            if s is not None:
+                mask &= cols["run"] >= s
+            if e is not None:
+                mask &= cols["run"] <= e
+            picked.append(_take(cols, mask))
+        if not picked:
+            return _take(_columns(np.datetime64("NaT", "s"), []), np.zeros(0, dtype=bool))
+        return {c: np.concatenate([p[c] for p in picked]) for c in COLUMNS}
+
+    def query(self, symbols: Optional[Iterable[str]] = None, start: Any = None, end: Any = None) -> pd.DataFrame:
+        """심볼별 시간순 DataFrame (run, symbol, next_target, distance_pct, H, ...)"""
+        df = pd.DataFrame(self.columns(symbols, start, end))
+        return df.sort_values(["symbol", "run"], kind="stable").reset_index(drop=True)
+
+    def pivot(self, field: str, symbols: Optional[Iterable[str]] = None, start: Any = None, end: Any = None) -> pd.DataFrame:
+        """행 = run, 열 = 심볼 (예: pivot("distance_pct", ["SOL"]))"""
+        cols = self.columns(symbols, start, end)
+        df = pd.DataFrame({"run": cols["run"], "symbol": cols["symbol"], field: cols[field]})
+        return df.pivot(index="run", columns="symbol", values=field)  # (run, symbol) 은 유일
+
+
+_ARCHIVE: Optional[AnalysisArchive] = None
+
+
+def analysis_archive() -> AnalysisArchive:
+    """프로세스 공용 보관소 (output/analysis_archive)"""
+    global _ARCHIVE
+    if _ARCHIVE is None:
+        _ARCHIVE = AnalysisArchive()
+    return _ARCHIVE
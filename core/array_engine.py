@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+배열 기반 Phase 1.5 엔진 (equivalence 후보 "array")
+
+step_day 와 같은 규칙을 다음 구조로 실행한다.
+- ArrayEngine: __slots__ 상태 (mode/position/stage 는 정수 코드, None 은 NaN)
+  레벨 7개는 H 가 바뀔 때만 계산하고, 가격 오름차순 인덱스(asc)도 그때 한 번만 안정 정렬
+  레벨 이름 ↔ 번호는 인덱스 그대로 (level_names.index() 선형 탐색 없음)
+- EventLog: NumPy 구조체 배열 버퍼 (ROW_DTYPE), 가득 차면 2배로 증가
+  행 1개 = 튜플 1개 대입, 이벤트/기준/레벨 이름은 정수 코드
+- 반올림(8/10/6자리)과 문자열 변환은 rows()/write_csv() 에서만 → run_phase1_5_simulation 과 같은 CSV
+
+사용:
+  engine = ArrayEngine(); engine.run(ohlc)          # 첫 캔들은 reference 와 같이 건너뜀
+  engine.log.write_csv(path)
+"""
+from __future__ import annotations
+
+import csv
+import pathlib
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from core.phase1_5_core import SELL_THRESHOLDS
+from core.phase1_5_state import CSV_HEADER, LEVEL_NAMES, RESTART_MULT, STOP_LOSS_RATIO, WAIT_ENTRY_RATIO, EngineState
+from core.profiling import PROFILER
+from core.timeaxis import DAY_MS, day_str
+
+NAN = float("nan")
+INF = float("inf")
+LEVEL_RATIOS = (0.56, 0.52, 0.46, 0.41, 0.35, 0.28, 0.21)  # compute_levels 와 동일
+
+HIGH, WAIT = 0, 1
+MODES = ("high", "wait")
+
+EV_NONE, EV_BUY, EV_ADD, EV_SELL, EV_STOP, EV_RESTART = range(6)
+BASES = ("", "LOW", "HIGH")
+BASIS_NONE, BASIS_LOW, BASIS_HIGH = range(3)
+LEVEL_LABELS = ("",) + tuple(LEVEL_NAMES)  # 0 = 없음, 1..7 = B1..B7
+_SELL = tuple(SELL_THRESHOLDS.get(i, NAN) for i in range(8))  # stage → threshold (%)
+
+ROW_DTYPE = np.dtype([
+    ("day", "i4"), ("open", "f8"), ("high", "f8"), ("low", "f8"), ("close", "f8"),
+    ("mode", "i1"), ("position", "?"), ("stage", "i1"), ("event", "i1"), ("basis", "i1"),
+    ("level", "i1"), ("level_price", "f8"), ("trigger_price", "f8"), ("fill_price", "f8"),
+    ("H", "f8"), ("L", "f8"), ("rebound", "f8"), ("threshold", "f8"),
+    ("allowed", "i1"), ("levels", "f8", (7,)), ("stop", "f8"), ("cutoff", "f8"),
+    ("next_level", "i1"), ("next_price", "f8"), ("next_trigger", "f8"),
+])
+
+
+def _rounded(values: np.ndarray, nd: int) -> List[Any]:
+    """열 단위 반올림 (NaN → None). 같은 값은 한 번만 round() — H/레벨/cutoff 는 대부분 반복값"""
+    flat = values.ravel()
+    if flat.size == 0:
+        return []
+    uniq, inv = np.unique(flat, return_inverse=True)
+    table = [None if x != x else (x if nd < 0 else round(x, nd)) for x in uniq.tolist()]
+    out = [table[i] for i in inv.ravel().tolist()]
+    if values.ndim > 1:
+        w = values.shape[1]
+        return [out[i: i + w] for i in range(0, len(out), w)]
+    return out
+
+
+def _event_label(code: int, level: int) -> str:
+    if code == EV_BUY:
+        return f"BUY {LEVEL_LABELS[level]}"
+    if code == EV_ADD:
+        return f"ADD {LEVEL_LABELS[level]}"
+    return ("", "", "", "SELL S", "STOP LOSS", "RESTART_+98.5pct")[code]
+
+
+class EventLog:
+    """구조체 배열 행 버퍼 (기하급수 증가)"""
+
+    __slots__ = ("buf", "n")
+
+    def __init__(self, capacity: int = 1024):
+        self.buf = np.empty(max(16, capacity), dtype=ROW_DTYPE)
+        self.n = 0
+
+    def __len__(self) -> int:
+        return self.n
+
+    @classmethod
+    def of(cls, rows: np.ndarray) -> "EventLog":
+        """기존 ROW_DTYPE 배열을 감싼 로그 (내보내기용)"""
+        log = cls(0)
+        log.buf = np.ascontiguousarray(rows, dtype=ROW_DTYPE)
+        log.n = len(rows)
+        return log
+
+    def append(self, row: tuple) -> None:
+        if self.n == len(self.buf):
+            grown = np.empty(len(self.buf) * 2, dtype=ROW_DTYPE)
+            grown[: self.n] = self.buf
+            self.buf = grown
+        self.buf[self.n] = row
+        self.n += 1
+
+    def move_to_end(self, index: int) -> None:
+        """index 행을 맨 뒤로 (RESTART 이벤트 정렬용)"""
+        if index < self.n - 1:
+            self.buf[index: self.n - 1], self.buf[self.n - 1] = self.buf[index + 1: self.n].copy(), self.buf[index].copy()
+
+    @property
+    def rows_array(self) -> np.ndarray:
+        return self.buf[: self.n]
+
+    # ----- 내보내기 (반올림/문자열 변환은 여기서만) -----
+
+    def rows(self) -> Iterator[List[Any]]:
+        b = self.rows_array
+
+        def col(name: str, nd: int = -1) -> List[Any]:
+            return _rounded(b[name], nd)
+
+        day = [day_str(d) for d in b["day"].tolist()]
+        o, h, l, c = col("open", 8), col("high", 8), col("low", 8), col("close", 8)
+        mode = b["mode"].tolist()
+        position = b["position"].tolist()
+        stage = [s or None for s in b["stage"].tolist()]
+        event, level = b["event"].tolist(), b["level"].tolist()
+        basis = b["basis"].tolist()
+        lp, tp, fp = col("level_price", 8), col("trigger_price", 8), col("fill_price", 8)
+        H, L = col("H", 8), col("L", 8)
+        rebound, threshold = col("rebound", 6), col("threshold")
+        allowed = b["allowed"].tolist()
+        levels = col("levels", 10)
+        stop, cutoff = col("stop", 10), col("cutoff", 10)
+        nxt, npx, ntr = b["next_level"].tolist(), col("next_price", 10), col("next_trigger", 10)
+        for i in range(self.n):
+            yield [
+                day[i], o[i], h[i], l[i], c[i],
+                MODES[mode[i]], position[i], stage[i], _event_label(event[i], level[i]), BASES[basis[i]],
+                LEVEL_LABELS[level[i]], lp[i], tp[i], fp[i],
+                H[i], L[i], rebound[i], threshold[i],
+                allowed[i], *levels[i], stop[i], cutoff[i],
+                LEVEL_LABELS[nxt[i]], npx[i], ntr[i],
+            ]
+
+    def write_csv(self, out_csv: pathlib.Path) -> None:
+        out_csv.parent.mkdir(parents=True, exist_ok=True)
+        with open(out_csv, "w", newline="", encoding="utf-8") as f:
+            w = PROFILER.timed_writer(csv.writer(f))
+            w.writerow(CSV_HEADER)
+            w.writerows(self.rows())
+
+
+class ArrayEngine:
+    """심볼 1개의 Phase 1.5 상태 + 행 버퍼"""
+
+    __slots__ = ("mode", "position", "stage", "H", "L", "cutoff", "_cut", "lv", "asc", "log")
+
+    def __init__(self, capacity: int = 1024):
+        self.mode = HIGH
+        self.position = False
+        self.stage = 0  # 0 = None
+        self.H = NAN
+        self.L = NAN
+        self.cutoff = NAN  # 출력용 (NaN = None, inf = STOP LOSS 이후)
+        self._cut = NAN  # 비교용: px > _cut 이면 금지 (NaN → 항상 허용, -inf → 전부 금지)
+        self.lv: tuple = ()
+        self.asc: tuple = ()  # 레벨 인덱스, 가격 오름차순 (동일 가격은 B1 쪽 먼저)
+        self.log = EventLog(capacity)
+
+    def restore(self, snap: np.void) -> "ArrayEngine":
+        """스냅샷 행(ROW_DTYPE, 하루 마감 상태)에서 상태 복원 — 이후 step() 은 원래 실행과 같은 행을 낸다"""
+        self.mode = int(snap["mode"])
+        self.position = bool(snap["position"])
+        self.stage = int(snap["stage"])
+        H = float(snap["H"])
+        if H == H:
+            self._set_H(H)
+        self.L = float(snap["L"])
+        self._set_cutoff(float(snap["cutoff"]))
+        return self
+
+    def to_state(self, day: Optional[int] = None) -> EngineState:
+        """현재 상태 → EngineState (step_day/LiveStateProjector 와 같은 표현)"""
+        st = EngineState(
+            mode=MODES[self.mode], position=self.position, stage=self.stage or None,
+            L=None if self.L != self.L else self.L,
+            cutoff=None if self.cutoff != self.cutoff else self.cutoff,
+            day=day,
+        )
+        if self.H == self.H:
+            st.set_H(self.H)
+        return st
+
+    def _set_H(self, H: float) -> None:
+        self.H = H
+        self.lv = tuple(round(H * r, 10) for r in LEVEL_RATIOS)
+        self.asc = tuple(sorted(range(7), key=self.lv.__getitem__))
+
+    def _set_cutoff(self, cutoff: float) -> None:
+        self.cutoff = cutoff
+        self._cut = -INF if cutoff == INF else cutoff
+
+    def _allowed(self) -> int:
+        cut = self._cut
+        if cut != cut:
+            return 7
+        return 7 - sum(1 for p in self.lv if p > cut)
+
+    def _emit(
+        self, day: int, o: float, h: float, l: float, c: float, event: int, basis: int, level: int,
+        level_price: float, trigger_price: float, fill_price: float, L_now: float,
+        rebound: float, threshold: float, allowed: int, next_level: int, next_price: float, next_trigger: float,
+    ) -> None:
+        H = self.H
+        self.log.append((
+            day, o, h, l, c, self.mode, self.position, self.stage, event, basis,
+            level, level_price, trigger_price, fill_price,
+            H, L_now, rebound, threshold, allowed,
+            self.lv if self.lv else (NAN,) * 7, H * STOP_LOSS_RATIO, self.cutoff,
+            next_level, next_price, next_trigger,
+        ))
+
+    def step(self, day: int, o: float, h: float, l: float, c: float) -> None:
+        """캔들 1개 반영 (step_day 와 같은 규칙), 이벤트 행 + 스냅샷 행을 버퍼에 추가"""
+        log = self.log
+        restart_row = -1
+        rebound = NAN
+        threshold = NAN
+
+        H = self.H
+        if H != H and self.mode == HIGH:
+            self._set_H(h)
+        elif self.mode == HIGH and h > H:
+            self._set_H(h)
+
+        if self.mode == WAIT and not (l >= self.L):  # L 이 NaN 이거나 새 저점
+            self.L = l
+
+        # wait → high (RESTART)
+        if self.mode == WAIT and h >= self.L * RESTART_MULT:
+            restart_trigger = self.L * RESTART_MULT
+            self.mode = HIGH
+            self._set_H(h)
+            self.position = False
+            self.stage = 0
+            self.L = l
+            self._set_cutoff(NAN)
+            restart_row = log.n
+            self._emit(day, o, h, l, c, EV_RESTART, BASIS_HIGH, 0, NAN, restart_trigger, NAN,
+                       NAN, NAN, NAN, 7, 0, NAN, NAN)
+
+        # high → wait
+        if self.mode == HIGH and l <= self.H * WAIT_ENTRY_RATIO:
+            self.mode = WAIT
+            self.L = l
+
+        lv = self.lv
+        cut = self._cut
+        if self.mode == WAIT and lv:
+            # BUY (포함 레벨 중 가장 얕은 = 가장 높은 가격, 동가면 오름차순 첫 번째)
+            if not self.position:
+                best = -1
+                for i in self.asc:
+                    p = lv[i]
+                    if l <= p <= h and not p > cut and (best < 0 or p > lv[best]):
+                        best = i
+                if best >= 0:
+                    p = lv[best]
+                    self.position = True
+                    self.stage = best + 1
+                    self._emit(day, o, h, l, c, EV_BUY, BASIS_LOW, best + 1, p, l, p,
+                               self.L, NAN, NAN, self._allowed(), best + 1, p, l)
+            # ADD (더 깊은 레벨만, B 순서)
+            if self.position:
+                for i in range(self.stage, 7):
+                    p = lv[i]
+                    if l <= p <= h and not p > cut:
+                        self.stage = i + 1
+                        self._emit(day, o, h, l, c, EV_ADD, BASIS_LOW, i + 1, p, l, p,
+                                   self.L, NAN, NAN, self._allowed(), i + 1, p, l)
+
+        # SELL
+        if self.position and self.stage:
+            L = self.L = l if self.L != self.L else min(self.L, l)
+            rebound = (h / L - 1) * 100.0
+            threshold = _SELL[self.stage]
+            if rebound >= threshold:
+                self.position = False
+                target = L * (1.0 + threshold / 100.0)
+                fill = o if l >= target else target
+                self._set_cutoff(max(target, fill))
+                self.stage = 0
+                self._emit(day, o, h, l, c, EV_SELL, BASIS_HIGH, 0, NAN, target, fill,
+                           L, NAN, threshold, self._allowed(), 0, NAN, NAN)
+
+        # STOP LOSS
+        if self.position and self.stage and l <= self.H * STOP_LOSS_RATIO:
+            stop = self.H * STOP_LOSS_RATIO
+            self.position = False
+            self.stage = 0
+            self._set_cutoff(INF)
+            self._emit(day, o, h, l, c, EV_STOP, BASIS_LOW, 0, NAN, stop, stop,
+                       self.L, NAN, NAN, 0, 0, NAN, NAN)
+
+        # 이벤트 정렬: BUY → ADD → SELL → STOP LOSS → RESTART (RESTART 만 자리 이동)
+        if restart_row >= 0 and log.n - 1 > restart_row:
+            log.move_to_end(restart_row)
+
+        # next_* (포함 규칙)
+        next_level, next_price = 0, NAN
+        lv = self.lv
+        if lv:
+            cut = self._cut
+            best = -1
+            if self.mode == WAIT:
+                for i in self.asc:
+                    p = lv[i]
+                    if l <= p <= h and not p > cut and (best < 0 or p > lv[best]):
+                        best = i
+            if best < 0:
+                for i in self.asc:
+                    p = lv[i]
+                    if not p > cut and l > p:
+                        best = i
+                        break
+            if best >= 0:
+                next_level, next_price = best + 1, lv[best]
+
+        self._emit(day, o, h, l, c, EV_RESTART if restart_row >= 0 else EV_NONE, BASIS_NONE, 0, NAN, NAN, NAN,
+                   self.L, rebound, threshold, self._allowed(), next_level, next_price, l)
+
+    def run(self, ohlc: List[Dict[str, Any]]) -> "ArrayEngine":
+        """run_phase1_5_simulation 과 같이 첫 캔들을 건너뛰고 전체 재생"""
+        for row in ohlc[1:]:
+            self.step(int(row["closeTime"]) // DAY_MS, row["open"], row["high"], row["low"], row["close"])
+        return self
+
+
+def run_array_simulation(symbol: str, ohlc: List[Dict[str, Any]], out_csv: pathlib.Path) -> None:
+    """run_phase1_5_simulation 과 같은 디버그 CSV"""
+    engine = ArrayEngine(capacity=len(ohlc) + len(ohlc) // 4)
+    engine.run(ohlc)
+    engine.log.write_csv(out_csv)
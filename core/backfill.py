@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+전체 이력 백필 (상장일부터, 심볼별 기간을 독립 구간으로 나눠 병렬 조회) — 저장소 interval(1d/1h/5m…) 단위
+
+- 상장일: klines startTime=0 limit=1 (심볼당 1회, 이후 data/klines/1d/_meta.json 에 저장)
+- 저장소에 없는 구간(앞/중간 누락/뒤)을 1000캔들 단위 구간으로 분할 → 모든 심볼의 구간을
+  하나의 스레드 풀에서 동시에 조회 (직렬 페이징 + 0.2초 sleep 대신 weight 예산이 속도를 결정)
+- WeightBudget: 분당 weight 예산 (기본 3000 = Binance 한도 6000 의 절반),
+  응답의 X-MBX-USED-WEIGHT-1M 으로 실제 사용량 보정
+- 라운드마다 병합 → 누락 재검사 → 남은 구간만 재조회 (max_rounds)
+  재조회해도 캔들이 없는 구간은 거래소 측 공백으로 보고 meta 의 holes 에 기록 (다음부터 건너뜀)
+- 체크섬이 어긋난 블록(core.kline_store.verify)은 repair 구간으로 다시 받아 덮어쓴다
+- 마감된 캔들만 저장 (진행 중인 오늘 일봉 제외)
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core import http_client
+from core.kline_store import KlineStore, block_range, kline_to_row
+from core.timeaxis import DAY_MS
+
+BINANCE_BASE = "https://api.binance.com"
+URL_KLINES = f"{BINANCE_BASE}/api/v3/klines"
+KLINES_WEIGHT = 2
+WINDOW_CANDLES = 1000
+DEFAULT_WEIGHT_PER_MINUTE = 3000
+
+
+class WeightBudget:
+    """고정 1분 창 weight 예산 — 초과하면 다음 분까지 대기"""
+
+    def __init__(self, per_minute: int = DEFAULT_WEIGHT_PER_MINUTE):
+        self.per_minute = per_minute
+        self._minute = -1
+        self._used = 0
+        self.waited_sec = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, weight: int) -> None:
+        while True:
+            with self._lock:
+                now = time.time()
+                minute = int(now // 60)
+                if minute != self._minute:
+                    self._minute, self._used = minute, 0
+                if self._used + weight <= self.per_minute:
+                    self._used += weight
+                    return
+                wait = 60 - now % 60 + 0.05
+                self.waited_sec += wait
+            time.sleep(wait)
+
+    def observe(self, headers) -> None:
+        used = headers.get("X-MBX-USED-WEIGHT-1M") if headers is not None else None
+        if used and str(used).isdigit():
+            with self._lock:
+                if int(time.time() // 60) == self._minute:
+                    self._used = max(self._used, int(used))
+
+
+@dataclass(frozen=True)
+class Window:
+    symbol: str
+    start_ms: int  # 첫 openTime (포함)
+    end_ms: int  # 마지막 openTime 이하
+    kind: str = "full"  # full / head / gap / tail / repair
+
+
+@dataclass
+class BackfillResult:
+    symbol: str
+    candles: int = 0
+    added: int = 0
+    requests: int = 0
+    failed: int = 0
+    gaps: List[Tuple[int, int]] = field(default_factory=list)
+
+
+def split_windows(symbol: str, start_ms: int, end_ms: int, kind: str = "full", step_ms: int = DAY_MS) -> List[Window]:
+    span = WINDOW_CANDLES * step_ms
+    return [Window(symbol, s, min(s + span - step_ms, end_ms), kind) for s in range(start_ms, end_ms + 1, span)]
+
+
+def last_closed_open_ms(now_ms: Optional[int] = None, step_ms: int = DAY_MS) -> int:
+    now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+    return now_ms // step_ms * step_ms - step_ms
+
+
+class Backfiller:
+    def __init__(
+        self,
+        store: Optional[KlineStore] = None,
+        workers: int = 8,
+        weight_per_minute: int = DEFAULT_WEIGHT_PER_MINUTE,
+        max_rounds: int = 3,
+    ):
+        self.store = store or KlineStore()
+        self.workers = workers
+        self.budget = WeightBudget(weight_per_minute)
+        self.max_rounds = max_rounds
+        self.requests = 0
+        self._count_lock = threading.Lock()
+
+    # ----- HTTP -----
+
+    def _klines(self, symbol: str, start_ms: int, end_ms: Optional[int], limit: int) -> list:
+        self.budget.acquire(KLINES_WEIGHT)
+        params = {"symbol": symbol, "interval": self.store.interval, "startTime": start_ms, "limit": limit}
+        if end_ms is not None:
+            params["endTime"] = end_ms
+        resp = http_client.get(URL_KLINES, params=params, timeout=20, retry=http_client.DEFAULT_RETRY)
+        with self._count_lock:
+            self.requests += 1
+        self.budget.observe(resp.headers)
+        resp.raise_for_status()
+        return resp.json()
+
+    def listing_ms(self, symbol: str) -> Optional[int]:
+        listed = self.store.meta(symbol).get("listed")
+        if listed is None:
+            data = self._klines(symbol, 0, None, 1)
+            if not data:
+                return None
+            listed = int(data[0][0])
+            self.store.set_meta(symbol, listed=listed)
+        return listed
+
+    def fetch(self, w: Window) -> List[Dict]:
+        cutoff = last_closed_open_ms(step_ms=self.store.step_ms)
+        return [kline_to_row(k) for k in self._klines(w.symbol, w.start_ms, w.end_ms, WINDOW_CANDLES) if int(k[0]) <= cutoff]
+
+    # ----- 계획 -----
+
+    def missing_windows(self, symbol: str, since_ms: Optional[int] = None) -> List[Window]:
+        meta = self.store.meta(symbol)
+        listed = meta.get("listed")
+        if listed is None:
+            return []
+        start = max(listed, since_ms) if since_ms else listed
+        step = self.store.step_ms
+        end = last_closed_open_ms(step_ms=step)
+        if start > end:
+            return []
+        rows = self.store.load(symbol)
+        rows = [r for r in rows if r["openTime"] >= start]
+        if not rows:
+            return split_windows(symbol, start, end, step_ms=step)
+        out: List[Window] = []
+        first, last = rows[0]["openTime"], rows[-1]["openTime"]
+        if start < first:
+            out += split_windows(symbol, start, first - step, "head", step)
+        for g in self.store.gaps(symbol, rows):
+            out += split_windows(symbol, g[0], g[1], "gap", step)
+        if last < end:
+            out += split_windows(symbol, last + step, end, "tail", step)
+        for block in self.store.verify(symbol):  # 체크섬이 어긋난 블록은 다시 받아 덮어씀
+            b0, b1 = block_range(block, step)
+            out += split_windows(symbol, max(b0, start), min(b1, end), "repair", step)
+        holes = {tuple(h) for h in meta.get("holes", [])}
+        return [w for w in out if (w.start_ms, w.end_ms) not in holes]
+
+    # ----- 실행 -----
+
+    def run(self, symbols: Iterable[str], since_ms: Optional[int] = None) -> Dict[str, BackfillResult]:
+        symbols = [s.upper() for s in symbols]
+        results = {s: BackfillResult(s) for s in symbols}
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            # 상장일 조회도 병렬
+            for sym, fut in [(s, pool.submit(self.listing_ms, s)) for s in symbols]:
+                try:
+                    if fut.result() is None:
+                        print(f"[백필] {sym}: 캔들 없음 (미상장?)")
+                except Exception as e:
+                    results[sym].failed += 1
+                    print(f"[백필] {sym}: 상장일 조회 실패 — {e}")
+
+            for rnd in range(1, self.max_rounds + 1):
+                windows = [w for s in symbols for w in self.missing_windows(s, since_ms)]
+                if not windows:
+                    break
+                print(f"[백필] 라운드 {rnd}: {len(windows)}개 구간 ({len({w.symbol for w in windows})}개 심볼)")
+                fetched: Dict[str, List[Dict]] = defaultdict(list)
+                empty: Dict[str, List[Window]] = defaultdict(list)
+                futures = {pool.submit(self.fetch, w): w for w in windows}
+                for fut in as_completed(futures):
+                    w = futures[fut]
+                    results[w.symbol].requests += 1
+                    try:
+                        rows = fut.result()
+                    except Exception as e:
+                        results[w.symbol].failed += 1
+                        print(f"[백필] {w.symbol} 구간 조회 실패 ({w.kind}): {e}")
+                        continue
+                    if rows:
+                        fetched[w.symbol].extend(rows)
+                    elif w.kind in ("gap", "head") and rnd > 1:
+                        empty[w.symbol].append(w)
+                for sym, rows in fetched.items():
+                    before = len(self.store.load(sym))
+                    merged = self.store.merge(sym, rows)
+                    results[sym].added += len(merged) - before
+                for sym, ws in empty.items():
+                    holes = self.store.meta(sym).get("holes", []) + [[w.start_ms, w.end_ms] for w in ws]
+                    self.store.set_meta(sym, holes=holes)
+
+        for sym, res in results.items():
+            res.candles = len(self.store.load(sym))
+            res.gaps = [(w.start_ms, w.end_ms) for w in self.missing_windows(sym, since_ms) if w.kind == "gap"]
+        return results
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+일일 빌드 변경 피드 (change-data-capture) — 상태가 실제로 바뀐 심볼만 기록
+
+  output/changes/changes_<YYYYMMDD_HHMMSS>.json   빌드 1회 = 파일 1개 (최근 KEEP_FEEDS 개 유지)
+  output/changes/latest.json                      마지막 빌드 피드 (같은 내용)
+
+  {"run": "2025-10-20T00:05:12",
+   "built":   {BASE: {"date": 마지막 일자, "close": 종가}},            빌드된 전체 심볼
+   "changed": {BASE: {"new_events": [{date, event, level_name, trigger_price, fill_price}],
+                      "fields": {"mode": [전, 후], "next_buy_level_name": [전, 후], ...},
+                      "new_symbol": bool, "history_rewritten": bool}}}
+
+- 빌드가 디버그 파일을 덮어쓰기 직전(before)과 직후(after)의 요약을 비교
+  요약 = 마지막 스냅샷의 TRACKED 필드 + 이벤트 목록 (RESTART 포함, 값은 디버그 CSV 셀 문자열 그대로)
+- new_events: 이전 파일에 없던 (date, event, level_name) 중 이전 마지막 일자 이후 것
+  (진행 중이던 마지막 일자에 뒤늦게 생긴 이벤트 포함)
+  그보다 이전 이벤트가 달라졌으면 history_rewritten (조회 구간 이동/OHLC 보정)
+- 소비자는 changes_since(run) 으로 마지막 처리 이후 바뀐 심볼 집합을 받아 그 심볼만 재계산/재시드
+  피드가 없거나 끊겼으면 None → 전체 재처리
+"""
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from core.compact_debug import CompactDebug, is_compact
+from core.phase1_5_state import CSV_HEADER, read_debug_rows
+
+DEFAULT_ROOT = "output/changes"
+KEEP_FEEDS = 60
+TRACKED = (
+    "mode", "position", "stage", "H", "cutoff_price",
+    "next_buy_level_name", "next_buy_level_price",
+)
+EVENT_FIELDS = ("date", "event", "level_name", "trigger_price", "fill_price")
+
+
+def _cell(v: Any) -> str:
+    """csv.writer 와 같은 셀 문자열 (압축 형식 행을 CSV 행과 같은 값으로 비교)"""
+    return "" if v is None else str(v)
+
+
+def _event_rows(rows: Iterable[Dict[str, str]]) -> List[Dict[str, str]]:
+    """event 가 있는 행. 스냅샷 행(basis 없음)의 RESTART 는 같은 날 RESTART 이벤트 행이 없을 때만
+    (이전 형식 파일은 RESTART 가 스냅샷 행에만 있음) → 두 형식 모두 RESTART 1회씩"""
+    out: List[Dict[str, str]] = []
+    seen = set()
+    for r in rows:
+        if not r.get("event"):
+            continue
+        key = (r["date"], r["event"])
+        if r.get("basis"):
+            seen.add(key)
+        elif key in seen:
+            continue
+        out.append(r)
+    return out
+
+
+@dataclass
+class Summary:
+    date: str
+    close: str
+    fields: Dict[str, str]
+    events: List[Dict[str, str]]
+
+    @classmethod
+    def of(cls, path: pathlib.Path) -> Optional["Summary"]:
+        if not path.exists():
+            return None
+        if is_compact(path):
+            packed = CompactDebug.load(path)
+            if not len(packed):
+                return None
+            last = dict(zip(CSV_HEADER, map(_cell, list(packed.rows(int(packed.day[-1])))[-1])))
+            events = _event_rows(dict(zip(CSV_HEADER, map(_cell, r))) for r in packed.event_rows())
+        else:
+            rows = read_debug_rows(path)
+            if not rows:
+                return None
+            last = rows[-1]
+            events = _event_rows(rows)
+        return cls(
+            date=last["date"],
+            close=last["close"],
+            fields={k: last.get(k, "") for k in TRACKED},
+            events=[{k: e.get(k, "") for k in EVENT_FIELDS} for e in events],
+        )
+
+
+def _event_keys(events: List[Dict[str, str]]) -> Counter:
+    return Counter((e["date"], e["event"], e["level_name"]) for e in events)
+
+
+def diff(before: Optional[Summary], after: Summary) -> Optional[Dict[str, Any]]:
+    """before → after 변경 내역 (변화 없으면 None)"""
+    if before is None:
+        return {
+            "new_events": [e for e in after.events if e["date"] >= after.date],
+            "fields": {k: [None, v] for k, v in after.fields.items()},
+            "new_symbol": True,
+            "history_rewritten": False,
+        }
+    added = _event_keys(after.events) - _event_keys(before.events)
+    removed = _event_keys(before.events) - _event_keys(after.events)
+    first_after = after.events[0]["date"] if after.events else after.date
+    new_events = []
+    for e in after.events:
+        key = (e["date"], e["event"], e["level_name"])
+        if added[key] > 0 and e["date"] >= before.date:
+            added[key] -= 1
+            new_events.append(e)
+    rewritten = any(n > 0 and k[0] < before.date for k, n in added.items()) or any(
+        k[0] >= first_after for k in removed
+    )
+    fields = {k: [before.fields.get(k, ""), v] for k, v in after.fields.items() if before.fields.get(k, "") != v}
+    if not new_events and not fields and not rewritten:
+        return None
+    return {"new_events": new_events, "fields": fields, "new_symbol": False, "history_rewritten": rewritten}
+
+
+@dataclass
+class ChangeFeed:
+    root: pathlib.Path = pathlib.Path(DEFAULT_ROOT)
+    run: str = field(default_factory=lambda: datetime.now().isoformat(timespec="seconds"))
+    built: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    changed: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    _before: Dict[str, Optional[Summary]] = field(default_factory=dict)
+
+    def before(self, base: str, path: pathlib.Path) -> None:
+        """디버그 파일을 덮어쓰기 전에 호출"""
+        try:
+            self._before[base] = Summary.of(path)
+        except Exception as e:  # 읽을 수 없는 이전 파일 = 신규 취급
+            print(f"[변경 피드] {base} 이전 파일 요약 실패: {e}")
+            self._before[base] = None
+
+    def after(self, base: str, path: pathlib.Path) -> Optional[Dict[str, Any]]:
+        """디버그 파일을 쓴 뒤 호출 — 변경 내역 반환 (없으면 None)"""
+        summary = Summary.of(path)
+        if summary is None:
+            return None
+        self.built[base] = {"date": summary.date, "close": summary.close}
+        change = diff(self._before.pop(base, None), summary)
+        if change is not None:
+            self.changed[base] = change
+        return change
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"run": self.run, "built": self.built, "changed": self.changed}
+
+    def write(self) -> pathlib.Path:
+        self.root.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.fromisoformat(self.run).strftime("%Y%m%d_%H%M%S")
+        path = self.root / f"changes_{stamp}.json"
+        text = json.dumps(self.as_dict(), ensure_ascii=False, indent=1)
+        for target in (path, self.root / "latest.json"):
+            tmp = target.with_suffix(".tmp")
+            tmp.write_text(text, encoding="utf-8")
+            os.replace(tmp, target)
+        for old in sorted(self.root.glob("changes_*.json"))[:-KEEP_FEEDS]:
+            old.unlink()
+        return path
+
+    def message(self, limit: int = 30) -> str:
+        """텔레그램(HTML) 요약 — 이벤트/모드/목표/H 변화"""
+        lines = [f"<b>📋 일일 빌드 상태 변화</b> ({len(self.changed)}/{len(self.built)} 심볼)"]
+        for base, ch in sorted(self.changed.items())[:limit]:
+            parts = [e["event"] for e in ch["new_events"]]
+            if ch["new_symbol"]:
+                parts.insert(0, "신규")
+            for k, label in (("mode", "모드"), ("next_buy_level_name", "다음목표"), ("H", "H")):
+                if k in ch["fields"] and not ch["new_symbol"]:
+                    b, a = ch["fields"][k]
+                    parts.append(f"{label} {b or '-'}→{a or '-'}")
+            if ch["history_rewritten"]:
+                parts.append("이력 재계산")
+            lines.append(f"• <b>{base}</b>: {', '.join(parts) or '레벨 변화'}")
+        if len(self.changed) > limit:
+            lines.append(f"… 외 {len(self.changed) - limit}개")
+        return "\n".join(lines)
+
+
+# ===== 소비자 =====
+
+def load_feeds(root: str = DEFAULT_ROOT) -> List[Dict[str, Any]]:
+    """보관 중인 피드 (오래된 순)"""
+    out = []
+    for path in sorted(pathlib.Path(root).glob("changes_*.json")):
+        try:
+            out.append(json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError) as e:
+            print(f"[변경 피드] 읽기 실패 ({path}): {e}")
+    return out
+
+
+def latest_feed(root: str = DEFAULT_ROOT) -> Optional[Dict[str, Any]]:
+    path = pathlib.Path(root) / "latest.json"
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def changes_since(run: Optional[str], root: str = DEFAULT_ROOT) -> Optional[Tuple[str, Set[str], Dict[str, Dict[str, str]]]]:
+    """
+    run(마지막으로 처리한 피드) 이후의 (최신 run, 변경 심볼 합집합, 최신 built).
+    run 이 없거나 보관 피드보다 오래돼 이어지지 않으면 None → 전체 재처리
+    """
+    if not run:
+        return None
+    feeds = load_feeds(root)
+    runs = [f["run"] for f in feeds]
+    if run not in runs:
+        return None
+    newer = feeds[runs.index(run) + 1:]
+    if not newer:
+        return run, set(), feeds[-1]["built"]
+    changed: Set[str] = set()
+    for f in newer:
+        changed |= set(f["changed"])
+    return newer[-1]["run"], changed, newer[-1]["built"]
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+압축 디버그 형식 (이벤트 + 주기적 체크포인트만 저장, 스냅샷은 읽을 때 재생)
+
+  debug/<BASE>_debug.npz
+    day          int32 (n,)     엔진이 처리한 일자 라벨 (epoch-day, 스냅샷 1개/일)
+    prices       (n, 4)         open/high/low/close — 10진 자릿수 d 로 정수화 + 일간 차분 (decimals=-1 이면 float64 그대로)
+    events       ROW_DTYPE      이벤트 행 (BUY/ADD/SELL/STOP LOSS/RESTART)
+    checkpoints  ROW_DTYPE      CHECKPOINT_DAYS 일마다 + 마지막 일자의 스냅샷 행 (= 하루 마감 엔진 상태)
+    tail         ROW_DTYPE      [마지막 스냅샷, 마지막 이벤트] — read_tail() 이 이 배열만 읽음 (재생/전체 로드 없음)
+
+- 스냅샷 31컬럼 행은 OHLC + 상태로 완전히 유도되므로 저장하지 않는다
+  rows(start, end): 직전 체크포인트에서 ArrayEngine 을 복원해 구간만 재생 → 전체 CSV 와 같은 행
+- 가격 정수화는 ticks / 10**d == 원래 float 이 전부 성립할 때만 사용 (복원이 비트 단위로 같음)
+- 기존 소비자: find_debug()/read_rows()/source() 가 CSV 와 압축 파일을 같은 방식으로 읽는다
+  pd.read_csv(source(path)) / read_rows(path) → 전체 CSV 와 같은 DataFrame / dict 행
+- OMG_COMPACT_DEBUG=1 (또는 auto_debug_builder --compact) 이면 일일 빌드가 이 형식으로 저장
+"""
+from __future__ import annotations
+
+import csv
+import io
+import os
+import pathlib
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from core.array_engine import BASIS_NONE, ROW_DTYPE, ArrayEngine, EventLog
+from core.phase1_5_state import CSV_HEADER, EngineState
+from core.timeaxis import DAY_MS, parse_day
+
+FORMAT_VERSION = 1
+CHECKPOINT_DAYS = 90
+MAX_DECIMALS = 12
+CSV_SUFFIX = "_debug.csv"
+COMPACT_SUFFIX = "_debug.npz"
+PRICE_FIELDS = ("open", "high", "low", "close")
+
+Day = Union[int, str, None]
+
+
+def enabled(flag: bool = False) -> bool:
+    return flag or os.environ.get("OMG_COMPACT_DEBUG", "") not in ("", "0")
+
+
+# ===== 가격 인코딩 =====
+
+def _encode_prices(px: np.ndarray) -> Tuple[int, np.ndarray]:
+    """(decimals, 데이터) — 정수화가 정확하면 일간 차분 int64, 아니면 float64 그대로"""
+    if px.size and np.isfinite(px).all():
+        for d in range(MAX_DECIMALS + 1):
+            scale = 10.0 ** d
+            ticks = np.rint(px * scale)
+            if np.abs(ticks).max() < 2 ** 53 and np.array_equal(ticks / scale, px):
+                t = ticks.astype(np.int64)
+                return d, np.diff(t, axis=0, prepend=np.zeros((1, t.shape[1]), dtype=np.int64))
+    return -1, px
+
+
+def _decode_prices(decimals: int, data: np.ndarray) -> np.ndarray:
+    if decimals < 0:
+        return data.astype(np.float64)
+    return np.cumsum(data, axis=0) / 10.0 ** decimals
+
+
+def _as_day(d: Day) -> Optional[int]:
+    if d is None or isinstance(d, (int, np.integer)):
+        return d
+    return parse_day(d)
+
+
+# ===== 형식 =====
+
+@dataclass
+class CompactDebug:
+    symbol: str
+    day: np.ndarray
+    prices: np.ndarray
+    events: np.ndarray
+    checkpoints: np.ndarray
+
+    @classmethod
+    def from_engine(cls, symbol: str, engine: ArrayEngine, checkpoint_days: int = CHECKPOINT_DAYS) -> "CompactDebug":
+        rows = engine.log.rows_array
+        is_snap = rows["basis"] == BASIS_NONE
+        snaps = rows[is_snap]
+        picks = np.arange(checkpoint_days - 1, len(snaps), checkpoint_days)
+        if len(snaps) and (not len(picks) or picks[-1] != len(snaps) - 1):
+            picks = np.append(picks, len(snaps) - 1)
+        return cls(
+            symbol=symbol,
+            day=snaps["day"].astype(np.int32),
+            prices=np.stack([snaps[f] for f in PRICE_FIELDS], axis=1),
+            events=rows[~is_snap].copy(),
+            checkpoints=snaps[picks],
+        )
+
+    def save(self, path: pathlib.Path, **extra: np.ndarray) -> None:
+        """extra: 형식 외 부가 배열 (예: core.state_index 의 원본 CSV 스탬프) — load() 는 무시"""
+        decimals, prices = _encode_prices(self.prices)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            np.savez_compressed(
+                f, version=FORMAT_VERSION, symbol=self.symbol, day=self.day,
+                decimals=decimals, prices=prices, events=self.events, checkpoints=self.checkpoints, tail=self.tail(),
+                **extra,
+            )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: pathlib.Path) -> "CompactDebug":
+        with np.load(path) as z:
+            if int(z["version"]) != FORMAT_VERSION:
+                raise ValueError(f"지원하지 않는 압축 디버그 버전 {int(z['version'])}: {path}")
+            return cls(
+                symbol=str(z["symbol"]),
+                day=z["day"],
+                prices=_decode_prices(int(z["decimals"]), z["prices"]),
+                events=z["events"],
+                checkpoints=z["checkpoints"],
+            )
+
+    def __len__(self) -> int:
+        return len(self.day)
+
+    def tail(self) -> np.ndarray:
+        """[마지막 스냅샷, 마지막 이벤트] (이벤트가 없으면 스냅샷 1행, 데이터가 없으면 빈 배열)"""
+        if not len(self):
+            return np.empty(0, dtype=ROW_DTYPE)
+        cps = self.checkpoints
+        last = cps[-1:] if len(cps) and cps["day"][-1] == self.day[-1] else self.replay(int(self.day[-1]))[-1:]
+        return np.concatenate([last, self.events[-1:]])
+
+    # ----- 재생 -----
+
+    def _seed(self, before: int) -> Tuple[ArrayEngine, int]:
+        """before(epoch-day) 이전의 마지막 체크포인트로 복원한 엔진과 재생 시작 위치 (이진 탐색)"""
+        engine = ArrayEngine(capacity=64)
+        k = int(np.searchsorted(self.checkpoints["day"], before, side="left")) - 1
+        if k < 0:
+            return engine, 0
+        engine.restore(self.checkpoints[k])
+        return engine, int(np.searchsorted(self.day, self.checkpoints["day"][k], side="right"))
+
+    def _step(self, engine: ArrayEngine, i: int, i1: int) -> None:
+        days = self.day[i:i1].tolist()
+        for d, (o, h, l, c) in zip(days, self.prices[i:i1].tolist()):
+            engine.step(d, o, h, l, c)
+
+    def replay(self, start: Day = None, end: Day = None) -> np.ndarray:
+        """[start, end] 일자의 전체 행 (이벤트 + 스냅샷, ROW_DTYPE) — 체크포인트 이후만 재생"""
+        s, e = _as_day(start), _as_day(end)
+        i0 = 0 if s is None else int(np.searchsorted(self.day, s, side="left"))
+        i1 = len(self.day) if e is None else int(np.searchsorted(self.day, e, side="right"))
+        if i0 >= i1:
+            return np.empty(0, dtype=ROW_DTYPE)
+        engine, i = self._seed(int(self.day[i0]))
+        self._step(engine, i, i1)
+        rows = engine.log.rows_array
+        return rows[rows["day"] >= self.day[i0]]
+
+    def state_as_of(self, date: Day) -> Optional[EngineState]:
+        """date(포함) 이전 마지막 일자의 마감 상태 — 직전 체크포인트부터 최대 CHECKPOINT_DAYS 캔들 재생.
+        첫 일자보다 이르면 None"""
+        i = int(np.searchsorted(self.day, _as_day(date), side="right")) - 1
+        if i < 0:
+            return None
+        day = int(self.day[i])
+        engine, j = self._seed(day + 1)
+        self._step(engine, j, i + 1)
+        return engine.to_state(day)
+
+    def rows(self, start: Day = None, end: Day = None) -> Iterator[List[Any]]:
+        """전체 디버그 CSV 와 같은 31컬럼 행"""
+        return EventLog.of(self.replay(start, end)).rows()
+
+    def event_rows(self) -> Iterator[List[Any]]:
+        """저장된 이벤트 행만 (재생 없음)"""
+        return EventLog.of(self.events).rows()
+
+    def write_csv(self, out_csv: pathlib.Path, start: Day = None, end: Day = None) -> None:
+        EventLog.of(self.replay(start, end)).write_csv(out_csv)
+
+    def csv_text(self, start: Day = None, end: Day = None, events_only: bool = False) -> str:
+        buf = io.StringIO()
+        w = csv.writer(buf)
+        w.writerow(CSV_HEADER)
+        w.writerows(self.event_rows() if events_only else self.rows(start, end))
+        return buf.getvalue()
+
+    def ohlc(self) -> List[Dict[str, Any]]:
+        """엔진 입력 형식 (첫 캔들은 엔진이 건너뛰므로 전날 더미 1개 추가)"""
+        return _engine_input(zip(self.day.tolist(), self.prices.tolist()))
+
+
+def _engine_input(candles: Iterable[Tuple[int, Tuple[float, float, float, float]]]) -> List[Dict[str, Any]]:
+    out = [
+        {"openTime": d * DAY_MS, "open": o, "high": h, "low": l, "close": c, "closeTime": d * DAY_MS + DAY_MS - 1}
+        for d, (o, h, l, c) in candles
+    ]
+    if out:
+        first = dict(out[0], openTime=out[0]["openTime"] - DAY_MS, closeTime=out[0]["closeTime"] - DAY_MS)
+        out.insert(0, first)
+    return out
+
+
+def ohlc_from_rows(rows: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+    """디버그 CSV 행의 일자별 OHLC → 엔진 입력 (2일 미만이면 빈 목록)"""
+    seen: Dict[int, Tuple[float, float, float, float]] = {}
+    for r in rows:
+        try:
+            seen[parse_day(r["date"])] = (float(r["open"]), float(r["high"]), float(r["low"]), float(r["close"]))
+        except (KeyError, ValueError):
+            continue
+    if len(seen) < 2:
+        return []
+    return _engine_input(sorted(seen.items()))
+
+
+def write_compact(
+    symbol: str, ohlc: List[Dict[str, Any]], out_path: pathlib.Path, checkpoint_days: int = CHECKPOINT_DAYS
+) -> CompactDebug:
+    """run_phase1_5_simulation 대신 호출 — 같은 엔진 결과를 압축 형식으로 저장"""
+    engine = ArrayEngine(capacity=len(ohlc) + len(ohlc) // 4).run(ohlc)
+    packed = CompactDebug.from_engine(symbol, engine, checkpoint_days)
+    packed.save(out_path)
+    return packed
+
+
+# ===== 소비자용 (CSV / 압축 공통) =====
+
+def is_compact(path: pathlib.Path) -> bool:
+    return pathlib.Path(path).name.endswith(COMPACT_SUFFIX)
+
+
+def find_debug(debug_dir: pathlib.Path, base: str) -> pathlib.Path:
+    """심볼의 디버그 파일 — 둘 다 있으면 최근 것, 없으면 CSV 경로 (exists() 로 확인)"""
+    candidates = [p for p in (debug_dir / f"{base}{CSV_SUFFIX}", debug_dir / f"{base}{COMPACT_SUFFIX}") if p.exists()]
+    if not candidates:
+        return debug_dir / f"{base}{CSV_SUFFIX}"
+    return max(candidates, key=lambda p: p.stat().st_mtime)
+
+
+def debug_files(debug_dir: pathlib.Path) -> Dict[str, pathlib.Path]:
+    """{베이스 심볼: 디버그 파일} (CSV/압축 중 최근 것)"""
+    bases = {p.name[: -len(CSV_SUFFIX)] for p in debug_dir.glob(f"*{CSV_SUFFIX}")}
+    bases |= {p.name[: -len(COMPACT_SUFFIX)] for p in debug_dir.glob(f"*{COMPACT_SUFFIX}")}
+    return {b: find_debug(debug_dir, b) for b in sorted(bases)}
+
+
+def source(path: Union[str, pathlib.Path], events_only: bool = False) -> Union[pathlib.Path, io.StringIO]:
+    """pd.read_csv()/csv 모듈에 넘길 입력 — 압축 파일이면 재생한 CSV 텍스트"""
+    path = pathlib.Path(path)
+    if not is_compact(path):
+        return path
+    return io.StringIO(CompactDebug.load(path).csv_text(events_only=events_only))
+
+
+def read_tail(path: Union[str, pathlib.Path]) -> np.ndarray:
+    """압축 파일의 CompactDebug.tail() — 저장된 tail 배열만 읽음 (tail 이전 파일은 전체 로드)"""
+    with np.load(path) as z:
+        if "tail" in z.files:
+            return z["tail"]
+    return CompactDebug.load(pathlib.Path(path)).tail()
+
+
+def read_rows(path: Union[str, pathlib.Path]) -> List[Dict[str, str]]:
+    src = source(path)
+    if isinstance(src, io.StringIO):
+        return list(csv.DictReader(src))
+    with open(src, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+엔진 동등성 검증 (reference vs candidate)
+
+- reference: core.phase1_5_core.run_phase1_5_simulation (CSV 출력 그대로)
+- candidate: register_engine() 으로 등록한 엔진 (symbol, ohlc) → CSV 행 목록(헤더 제외)
+- 행 단위 비교: 행 수, 이벤트 순서(BUY → ADD → SELL → STOP LOSS), forbidden 개수,
+  cutoff_price, next_buy_* 등 31개 컬럼 전부. 숫자는 상대/절대 허용 오차로 비교
+- 불일치 시 shrink(): 첫 불일치 이후 캔들 제거 → 앞쪽 구간 delta-debugging 제거
+  → 재현되는 최소 시계열을 돌려준다
+
+입력 시계열:
+  random_series()    합성 시장 (core.synthetic_market, 파라미터도 무작위)
+  recorded_series()  debug/*.csv 의 open/high/low/close 로 복원한 실제 일봉
+"""
+from __future__ import annotations
+
+import csv
+import io
+import math
+import pathlib
+import random
+import tempfile
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from core.array_engine import ArrayEngine
+from core.compact_debug import CompactDebug, debug_files, is_compact, ohlc_from_rows
+from core.phase1_5_core import run_phase1_5_simulation
+from core.phase1_5_state import CSV_HEADER, EngineState, read_debug_rows, step_day
+from core.synthetic_market import generate_ohlc
+from core.timeaxis import DAY_MS, parse_day
+
+Engine = Callable[[str, List[Dict[str, Any]]], List[List[str]]]
+
+REL_TOL = 1e-9
+ABS_TOL = 1e-12
+
+
+def _csv_roundtrip(rows: List[List[Any]]) -> List[List[str]]:
+    """엔진 출력 값을 CSV 문자열로 정규화 (None → "", float → repr)"""
+    buf = io.StringIO()
+    csv.writer(buf).writerows(rows)
+    buf.seek(0)
+    return list(csv.reader(buf))
+
+
+# ===== 엔진 =====
+
+def reference_engine(symbol: str, ohlc: List[Dict[str, Any]]) -> List[List[str]]:
+    with tempfile.TemporaryDirectory(prefix="omg_eq_") as tmp:
+        out = pathlib.Path(tmp) / "ref.csv"
+        run_phase1_5_simulation(symbol=symbol, ohlc=ohlc, seed_H=None, out_csv=out, limit_days=0)
+        with open(out, newline="", encoding="utf-8") as f:
+            return list(csv.reader(f))[1:]
+
+
+def stepper_engine(symbol: str, ohlc: List[Dict[str, Any]]) -> List[List[str]]:
+    """core.phase1_5_state.step_day 기반 (장중 투영/체크포인트가 쓰는 경로)"""
+    st = EngineState()
+    rows: List[List[Any]] = []
+    for row in ohlc[1:]:
+        events, snapshot = step_day(st, int(row["closeTime"]) // DAY_MS, row["open"], row["high"], row["low"], row["close"])
+        rows.extend(events)
+        rows.append(snapshot)
+    return _csv_roundtrip(rows)
+
+
+def array_engine(symbol: str, ohlc: List[Dict[str, Any]]) -> List[List[str]]:
+    """core.array_engine (__slots__ 상태 + 구조체 배열 행 버퍼, 반올림은 내보낼 때만)"""
+    return _csv_roundtrip(ArrayEngine(capacity=len(ohlc) + 16).run(ohlc).log.rows())
+
+
+ENGINES: Dict[str, Engine] = {"stepper": stepper_engine, "array": array_engine}
+
+
+def register_engine(name: str, engine: Engine) -> None:
+    ENGINES[name] = engine
+
+
+# ===== 비교 =====
+
+@dataclass
+class Mismatch:
+    row: int  # 0-based (헤더 제외)
+    column: str
+    reference: Optional[str]
+    candidate: Optional[str]
+    date: str = ""
+
+    def __str__(self) -> str:
+        return f"row {self.row} ({self.date}) [{self.column}] reference={self.reference!r} candidate={self.candidate!r}"
+
+
+def _num(s: str) -> Optional[float]:
+    try:
+        return float(s)
+    except ValueError:
+        return None
+
+
+def values_equal(a: str, b: str, rel_tol: float = REL_TOL, abs_tol: float = ABS_TOL) -> bool:
+    if a == b:
+        return True
+    fa, fb = _num(a), _num(b)
+    if fa is None or fb is None:
+        return False
+    if math.isinf(fa) or math.isinf(fb):
+        return fa == fb
+    return math.isclose(fa, fb, rel_tol=rel_tol, abs_tol=abs_tol)
+
+
+def diff_rows(
+    ref: List[List[str]], cand: List[List[str]], rel_tol: float = REL_TOL, abs_tol: float = ABS_TOL
+) -> Optional[Mismatch]:
+    """첫 번째 불일치 (없으면 None)"""
+    for i, (r, c) in enumerate(zip(ref, cand)):
+        for j, col in enumerate(CSV_HEADER):
+            a = r[j] if j < len(r) else None
+            b = c[j] if j < len(c) else None
+            if a is None or b is None:
+                if a != b:
+                    return Mismatch(i, col, a, b, r[0] if r else "")
+            elif not values_equal(a, b, rel_tol, abs_tol):
+                return Mismatch(i, col, a, b, r[0] if r else "")
+    if len(ref) != len(cand):
+        i = min(len(ref), len(cand))
+        extra = ref[i] if len(ref) > i else cand[i]
+        return Mismatch(
+            i, "<row count>", str(len(ref)), str(len(cand)), extra[0] if extra else ""
+        )
+    return None
+
+
+def check(
+    candidate: Engine, symbol: str, ohlc: List[Dict[str, Any]], rel_tol: float = REL_TOL, abs_tol: float = ABS_TOL
+) -> Optional[Mismatch]:
+    return diff_rows(reference_engine(symbol, ohlc), candidate(symbol, ohlc), rel_tol, abs_tol)
+
+
+# ===== 최소 재현 =====
+
+def shrink(
+    candidate: Engine, symbol: str, ohlc: List[Dict[str, Any]], rel_tol: float = REL_TOL, abs_tol: float = ABS_TOL,
+    max_checks: int = 400,
+) -> Tuple[List[Dict[str, Any]], Optional[Mismatch]]:
+    """
+    불일치를 유지하는 최소 캔들 시계열.
+    1) 첫 불일치 날짜 이후 캔들 제거
+    2) ddmin: 구간을 반씩 → 1개 단위까지 잘라보며 불일치가 유지되면 제거
+    캔들의 closeTime 은 그대로 두므로 날짜 라벨은 보존된다.
+    """
+    mismatch = check(candidate, symbol, ohlc, rel_tol, abs_tol)
+    if mismatch is None:
+        return ohlc, None
+
+    checks = 0
+
+    def fails(series: List[Dict[str, Any]]) -> Optional[Mismatch]:
+        nonlocal checks
+        checks += 1
+        if len(series) < 2:
+            return None
+        return check(candidate, symbol, series, rel_tol, abs_tol)
+
+    # 1) 꼬리 제거
+    if mismatch.date:
+        last_day = parse_day(mismatch.date)
+        cut = next((i for i, r in enumerate(ohlc) if int(r["closeTime"]) // DAY_MS > last_day), len(ohlc))
+        m = fails(ohlc[:cut])
+        if m:
+            ohlc, mismatch = ohlc[:cut], m
+
+    # 2) ddmin (첫 캔들은 엔진이 건너뛰므로 항상 유지)
+    chunk = max(1, (len(ohlc) - 1) // 2)
+    while chunk >= 1 and checks < max_checks:
+        removed = False
+        start = 1
+        while start < len(ohlc) and checks < max_checks:
+            trial = ohlc[:start] + ohlc[start + chunk:]
+            m = fails(trial)
+            if m:
+                ohlc, mismatch, removed = trial, m, True
+            else:
+                start += chunk
+        if not removed:
+            if chunk == 1:
+                break
+            chunk //= 2
+    return ohlc, mismatch
+
+
+# ===== 입력 시계열 =====
+
+def random_series(count: int, days: int, seed: int = 0) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    """무작위 파라미터의 합성 시계열 (변동성/급락/반등 빈도도 무작위)"""
+    rng = random.Random(seed)
+    for i in range(count):
+        symbol = f"RND{i:05d}USDT"
+        yield symbol, generate_ohlc(
+            rng.randint(2, days),
+            seed=seed,
+            symbol=symbol,
+            start=rng.choice(["2019-01-01", "2023-06-15", "2025-09-20"]),
+            start_price=10 ** rng.uniform(-6, 5),
+            sigma=rng.uniform(0.01, 0.12),
+            crash_prob=rng.uniform(0.0, 0.02),
+            rebound_prob=rng.uniform(0.0, 0.02),
+        )
+
+
+def recorded_series(debug_dir: pathlib.Path) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    """디버그 CSV 스냅샷의 OHLC → 엔진 입력 (첫 캔들은 엔진이 건너뛰므로 더미 1개 추가)"""
+    for base, path in debug_files(debug_dir).items():
+        if is_compact(path):
+            yield base + "USDT", CompactDebug.load(path).ohlc()
+            continue
+        try:
+            ohlc = ohlc_from_rows(read_debug_rows(path))
+        except (OSError, csv.Error):
+            continue
+        if ohlc:
+            yield base + "USDT", ohlc
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+고정소수점 가격 모드 (선택) — 심볼별 Binance tickSize 기준 int64
+
+  TickScale(0.00000001)  → decimals=8, 가격 정수 = round(price × 10^8), 틱 = 1
+  TickScale(0.01)        → decimals=2, 틱 = 1 (0.01)
+  TickScale(0.005)       → decimals=3, 틱 = 5
+
+- 저장소 문자열("0.00001234")은 float 를 거치지 않고 정수로 바로 변환 (parse)
+- 레벨/트리거 가격은 비율을 정수(만분율)로 곱한 뒤 틱 격자에 맞춤
+    매수 레벨 B1~B7, STOP LOSS  : 내림 (틱 격자 위의 지정가)
+    SELL 목표, RESTART 기준     : 올림
+- 모든 비교(l ≤ level ≤ h, 금지 레벨, 모드 전환)는 정수 비교 → PEPE/BONK 같은 1e-5 이하 코인에서도 정확
+- 출력 시에만 float 로 변환 (셀 단위 round 없음)
+
+float 엔진(core.phase1_5_state.step_day)과 같은 규칙이지만 레벨이 틱 격자에 맞춰지므로
+경계에 걸친 캔들에서는 결과가 다를 수 있다 → 기본 경로는 float 엔진, 이 모드는 opt-in.
+(auto_debug_builder.py --fixed-point 또는 OMG_FIXED_POINT=1, TriggerTable(fixed_point=True))
+"""
+from __future__ import annotations
+
+import csv
+import os
+import pathlib
+from dataclasses import dataclass, replace
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from core.phase1_5_core import SELL_THRESHOLDS, _level_order, _type_order
+from core.phase1_5_state import CSV_HEADER, LEVEL_NAMES
+from core.profiling import PROFILER
+from core.timeaxis import DAY_MS, day_str
+
+BP = 10_000  # 만분율
+LEVEL_BP = {"B1": 5600, "B2": 5200, "B3": 4600, "B4": 4100, "B5": 3500, "B6": 2800, "B7": 2100}
+STOP_BP = 1900
+WAIT_ENTRY_BP = 5600
+RESTART_BP = 19_850
+SELL_BP = {stage: int(round(pct * 100)) for stage, pct in SELL_THRESHOLDS.items()}  # 7.7% → 770
+STOPPED = -1  # cutoff: STOP LOSS 이후 전 레벨 금지 (float 엔진의 inf)
+
+
+@dataclass(frozen=True)
+class TickScale:
+    decimals: int
+    tick: int  # 정수 단위 틱 크기
+
+    @classmethod
+    def from_tick_size(cls, tick_size: float) -> "TickScale":
+        d = Decimal(repr(float(tick_size))).normalize()
+        decimals = max(0, -d.as_tuple().exponent)
+        return cls(decimals, int(d.scaleb(decimals)))
+
+    @property
+    def unit(self) -> int:
+        return 10 ** self.decimals
+
+    # ----- 변환 -----
+
+    def parse(self, text: str) -> int:
+        """가격 문자열 → 정수 (float 미경유, 자릿수를 넘는 부분은 반올림)"""
+        s = str(text).strip()
+        if "e" in s or "E" in s:
+            return self.to_int(float(s))
+        neg = s.startswith("-")
+        whole, _, frac = s.lstrip("+-").partition(".")
+        digits = frac[: self.decimals].ljust(self.decimals, "0")
+        v = int(whole or "0") * self.unit + int(digits or "0")
+        if len(frac) > self.decimals and frac[self.decimals] >= "5":
+            v += 1
+        return -v if neg else v
+
+    def to_int(self, price: float) -> int:
+        return int(round(price * self.unit))
+
+    def to_float(self, v: Optional[int]) -> Optional[float]:
+        return None if v is None else v / self.unit
+
+    def parse_array(self, texts: Iterable[str]) -> np.ndarray:
+        return np.fromiter((self.parse(t) for t in texts), dtype=np.int64)
+
+    def format(self, v: int) -> str:
+        """천 단위 콤마 + 틱 자릿수 (format_price 의 H 기반 자릿수 추정 대신)"""
+        return f"{v / self.unit:,.{self.decimals}f}"
+
+    # ----- 틱 격자 -----
+
+    def floor(self, v: int) -> int:
+        return v // self.tick * self.tick
+
+    def ceil(self, v: int) -> int:
+        return -((-v) // self.tick) * self.tick
+
+    def mul_floor(self, v: int, bp: int) -> int:
+        return self.floor(v * bp // BP)
+
+    def mul_ceil(self, v: int, bp: int) -> int:
+        return self.ceil(-((-v * bp) // BP))
+
+
+def compute_levels_fixed(H: int, scale: TickScale) -> Dict[str, int]:
+    lv = {nm: scale.mul_floor(H, bp) for nm, bp in LEVEL_BP.items()}
+    lv["Stop"] = scale.mul_floor(H, STOP_BP)
+    return lv
+
+
+def enabled(flag: bool = False) -> bool:
+    return flag or os.environ.get("OMG_FIXED_POINT", "") not in ("", "0")
+
+
+def scale_for(symbol: str) -> Optional[TickScale]:
+    """exchangeInfo 의 tickSize → TickScale (모르는 심볼이면 None → float 경로)"""
+    from core.symbol_index import symbol_index
+
+    info = symbol_index().get(symbol)
+    if info is None or not info.tick_size:
+        return None
+    return TickScale.from_tick_size(info.tick_size)
+
+
+# ===== 엔진 =====
+
+@dataclass
+class FixedEngineState:
+    scale: TickScale
+    mode: str = "high"
+    position: bool = False
+    stage: Optional[int] = None
+    H: Optional[int] = None
+    L: Optional[int] = None
+    cutoff: Optional[int] = None  # None / STOPPED / 매도 기준가
+    day: Optional[int] = None
+    lv: Optional[Dict[str, int]] = None
+
+    def set_H(self, H: int) -> None:
+        self.H = H
+        self.lv = compute_levels_fixed(H, self.scale)
+
+    def copy(self) -> "FixedEngineState":
+        return replace(self)
+
+    def is_forbidden(self, px: int) -> bool:
+        return self.cutoff is not None and (self.cutoff == STOPPED or px > self.cutoff)
+
+    def allowed_count(self) -> int:
+        if self.cutoff is None or self.lv is None:
+            return 7
+        return 7 - sum(1 for nm in LEVEL_NAMES if self.is_forbidden(self.lv[nm]))
+
+    def level_pairs(self) -> List[Tuple[str, int]]:
+        if self.lv is None:
+            return []
+        return sorted(((nm, self.lv[nm]) for nm in LEVEL_NAMES), key=lambda x: x[1])
+
+
+def _row(
+    st: FixedEngineState, date: str, o: int, h: int, l: int, c: int,
+    event: str, basis: str, level_name: str,
+    level_price: Optional[int], trigger_price: Optional[int], fill_price: Optional[int],
+    L_now: Optional[int], rebound_pct: Optional[float], threshold_pct: Optional[float],
+    allowed_cnt: int, next_nm: str, next_px: Optional[int], next_trig: Optional[int],
+) -> List[Any]:
+    f = st.scale.to_float
+    Bvals = [st.lv[n] if st.lv else None for n in LEVEL_NAMES]
+    stop_loss_price = st.lv["Stop"] if st.lv else None
+    cutoff = float("inf") if st.cutoff == STOPPED else f(st.cutoff)
+    return [
+        date, f(o), f(h), f(l), f(c),
+        st.mode, st.position, st.stage, event, basis,
+        level_name, f(level_price), f(trigger_price), f(fill_price),
+        f(st.H), f(L_now),
+        rebound_pct, threshold_pct,
+        allowed_cnt,
+        *(f(x) for x in Bvals),
+        f(stop_loss_price),
+        cutoff,
+        next_nm, f(next_px), f(next_trig),
+    ]
+
+
+def step_day_fixed(
+    st: FixedEngineState, day: int, o: int, h: int, l: int, c: int
+) -> Tuple[List[List[Any]], List[Any]]:
+    """step_day 의 정수 버전 — 같은 규칙, 같은 행 형식 (가격 셀은 출력 시 float)"""
+    date = day_str(day)
+    scale = st.scale
+    day_events: List[List[Any]] = []
+    rebound_pct: Optional[float] = None
+    threshold_pct: Optional[float] = None
+    restart_event_for_snapshot: Optional[str] = None
+
+    if st.H is None and st.mode == "high":
+        st.set_H(h)
+    if st.mode == "high" and st.H is not None and h > st.H:
+        st.set_H(h)
+
+    if st.mode == "wait" and (st.L is None or l < st.L):
+        st.L = l
+
+    # wait → high (RESTART): h ≥ L × 1.985
+    if st.mode == "wait" and st.L is not None and h * BP >= st.L * RESTART_BP:
+        restart_trigger = scale.mul_ceil(st.L, RESTART_BP)
+        st.mode = "high"
+        st.set_H(h)
+        st.position = False
+        st.stage = None
+        st.L = l
+        st.cutoff = None
+        day_events.append(_row(
+            st, date, o, h, l, c, "RESTART_+98.5pct", "HIGH",
+            "", None, restart_trigger, None,
+            None, None, None, st.allowed_count(), "", None, None,
+        ))
+        restart_event_for_snapshot = "RESTART_+98.5pct"
+
+    # high → wait: l ≤ H × 0.56
+    if st.mode == "high" and st.H is not None and l * BP <= st.H * WAIT_ENTRY_BP:
+        st.mode = "wait"
+        st.L = l
+
+    if st.mode == "wait" and not st.position and st.lv is not None:
+        crossed = [(nm, p) for (nm, p) in st.level_pairs() if l <= p <= h and not st.is_forbidden(p)]
+        if crossed:
+            nm, p = max(crossed, key=lambda x: x[1])
+            st.position = True
+            st.stage = LEVEL_NAMES.index(nm) + 1
+            day_events.append(_row(
+                st, date, o, h, l, c, f"BUY {nm}", "LOW",
+                nm, p, l, p, st.L, None, None, st.allowed_count(), nm, p, l,
+            ))
+
+    if st.mode == "wait" and st.position and st.lv is not None:
+        deepest = st.stage or 0
+        adds = [
+            (nm, p) for (nm, p) in st.level_pairs()
+            if l <= p <= h and not st.is_forbidden(p) and LEVEL_NAMES.index(nm) + 1 > deepest
+        ]
+        for nm, p in sorted(adds, key=lambda x: _level_order.get(x[0], 99)):
+            st.stage = max(st.stage or 1, LEVEL_NAMES.index(nm) + 1)
+            day_events.append(_row(
+                st, date, o, h, l, c, f"ADD {nm}", "LOW",
+                nm, p, l, p, st.L, None, None, st.allowed_count(), nm, p, l,
+            ))
+
+    # SELL: h ≥ L × (1 + threshold)
+    if st.position and st.stage is not None:
+        st.L = l if st.L is None else min(st.L, l)
+        if st.L > 0:
+            rebound_pct = (h / st.L - 1) * 100.0
+            threshold_pct = SELL_THRESHOLDS.get(st.stage)
+            sell_bp = BP + SELL_BP[st.stage] if threshold_pct is not None else None
+            if sell_bp is not None and h * BP >= st.L * sell_bp:
+                st.position = False
+                target_sell_price = scale.mul_ceil(st.L, sell_bp)
+                fill_price = o if l >= target_sell_price else target_sell_price
+                st.cutoff = max(target_sell_price, fill_price)
+                st.stage = None
+                day_events.append(_row(
+                    st, date, o, h, l, c, "SELL S", "HIGH",
+                    "", None, target_sell_price, fill_price,
+                    st.L, None, threshold_pct, st.allowed_count(), "", None, None,
+                ))
+
+    # STOP LOSS: l ≤ H × 0.19
+    if st.position and st.stage is not None and st.lv is not None:
+        stop_loss_price = st.lv["Stop"]
+        if l <= stop_loss_price:
+            st.position = False
+            st.stage = None
+            st.cutoff = STOPPED
+            day_events.append(_row(
+                st, date, o, h, l, c, "STOP LOSS", "LOW",
+                "", None, stop_loss_price, stop_loss_price,
+                st.L, None, None, 0, "", None, None,
+            ))
+
+    if day_events:
+        day_events.sort(key=lambda r: (_type_order(str(r[8])), _level_order.get(str(r[10]), 99)))
+
+    next_nm = ""
+    next_px: Optional[int] = None
+    if st.lv is not None:
+        pairs = st.level_pairs()
+        crossed2 = [(nm, px) for (nm, px) in pairs if l <= px <= h and not st.is_forbidden(px)]
+        if crossed2 and st.mode == "wait":
+            next_nm, next_px = max(crossed2, key=lambda x: x[1])
+        else:
+            for nm, px in pairs:
+                if not st.is_forbidden(px) and l > px:
+                    next_nm, next_px = nm, px
+                    break
+
+    snapshot = _row(
+        st, date, o, h, l, c, restart_event_for_snapshot or "", "",
+        "", None, None, None,
+        st.L, None if rebound_pct is None else round(rebound_pct, 6), threshold_pct,
+        st.allowed_count(), next_nm, next_px, l,
+    )
+    st.day = day
+    return day_events, snapshot
+
+
+def ohlc_to_fixed(ohlc: List[Dict[str, Any]], scale: TickScale) -> Dict[str, np.ndarray]:
+    """엔진 입력(dict 리스트) → 정수 배열. 문자열 값(저장소 행)은 float 미경유로 변환"""
+    out = {"day": np.fromiter((int(r["closeTime"]) // DAY_MS for r in ohlc), dtype=np.int64, count=len(ohlc))}
+    for k in ("open", "high", "low", "close"):
+        out[k] = np.fromiter(
+            (scale.parse(r[k]) if isinstance(r[k], str) else scale.to_int(r[k]) for r in ohlc),
+            dtype=np.int64, count=len(ohlc),
+        )
+    return out
+
+
+def run_fixed_simulation(symbol: str, ohlc: List[Dict[str, Any]], scale: TickScale, out_csv: pathlib.Path) -> None:
+    """run_phase1_5_simulation 과 같은 CSV (첫 캔들 생략), 정수 엔진으로 생성"""
+    arr = ohlc_to_fixed(ohlc, scale)
+    st = FixedEngineState(scale)
+    out_csv.parent.mkdir(parents=True, exist_ok=True)
+    with open(out_csv, "w", newline="", encoding="utf-8") as f:
+        w = PROFILER.timed_writer(csv.writer(f))
+        w.writerow(CSV_HEADER)
+        cols = zip(*(arr[k].tolist() for k in ("day", "open", "high", "low", "close")))
+        next(cols, None)
+        for day, o, h, l, c in cols:
+            events, snapshot = step_day_fixed(st, day, o, h, l, c)
+            w.writerows(events)
+            w.writerow(snapshot)
@@ -0,0 +1,523 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+공용 HTTP 계층 (Binance / CoinGecko / Telegram / Slack) + 녹화/재생 카세트
+
+연결/재시도:
+  - 호스트별 keep-alive 세션 풀 (요청마다 TCP/TLS 핸드셰이크 하지 않음)
+  - RetryPolicy: 429/5xx/연결 오류 재시도, Retry-After(초 또는 HTTP-date) 우선, 없으면 지수 백오프
+      DEFAULT_RETRY  일일 빌드 (6회, 1s × 1.8 최대 10s, 대기 예산 60s)
+      QUICK_RETRY    모니터/알림 (2회, 짧은 대기, 예산 5s)
+      NO_RETRY       호출자가 직접 처리
+    GET 이 아닌 요청은 연결 단계 실패(ConnectTimeout / NewConnectionError, 카세트 miss)와
+    Retry-After 가 있는 429 만 재시도 — 5xx 나 본문 전송 후 연결 끊김은 이미 전달됐을 수 있으므로
+    재시도하지 않음 (알림 중복 전송 방지)
+  - 호스트별 회로 차단기: 연속 실패(5xx/연결 오류) CIRCUIT_THRESHOLD 회 → CIRCUIT_COOLDOWN 초 동안
+    요청하지 않음 → 이후 1건 시험 요청(half-open) 성공 시 복구
+    재시도 정책이 있는 요청은 시험 요청이 가능해질 때까지 정책의 대기 예산(budget) 안에서 기다리고,
+    NO_RETRY 이거나 예산을 넘으면 즉시 CircuitOpen(requests.ConnectionError)
+  - 호스트별 동시 요청 상한 HOST_LIMITS (OMG_HTTP_HOST_LIMITS="api.binance.com=32,api.coingecko.com=1")
+
+모드 (환경변수 OMG_HTTP_MODE, 또는 configure()):
+  live    기본값. 실제 네트워크 호출
+  record  실제 호출 + 응답을 카세트에 추가 기록 (gzip JSONL)
+  replay  네트워크 없이 카세트에서 응답 재생
+
+  OMG_CASSETTE          카세트 경로 (기본 cassettes/omg.jsonl.gz)
+  OMG_REPLAY_LATENCY    재생 지연: 밀리초 숫자 또는 "recorded"(녹화 당시 소요 시간) (기본 0)
+  OMG_SIM_EXCHANGE      Binance/CoinGecko 요청을 로컬 모의 거래소(sim_exchange.py)로 우회
+                        예) http://127.0.0.1:8900
+
+카세트(record/replay)는 GET 만 대상 — 알림 POST 는 모드와 무관하게 실제 전송.
+
+재생 매칭:
+  1) method + URL + 전체 파라미터 가 같은 항목을 녹화 순서대로 (소진되면 마지막 항목 반복)
+  2) 없으면 시각 파라미터(startTime/endTime/timestamp)를 뺀 키로 같은 방식 매칭
+  3) 그래도 없으면 CassetteMiss (requests.ConnectionError 하위 클래스 → 기존 재시도/예외 경로 그대로)
+
+모든 응답은 core.metrics(요청 수/지연/재시도/회로 상태) 와 core.profiling(http_fetch 단계)에 기록된다.
+"""
+from __future__ import annotations
+
+import datetime as dt
+import email.utils
+import gzip
+import json
+import os
+import pathlib
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.exceptions import NewConnectionError
+
+from core.metrics import (
+    HTTP_CIRCUIT_STATE,
+    HTTP_INFLIGHT,
+    HTTP_REQUEST_SECONDS,
+    HTTP_RETRIES,
+    observe_request_error,
+    observe_response,
+)
+from core.profiling import PROFILER
+
+LIVE = "live"
+RECORD = "record"
+REPLAY = "replay"
+
+DEFAULT_CASSETTE = "cassettes/omg.jsonl.gz"
+VOLATILE_PARAMS = {"startTime", "endTime", "timestamp"}
+DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "set-cookie"}  # 본문은 디코딩된 텍스트로 저장
+DEFAULT_TIMEOUT = 20
+SIM_REDIRECT_HOSTS = ("https://api.binance.com", "https://api.coingecko.com")
+
+HOST_LIMITS = {"api.binance.com": 16, "api.coingecko.com": 2, "api.telegram.org": 4, "hooks.slack.com": 4}
+DEFAULT_HOST_LIMIT = 8
+CIRCUIT_THRESHOLD = 5
+CIRCUIT_COOLDOWN = 30.0
+CIRCUIT_POLL = 0.5  # 다른 요청이 시험 중일 때 다시 확인하는 간격 (초)
+
+
+class CassetteMiss(requests.ConnectionError):
+    """재생 모드에서 카세트에 없는 요청"""
+
+
+class CircuitOpen(requests.ConnectionError):
+    """회로 차단기가 열린 호스트로의 요청 (네트워크 호출 없이 즉시 실패)"""
+
+
+# ===== 재시도 =====
+
+def connect_failed(e: BaseException) -> bool:
+    """요청이 서버에 닿기 전(연결 단계)에 실패했는지 — GET 이 아닌 요청도 재시도해도 안전"""
+    if isinstance(e, (requests.ConnectTimeout, CassetteMiss)):
+        return True
+    seen = set()
+    while e is not None and id(e) not in seen:  # requests.ConnectionError(MaxRetryError(reason=NewConnectionError))
+        seen.add(id(e))
+        if isinstance(e, NewConnectionError):
+            return True
+        reason = getattr(e, "reason", None)
+        if isinstance(reason, BaseException):
+            e = reason
+        elif e.args and isinstance(e.args[0], BaseException):
+            e = e.args[0]
+        else:
+            e = e.__cause__ or e.__context__
+    return False
+
+
+def retry_after_seconds(headers: Any) -> Optional[float]:
+    """Retry-After 헤더 (초 또는 HTTP-date) → 초"""
+    value = headers.get("Retry-After") if headers is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    attempts: int = 6
+    backoff: float = 1.0
+    factor: float = 1.8
+    max_backoff: float = 10.0
+    max_retry_after: float = 60.0
+    budget: float = 60.0  # 요청 1건의 회로 차단 대기 상한 (초)
+
+    @staticmethod
+    def retryable(status: int) -> bool:
+        return status == 429 or 500 <= status < 600
+
+    def delay(self, attempt: int, resp: Optional[requests.Response] = None) -> float:
+        if resp is not None:
+            ra = retry_after_seconds(resp.headers)
+            if ra is not None:
+                return min(ra, self.max_retry_after)
+        return min(self.backoff * self.factor ** attempt, self.max_backoff)
+
+
+DEFAULT_RETRY = RetryPolicy()
+QUICK_RETRY = RetryPolicy(attempts=2, backoff=0.5, max_backoff=2.0, max_retry_after=5.0, budget=5.0)
+NO_RETRY = RetryPolicy(attempts=1)
+
+
+# ===== 호스트별 회로 차단기 / 세션 풀 =====
+
+CLOSED, HALF_OPEN, OPEN = 0, 1, 2
+
+
+class CircuitBreaker:
+    def __init__(self, host: str, threshold: int = CIRCUIT_THRESHOLD, cooldown: float = CIRCUIT_COOLDOWN):
+        self.host = host
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def _set(self, state: int) -> None:
+        if state != self.state:
+            names = {CLOSED: "closed", HALF_OPEN: "half-open", OPEN: "open"}
+            print(f"[HTTP] 회로 차단기 {self.host}: {names[self.state]} → {names[state]}")
+        self.state = state
+        HTTP_CIRCUIT_STATE.set(state, host=self.host)
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() - self.opened_at < self.cooldown:
+                    return False
+                self._set(HALF_OPEN)
+            if self.state == HALF_OPEN:
+                if self._probing:
+                    return False
+                self._probing = True
+            return True
+
+    def retry_in(self) -> float:
+        """시험 요청을 보낼 수 있을 때까지 남은 시간 (초)"""
+        with self._lock:
+            if self.state == OPEN:
+                return max(0.0, self.cooldown - (time.monotonic() - self.opened_at))
+            if self.state == HALF_OPEN and self._probing:
+                return CIRCUIT_POLL
+            return 0.0
+
+    def record(self, success: bool) -> None:
+        with self._lock:
+            self._probing = False
+            if success:
+                self.failures = 0
+                self._set(CLOSED)
+                return
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+                self._set(OPEN)
+
+
+def _host_limits() -> Dict[str, int]:
+    limits = dict(HOST_LIMITS)
+    for item in (os.environ.get("OMG_HTTP_HOST_LIMITS") or "").split(","):
+        host, _, n = item.partition("=")
+        if host.strip() and n.strip().isdigit():
+            limits[host.strip()] = int(n)
+    return limits
+
+
+class HostPool:
+    """호스트 1개의 keep-alive 세션 + 동시 요청 상한 + 회로 차단기"""
+
+    def __init__(self, host: str, limit: int):
+        self.host = host
+        self.limit = limit
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=limit)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.slots = threading.BoundedSemaphore(limit)
+        self.breaker = CircuitBreaker(host)
+
+
+def _canon_params(params: Optional[Dict[str, Any]], drop: frozenset = frozenset()) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((str(k), str(v)) for k, v in (params or {}).items() if k not in drop))
+
+
+def _key(method: str, url: str, params: Optional[Dict[str, Any]], loose: bool = False) -> str:
+    drop = frozenset(VOLATILE_PARAMS) if loose else frozenset()
+    return json.dumps([method.upper(), url, _canon_params(params, drop)])
+
+
+class Cassette:
+    """gzip JSONL 카세트 — 기록은 gzip 멤버 추가(append), 읽기는 전체 로드"""
+
+    def __init__(self, path: str):
+        self.path = pathlib.Path(path)
+        self._lock = threading.Lock()
+        self._exact: Dict[str, List[Dict[str, Any]]] = {}
+        self._loose: Dict[str, List[Dict[str, Any]]] = {}
+        self._pos: Dict[Tuple[str, str], int] = {}
+        self._loaded = False
+
+    def load(self) -> None:
+        self._exact.clear()
+        self._loose.clear()
+        self._pos.clear()
+        if self.path.exists():
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    entry = json.loads(line)
+                    params = dict(entry.get("params") or [])
+                    self._exact.setdefault(_key(entry["method"], entry["url"], params), []).append(entry)
+                    self._loose.setdefault(_key(entry["method"], entry["url"], params, loose=True), []).append(entry)
+        self._loaded = True
+        print(f"[HTTP] 카세트 로드: {self.path} ({sum(len(v) for v in self._exact.values())}건)")
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self._exact.values())
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with gzip.open(self.path, "at", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def find(self, method: str, url: str, params: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if not self._loaded:
+                self.load()
+            for kind, table, loose in (("exact", self._exact, False), ("loose", self._loose, True)):
+                key = _key(method, url, params, loose)
+                entries = table.get(key)
+                if entries:
+                    pos = self._pos.get((kind, key), 0)
+                    self._pos[(kind, key)] = pos + 1
+                    return entries[min(pos, len(entries) - 1)]
+        return None
+
+
+class HttpClient:
+    def __init__(
+        self,
+        mode: Optional[str] = None,
+        cassette: Optional[str] = None,
+        replay_latency: Optional[str] = None,
+        sim_exchange: Optional[str] = None,
+    ):
+        self.mode = (mode or os.environ.get("OMG_HTTP_MODE") or LIVE).lower()
+        self.sim_exchange = (sim_exchange or os.environ.get("OMG_SIM_EXCHANGE") or "").rstrip("/") or None
+        self.cassette = Cassette(cassette or os.environ.get("OMG_CASSETTE") or DEFAULT_CASSETTE)
+        self.replay_latency = (replay_latency or os.environ.get("OMG_REPLAY_LATENCY") or "0").lower()
+        self.limits = _host_limits()
+        self._pools: Dict[str, HostPool] = {}
+        self._pools_lock = threading.Lock()
+        if self.mode not in (LIVE, RECORD, REPLAY):
+            raise ValueError(f"알 수 없는 HTTP 모드: {self.mode}")
+        if self.mode != LIVE:
+            print(f"[HTTP] {self.mode} 모드 — 카세트 {self.cassette.path}")
+        if self.sim_exchange:
+            print(f"[HTTP] 모의 거래소 사용: {self.sim_exchange}")
+
+    def _resolve(self, url: str) -> str:
+        if self.sim_exchange:
+            for host in SIM_REDIRECT_HOSTS:
+                if url.startswith(host):
+                    return self.sim_exchange + url[len(host):]
+        return url
+
+    def pool(self, host: str) -> HostPool:
+        pool = self._pools.get(host)
+        if pool is None:
+            with self._pools_lock:
+                pool = self._pools.setdefault(host, HostPool(host, self.limits.get(host, DEFAULT_HOST_LIMIT)))
+        return pool
+
+    # ----- 재생 -----
+
+    def _replay(self, method: str, url: str, params: Optional[Dict[str, Any]]) -> requests.Response:
+        entry = self.cassette.find(method, url, params)
+        if entry is None:
+            raise CassetteMiss(f"카세트에 없는 요청: {method} {url} {dict(_canon_params(params))}")
+        if self.replay_latency == "recorded":
+            delay = float(entry.get("elapsed", 0.0))
+        else:
+            delay = float(self.replay_latency or 0) / 1000.0
+        if delay > 0:
+            time.sleep(delay)
+
+        resp = requests.Response()
+        resp.status_code = int(entry["status"])
+        resp._content = entry["body"].encode("utf-8")
+        resp.headers = CaseInsensitiveDict(entry.get("headers") or {})
+        resp.encoding = "utf-8"
+        resp.reason = entry.get("reason", "")
+        resp.url = requests.Request(method, url, params=params).prepare().url
+        resp.elapsed = dt.timedelta(seconds=delay)
+        return resp
+
+    # ----- 요청 -----
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        headers: Optional[Dict[str, str]],
+        timeout: float,
+        session: Optional[requests.Session],
+        json_body: Any,
+    ) -> requests.Response:
+        """요청 1회 (재시도 없음)"""
+        cassette = method.upper() == "GET"
+        if self.mode == REPLAY and cassette:
+            try:
+                resp = self._replay(method, url, params)
+            except CassetteMiss:
+                observe_request_error(url)
+                raise
+            observe_response(url, resp.status_code, resp.headers)
+            return resp
+
+        host = urlparse(url).netloc
+        pool = self.pool(host)
+        if not pool.breaker.allow():
+            observe_request_error(url)
+            raise CircuitOpen(f"회로 차단 중: {host} (연속 실패 {pool.breaker.failures}회)")
+        with pool.slots:
+            HTTP_INFLIGHT.inc(host=host)
+            started = time.perf_counter()
+            try:
+                resp = (session or pool.session).request(
+                    method, url, params=params, headers=headers, json=json_body, timeout=timeout
+                )
+            except requests.RequestException:
+                pool.breaker.record(False)
+                observe_request_error(url)
+                raise
+            finally:
+                HTTP_INFLIGHT.inc(-1, host=host)
+                HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, host=host)
+        pool.breaker.record(resp.status_code < 500)
+        if self.mode == RECORD and cassette:
+            self.cassette.append({
+                "method": method.upper(),
+                "url": url,
+                "params": list(_canon_params(params)),
+                "status": resp.status_code,
+                "reason": resp.reason,
+                "headers": {k: v for k, v in resp.headers.items() if k.lower() not in DROP_HEADERS},
+                "body": resp.text,
+                "elapsed": round(time.perf_counter() - started, 4),
+                "recorded_at": int(time.time() * 1000),
+            })
+        observe_response(url, resp.status_code, resp.headers)
+        return resp
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        session: Optional[requests.Session] = None,
+        json_body: Any = None,
+        retry: RetryPolicy = NO_RETRY,
+    ) -> requests.Response:
+        """
+        재시도 소진 후 마지막 응답을 그대로 돌려준다 (상태 코드 검사는 호출자 몫).
+        연결 오류는 마지막 시도에서 그대로 raise.
+        GET/HEAD 가 아니면 응답 재시도는 Retry-After 가 있는 429 만 (5xx 는 이미 처리됐을 수 있음),
+        예외 재시도는 연결 단계 실패(connect_failed)만.
+        회로가 열려 있으면 retry.attempts > 1 일 때 시험 요청 가능 시점까지 retry.budget 안에서 대기
+        (시도 횟수는 소모하지 않음), 아니면 CircuitOpen 을 즉시 raise.
+        """
+        url = self._resolve(url)
+        host = urlparse(url).netloc
+        idempotent = method.upper() in ("GET", "HEAD")
+        deadline = time.monotonic() + retry.budget
+        attempt = 0
+        with PROFILER.stage("http_fetch"):
+            while True:
+                last = attempt >= retry.attempts - 1
+                try:
+                    resp = self._send(method, url, params, headers, timeout, session, json_body)
+                except CircuitOpen:
+                    wait = self.pool(host).breaker.retry_in()
+                    if retry.attempts <= 1 or self.mode == REPLAY or time.monotonic() + wait > deadline:
+                        raise
+                    HTTP_RETRIES.inc(host=host, reason="circuit_open")
+                    time.sleep(max(wait, CIRCUIT_POLL))
+                    continue
+                except requests.RequestException as e:
+                    if last or not (idempotent or connect_failed(e)):
+                        raise
+                    wait, reason = retry.delay(attempt), type(e).__name__
+                else:
+                    if last or not retry.retryable(resp.status_code):
+                        return resp
+                    if not idempotent and not (resp.status_code == 429 and retry_after_seconds(resp.headers) is not None):
+                        return resp
+                    wait, reason = retry.delay(attempt, resp), str(resp.status_code)
+                HTTP_RETRIES.inc(host=host, reason=reason)
+                if self.mode != REPLAY:
+                    time.sleep(wait)
+                attempt += 1
+
+
+_CLIENT: Optional[HttpClient] = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def client() -> HttpClient:
+    global _CLIENT
+    if _CLIENT is None:
+        with _CLIENT_LOCK:
+            if _CLIENT is None:
+                _CLIENT = HttpClient()
+    return _CLIENT
+
+
+def configure(
+    mode: Optional[str] = None,
+    cassette: Optional[str] = None,
+    replay_latency: Optional[str] = None,
+    sim_exchange: Optional[str] = None,
+) -> HttpClient:
+    """모드 전환 (테스트/벤치마크용). 인자가 없으면 환경변수 기준으로 재생성"""
+    global _CLIENT
+    with _CLIENT_LOCK:
+        _CLIENT = HttpClient(mode, cassette, replay_latency, sim_exchange)
+    return _CLIENT
+
+
+def get(
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    session: Optional[requests.Session] = None,
+    retry: RetryPolicy = NO_RETRY,
+) -> requests.Response:
+    return client().request("GET", url, params=params, headers=headers, timeout=timeout, session=session, retry=retry)
+
+
+def post(
+    url: str,
+    json: Any = None,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    retry: RetryPolicy = QUICK_RETRY,
+) -> requests.Response:
+    return client().request("POST", url, headers=headers, timeout=timeout, json_body=json, retry=retry)
+
+
+def get_json(
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    retry: RetryPolicy = DEFAULT_RETRY,
+) -> Any:
+    """재시도 후에도 200 이 아니면 requests.HTTPError"""
+    resp = get(url, params=params, headers=headers, timeout=timeout, retry=retry)
+    resp.raise_for_status()
+    return resp.json()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+로컬 일봉 저장소 (심볼별 CSV, 마감된 캔들만)
+
+  data/klines/1d/BTCUSDT.csv    openTime,open,high,low,close,volume,closeTime  (1h/5m 등은 data/klines/<interval>/)
+  data/klines/1d/_meta.json     {symbol: {"listed": 첫 일봉 openTime, "updated": 마지막 저장 시각,
+                                          "checksums": {블록 번호: sha256 앞 16자리}}}
+
+- 가격/거래량은 Binance 응답 문자열 그대로 저장 (부동소수 재표현 없음)
+- merge(): openTime 기준 중복 제거 + 정렬, 임시 파일 → os.replace 로 원자적 저장
+- gaps(): 연속 openTime 간격이 1일보다 큰 구간 = 누락 (재조회 대상)
+- 블록 체크섬: openTime 기준 CHECKSUM_BLOCK_DAYS 일 단위 블록마다 sha256, merge() 때 갱신
+  verify() 가 다시 계산해 어긋난 블록(파일 손상/수작업 편집)을 돌려준다 → 백필이 재조회
+- load_ohlc(): 체크섬 검증 + core.ohlc_ingest (연속성/이상 캔들/보정 오버레이) 를 거친 엔진 입력
+- load_fixed(): 같은 검증을 거친 int64 틱 배열 (core.fixed_point, 저장 문자열에서 float 미경유 변환)
+"""
+from __future__ import annotations
+
+import csv
+import hashlib
+import json
+import os
+import pathlib
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+from core.ohlc_ingest import IngestReport, ingest
+from core.timeaxis import DAY_MS, ms_str
+
+if TYPE_CHECKING:
+    from core.fixed_point import TickScale
+
+DEFAULT_ROOT = "data/klines"
+COLUMNS = ["openTime", "open", "high", "low", "close", "volume", "closeTime"]
+CHECKSUM_BLOCK_DAYS = 128
+INTERVAL_MS = {
+    "1m": 60_000, "5m": 300_000, "15m": 900_000, "30m": 1_800_000,
+    "1h": 3_600_000, "2h": 7_200_000, "4h": 14_400_000, "1d": DAY_MS,
+}
+
+
+def kline_to_row(k: List[Any]) -> Dict[str, Any]:
+    """Binance kline 배열 → 저장 행 (가격은 문자열 유지)"""
+    return {
+        "openTime": int(k[0]), "open": str(k[1]), "high": str(k[2]), "low": str(k[3]),
+        "close": str(k[4]), "volume": str(k[5]), "closeTime": int(k[6]),
+    }
+
+
+def to_ohlc(rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """저장 행 → 엔진 입력 (run_phase1_5_simulation 의 ohlc 형식)"""
+    return [
+        {
+            "openTime": int(r["openTime"]), "open": float(r["open"]), "high": float(r["high"]),
+            "low": float(r["low"]), "close": float(r["close"]), "closeTime": int(r["closeTime"]),
+        }
+        for r in rows
+    ]
+
+
+def find_gaps(rows: List[Dict[str, Any]], step_ms: int = DAY_MS) -> List[Tuple[int, int]]:
+    """[(누락 시작 openTime, 누락 끝 openTime)] — 양 끝 포함"""
+    out = []
+    for a, b in zip(rows, rows[1:]):
+        if int(b["openTime"]) - int(a["openTime"]) > step_ms:
+            out.append((int(a["openTime"]) + step_ms, int(b["openTime"]) - step_ms))
+    return out
+
+
+def block_of(open_ms: int) -> int:
+    return int(open_ms) // (CHECKSUM_BLOCK_DAYS * DAY_MS)
+
+
+def block_range(block: int, step_ms: int = DAY_MS) -> Tuple[int, int]:
+    """블록의 (첫 openTime, 마지막 openTime)"""
+    start = block * CHECKSUM_BLOCK_DAYS * DAY_MS
+    return start, start + CHECKSUM_BLOCK_DAYS * DAY_MS - step_ms
+
+
+def block_checksums(rows: Iterable[Dict[str, Any]]) -> Dict[str, str]:
+    digests: Dict[int, Any] = {}
+    for r in rows:
+        h = digests.setdefault(block_of(r["openTime"]), hashlib.sha256())
+        h.update((",".join(str(r[c]) for c in COLUMNS) + "\n").encode("utf-8"))
+    return {str(b): h.hexdigest()[:16] for b, h in sorted(digests.items())}
+
+
+class KlineStore:
+    def __init__(self, root: str = DEFAULT_ROOT, interval: str = "1d"):
+        if interval not in INTERVAL_MS:
+            raise ValueError(f"지원하지 않는 interval: {interval}")
+        self.dir = pathlib.Path(root) / interval
+        self.interval = interval
+        self.step_ms = INTERVAL_MS[interval]
+        self._meta_path = self.dir / "_meta.json"
+        self._lock = threading.Lock()
+        self._meta: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def path(self, symbol: str) -> pathlib.Path:
+        return self.dir / f"{symbol.upper()}.csv"
+
+    def symbols(self) -> List[str]:
+        return sorted(p.stem for p in self.dir.glob("*.csv")) if self.dir.exists() else []
+
+    # ----- 메타 -----
+
+    def meta(self, symbol: str) -> Dict[str, Any]:
+        with self._lock:
+            if self._meta is None:
+                try:
+                    self._meta = json.loads(self._meta_path.read_text(encoding="utf-8"))
+                except (OSError, ValueError):
+                    self._meta = {}
+            return dict(self._meta.get(symbol.upper(), {}))
+
+    def set_meta(self, symbol: str, **values: Any) -> None:
+        self.meta(symbol)  # 로드 보장
+        with self._lock:
+            self._meta.setdefault(symbol.upper(), {}).update(values)
+            self.dir.mkdir(parents=True, exist_ok=True)
+            tmp = self._meta_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self._meta, indent=1, sort_keys=True), encoding="utf-8")
+            os.replace(tmp, self._meta_path)
+
+    # ----- 읽기/쓰기 -----
+
+    def load(self, symbol: str) -> List[Dict[str, Any]]:
+        path = self.path(symbol)
+        if not path.exists():
+            return []
+        with open(path, newline="", encoding="utf-8") as f:
+            return [
+                dict(r, openTime=int(r["openTime"]), closeTime=int(r["closeTime"]))
+                for r in csv.DictReader(f)
+            ]
+
+    def merge(self, symbol: str, new_rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """기존 행과 합쳐 openTime 중복 제거(새 값 우선) 후 저장. 합쳐진 전체 행 반환"""
+        by_open = {r["openTime"]: r for r in self.load(symbol)}
+        added = 0
+        for r in new_rows:
+            if r["openTime"] not in by_open:
+                added += 1
+            by_open[r["openTime"]] = r
+        rows = [by_open[k] for k in sorted(by_open)]
+        self.dir.mkdir(parents=True, exist_ok=True)
+        path = self.path(symbol)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", newline="", encoding="utf-8") as f:
+            w = csv.DictWriter(f, fieldnames=COLUMNS, extrasaction="ignore")
+            w.writeheader()
+            w.writerows(rows)
+        os.replace(tmp, path)
+        self.set_meta(symbol, updated=int(time.time() * 1000), checksums=block_checksums(rows))
+        return rows
+
+    def verify(self, symbol: str, rows: Optional[List[Dict[str, Any]]] = None) -> List[int]:
+        """저장된 체크섬과 다른 블록 번호 (체크섬 기록이 없으면 빈 목록)"""
+        expected = self.meta(symbol).get("checksums")
+        if not expected:
+            return []
+        actual = block_checksums(self.load(symbol) if rows is None else rows)
+        return sorted(int(b) for b in set(expected) | set(actual) if expected.get(b) != actual.get(b))
+
+    def gaps(self, symbol: str, rows: Optional[List[Dict[str, Any]]] = None) -> List[Tuple[int, int]]:
+        return find_gaps(self.load(symbol) if rows is None else rows, self.step_ms)
+
+    def load_ohlc(self, symbol: str, since_ms: Optional[int] = None) -> Tuple[List[Dict[str, Any]], IngestReport]:
+        """엔진 입력 + 적재 리포트 (체크섬 불일치 블록은 anomalies 에 포함)"""
+        return self._ingest(symbol, since_ms, to_ohlc)
+
+    def load_fixed(self, symbol: str, scale: "TickScale", since_ms: Optional[int] = None) -> Tuple[Dict[str, Any], IngestReport]:
+        """고정소수점 입력 {"day", "open", "high", "low", "close": int64 배열} + 적재 리포트"""
+        from core.fixed_point import ohlc_to_fixed
+
+        rows, report = self._ingest(symbol, since_ms, lambda rs: rs)
+        return ohlc_to_fixed(rows, scale), report
+
+    def _ingest(self, symbol: str, since_ms: Optional[int], convert) -> Tuple[List[Dict[str, Any]], IngestReport]:
+        rows = self.load(symbol)
+        bad = self.verify(symbol, rows)
+        if since_ms is not None:
+            rows = [r for r in rows if r["openTime"] >= since_ms]
+        ohlc, report = ingest(symbol, convert(rows))
+        for b in bad:
+            start, end = block_range(b, self.step_ms)
+            report.anomalies.append(
+                f"체크섬 불일치 블록 {b} ({ms_str(start)}~{ms_str(end)})"
+            )
+        return ohlc, report
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+"다음 매수 목표에 가장 가까운 코인" Top-K 리더보드
+
+- 심볼별 이격도(%)를 최소 힙으로 관리 (지연 삭제 방식)
+- update(): 가격 변화 1건당 O(log n) — 이전 항목은 버전 번호로 무효화
+- top(k): 힙을 변경하지 않고 트리 순회 (후보 힙에 자식 노드만 추가) → O(k log k), 전체 재스캔 없음
+- 무효 항목이 쌓이면 힙을 재구성 (분할 상환 O(1))
+- 모니터 스레드(update)와 메트릭 HTTP 스레드(as_dicts)가 함께 쓰므로 모든 접근은 락 안에서
+"""
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+
+@dataclass
+class LeaderboardEntry:
+    symbol: str
+    divergence: float  # 목표가 대비 현재가 거리 (%), 음수 = 목표가 아래
+    target: str
+    target_price: float
+    current_price: float
+    info: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def distance(self) -> float:
+        return abs(self.divergence)
+
+
+class DivergenceLeaderboard:
+    """이격도 절댓값 기준 최소 힙"""
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, str]] = []
+        self._entries: Dict[str, Tuple[int, LeaderboardEntry]] = {}
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, symbol: str) -> bool:
+        with self._lock:
+            return symbol in self._entries
+
+    def get(self, symbol: str) -> Optional[LeaderboardEntry]:
+        with self._lock:
+            item = self._entries.get(symbol)
+        return item[1] if item else None
+
+    def update(
+        self,
+        symbol: str,
+        current_price: float,
+        target: str,
+        target_price: float,
+        **info: Any,
+    ) -> LeaderboardEntry:
+        """심볼의 현재가/목표가 갱신 (O(log n))"""
+        divergence = (current_price - target_price) / target_price * 100.0 if target_price else float("inf")
+        entry = LeaderboardEntry(symbol, divergence, target, target_price, current_price, info)
+        with self._lock:
+            seq = next(self._seq)
+            self._entries[symbol] = (seq, entry)
+            heapq.heappush(self._heap, (entry.distance, seq, symbol))
+            self._maybe_compact()
+        return entry
+
+    def remove(self, symbol: str) -> None:
+        with self._lock:
+            self._entries.pop(symbol, None)
+            self._maybe_compact()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._heap.clear()
+            self._entries.clear()
+
+    def _is_live(self, seq: int, symbol: str) -> bool:
+        item = self._entries.get(symbol)
+        return item is not None and item[0] == seq
+
+    def _maybe_compact(self) -> None:
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [(e.distance, seq, sym) for sym, (seq, e) in self._entries.items()]
+            heapq.heapify(self._heap)
+
+    def _top(self, k: int) -> List[LeaderboardEntry]:
+        """힙 트리를 작은 순서로 순회 (읽기 전용) — 락 안에서 호출"""
+        heap = self._heap
+        frontier: List[Tuple[Tuple[float, int, str], int]] = [(heap[0], 0)] if heap else []
+        result: List[LeaderboardEntry] = []
+        while frontier and len(result) < k:
+            (_dist, seq, symbol), i = heapq.heappop(frontier)
+            if self._is_live(seq, symbol):  # 무효 항목은 건너뜀 (제거는 _maybe_compact 에서)
+                result.append(self._entries[symbol][1])
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+        return result
+
+    def top(self, k: int = 10) -> List[LeaderboardEntry]:
+        """목표가에 가장 가까운 k개 (힙 변경 없음)"""
+        with self._lock:
+            return self._top(k)
+
+    def as_dicts(self, k: int = 10) -> List[Dict[str, Any]]:
+        """Top-k 를 dict 로 — rank 는 리더보드 순위 (1..k), info 의 같은 키보다 우선"""
+        return [
+            {
+                **e.info,
+                "rank": i,
+                "symbol": e.symbol,
+                "target": e.target,
+                "target_price": e.target_price,
+                "current_price": e.current_price,
+                "divergence": round(e.divergence, 4),
+            }
+            for i, e in enumerate(self.top(k), start=1)
+        ]
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Phase 1.5 실시간(장중) 상태 투영
+
+- 디버그 CSV(run_phase1_5_simulation 결과)의 마지막 확정 일자 상태로 시드
+- 가격/저가/고가 업데이트마다 "오늘 캔들 = (시가, 누적 고가, 누적 저가, 현재가)" 로
+  step_day() 를 시드 상태 사본에 한 번 적용 → 업데이트당 O(1) (레벨 7개 고정)
+- 처음 발생한 BUY/ADD/SELL/STOP LOSS/RESTART 를 즉시 잠정(provisional) 이벤트로 발행
+- 캔들 마감 후 일일 재빌드 결과와 reconcile() 로 대조하고 재시드
+
+주의: Binance 일봉 klines 는 진행 중인 캔들을 포함하므로, 디버그 CSV 의
+마지막 일자는 미확정 캔들로 보고 직전 일자 스냅샷으로 시드한다.
+"""
+from __future__ import annotations
+
+import datetime as dt
+import pathlib
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.phase1_5_state import (
+    EngineState,
+    daily_snapshots,
+    read_debug_rows,
+    state_from_snapshot,
+    step_day,
+)
+from core.timeaxis import day_str, parse_day
+
+
+@dataclass
+class ProvisionalEvent:
+    """장중 잠정 이벤트"""
+    symbol: str
+    date: str
+    event: str  # "BUY B2", "ADD B3", "SELL S", "STOP LOSS", "RESTART_+98.5pct"
+    level_name: str
+    trigger_price: Optional[float]
+    fill_price: Optional[float]
+    observed_at: float  # epoch seconds
+    row: List[Any] = field(default_factory=list, repr=False)
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return (self.event, self.level_name)
+
+
+class LiveStateProjector:
+    """심볼 1개의 장중 Phase 1.5 상태 투영기"""
+
+    def __init__(
+        self,
+        symbol: str,
+        seed: EngineState,
+        on_event: Optional[Callable[[ProvisionalEvent], None]] = None,
+    ):
+        self.symbol = symbol
+        self.on_event = on_event
+        self._reset(seed)
+
+    def _reset(self, seed: EngineState) -> None:
+        self.base = seed  # 마지막 확정 일자 마감 상태
+        self.seed_day = seed.day if seed.day is not None else -1  # 시드(디버그 CSV) 기준 epoch-day
+        self.state = seed.copy()  # 현재 투영 상태
+        self.session: Optional[int] = None  # 진행 중인 캔들의 일자 라벨 (epoch-day)
+        self._clock_day: Optional[int] = None  # 마지막 업데이트의 UTC epoch-day
+        self.day_open: Optional[float] = None
+        self.day_high: Optional[float] = None
+        self.day_low: Optional[float] = None
+        self.last_price: Optional[float] = None
+        self._seen: Counter = Counter()  # 세션 내 발행된 이벤트 키
+        self.pending: List[ProvisionalEvent] = []  # 시드 이후 발행분 (reconcile 대상)
+        self.snapshot: Optional[List[Any]] = None
+
+    # ----- 시드 -----
+
+    @classmethod
+    def from_debug_csv(
+        cls,
+        symbol: str,
+        csv_path: pathlib.Path,
+        partial_last_day: bool = True,
+        on_event: Optional[Callable[[ProvisionalEvent], None]] = None,
+    ) -> "LiveStateProjector":
+        """
+        디버그 CSV 로부터 생성.
+        partial_last_day=True 이면 마지막 일자를 진행 중인 캔들로 취급해
+        직전 일자 스냅샷으로 시드하고, 마지막 일자 OHLC 를 장중 범위로 이어받는다.
+        """
+        snaps = daily_snapshots(read_debug_rows(csv_path))
+        if not snaps:
+            raise ValueError(f"빈 디버그 파일: {csv_path}")
+        if partial_last_day and len(snaps) >= 2:
+            proj = cls(symbol, state_from_snapshot(snaps[-2]), on_event=on_event)
+            last = snaps[-1]
+            proj._open_session(parse_day(last["date"]), float(last["open"]))
+            proj._apply(float(last["high"]), float(last["low"]), float(last["close"]), None, silent=True)
+            return proj
+        return cls(symbol, state_from_snapshot(snaps[-1]), on_event=on_event)
+
+    # ----- 장중 업데이트 -----
+
+    def _open_session(self, session: int, open_price: float) -> None:
+        self.session = session
+        self.day_open = open_price
+        self.day_high = open_price
+        self.day_low = open_price
+        self.last_price = open_price
+        self._seen.clear()
+
+    def roll_session(self, session: int, open_price: float) -> None:
+        """세션(일봉) 경계: 현재 투영 상태를 확정 상태로 넘기고 새 캔들 시작"""
+        if self.session is not None:
+            self.base = self.state.copy()
+        self._open_session(session, open_price)
+
+    def on_update(
+        self,
+        price: float,
+        low: Optional[float] = None,
+        high: Optional[float] = None,
+        ts: Optional[float] = None,
+    ) -> List[ProvisionalEvent]:
+        """
+        가격(및 선택적으로 구간 저가/고가) 반영. 새로 발생한 잠정 이벤트 반환.
+        ts(epoch 초)의 UTC 일자가 바뀌면(= 일봉 마감) 세션을 자동으로 넘긴다.
+        """
+        now = ts if ts is not None else dt.datetime.now(dt.UTC).timestamp()
+        clock_day = int(now // 86_400)
+        if self.session is None:
+            self.roll_session(clock_day, price)
+        elif self._clock_day is not None and clock_day > self._clock_day:
+            # 디버그 CSV 의 일자 라벨 체계를 유지한 채 경과 일수만큼 전진
+            self.roll_session(self.session + (clock_day - self._clock_day), price)
+        self._clock_day = clock_day
+        h = max(self.day_high, price, high if high is not None else price)
+        l = min(self.day_low, price, low if low is not None else price)
+        return self._apply(h, l, price, now)
+
+    def _apply(
+        self, h: float, l: float, c: float, now: Optional[float], silent: bool = False
+    ) -> List[ProvisionalEvent]:
+        widened = self.snapshot is None or h > self.day_high or l < self.day_low
+        self.day_high, self.day_low, self.last_price = h, l, c
+        if not widened:
+            # 범위가 그대로면 이벤트 변화 없음 (종가만 갱신)
+            return []
+
+        projected = self.base.copy()
+        rows, self.snapshot = step_day(projected, self.session, self.day_open, h, l, c)
+        self.state = projected
+
+        new_events: List[ProvisionalEvent] = []
+        day_counts: Counter = Counter()
+        for r in rows:
+            key = (str(r[8]), str(r[10]))
+            day_counts[key] += 1
+            if day_counts[key] <= self._seen[key]:
+                continue
+            self._seen[key] += 1
+            if silent:
+                continue
+            ev = ProvisionalEvent(
+                symbol=self.symbol,
+                date=day_str(self.session),
+                event=key[0],
+                level_name=key[1],
+                trigger_price=r[12],
+                fill_price=r[13],
+                observed_at=now if now is not None else dt.datetime.now(dt.UTC).timestamp(),
+                row=r,
+            )
+            new_events.append(ev)
+            self.pending.append(ev)
+            if self.on_event:
+                self.on_event(ev)
+        return new_events
+
+    # ----- 조회 -----
+
+    def next_buy_target(self) -> Tuple[str, Optional[float]]:
+        """투영 스냅샷 기준 다음 매수 레벨 (이름, 가격)"""
+        if not self.snapshot:
+            return "", None
+        return self.snapshot[28], self.snapshot[29]
+
+    # ----- 마감 대조 -----
+
+    def reconcile(self, csv_path: pathlib.Path, partial_last_day: bool = True) -> Dict[str, Any]:
+        """
+        일일 재빌드된 디버그 CSV 와 잠정 이벤트 대조 후 재시드.
+        시드 일자 이후의 공식 이벤트 행과 잠정 이벤트를 (event, level_name) 기준으로 비교.
+        반환: {"confirmed": [...], "missed": [...], "spurious": [...]}
+        """
+        rows = read_debug_rows(csv_path)
+        official = Counter(
+            (r["event"], r["level_name"]) for r in rows
+            if parse_day(r["date"]) > self.seed_day and r["event"] and r["basis"]
+        )
+        provisional = Counter(ev.key for ev in self.pending)
+        result = {
+            "symbol": self.symbol,
+            "confirmed": sorted((official & provisional).elements()),
+            "missed": sorted((official - provisional).elements()),
+            "spurious": sorted((provisional - official).elements()),
+        }
+        fresh = LiveStateProjector.from_debug_csv(
+            self.symbol, csv_path, partial_last_day=partial_last_day, on_event=self.on_event
+        )
+        self.__dict__.update(fresh.__dict__)
+        return result
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+파이프라인/모니터 상태 메트릭 (Prometheus 텍스트 포맷)
+
+- Counter / Gauge / Histogram (라벨 지원, 스레드 안전)
+- start_metrics_server(port): 로컬 HTTP 엔드포인트 (/metrics) 를 데몬 스레드로 실행
+- 외부 의존성 없음 (prometheus_client 불필요)
+
+주요 메트릭:
+  omg_monitor_cycle_seconds            모니터링 사이클 소요 시간
+  omg_api_requests_total               API 요청 수 (endpoint, status)
+  omg_api_used_weight                  Binance X-MBX-USED-WEIGHT-1M (endpoint)
+  omg_api_errors_total                 429 / 5xx 응답 수 (endpoint, code)
+  omg_http_request_seconds             HTTP 요청 1회 소요 시간 (host)
+  omg_http_retries_total               재시도 횟수 (host, reason)
+  omg_http_inflight                    호스트별 동시 요청 수 (host)
+  omg_http_circuit_state               호스트별 회로 차단기 상태 0=closed 1=half-open 2=open (host)
+  omg_alerts_generated_total           생성된 알람 수 (kind)
+  omg_alerts_delivered_total           채널별 전송 결과 (channel, result)
+  omg_alert_latency_seconds            거래소 이벤트 → 채널 전송 완료 지연 (channel)
+  omg_notification_queue_depth         알림 대기열 길이
+  omg_plan_age_seconds                 모니터링 계획(ANALYSIS/디버그 파일) 경과 시간
+  omg_build_stage_seconds              일일 빌드 단계별 소요 시간 (stage)
+  omg_build_last_duration_seconds      마지막 일일 빌드 전체 소요 시간
+"""
+from __future__ import annotations
+
+import re
+import threading
+from abc import ABC, abstractmethod
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 1800.0)
+
+
+def _escape(v: Any) -> str:
+    """라벨 값 이스케이프 (텍스트 포맷 규칙: 백슬래시, 큰따옴표, 줄바꿈)"""
+    return str(v).replace("\\", r"\\").replace('"', r'\"').replace("\n", r"\n")
+
+
+def _fmt_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt_value(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v))
+
+
+class _Metric(ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.labels)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    @abstractmethod
+    def _samples(self) -> List[str]:
+        """# HELP/# TYPE 아래에 붙는 샘플 줄"""
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_fmt_labels(self.labels, k)} {_fmt_value(v)}" for k, v in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[Tuple[str, ...], List[float]] = {}  # [bucket counts..., sum, count]
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            row = self._values.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            for i, b in enumerate(self.buckets):
+                if value <= b:
+                    row[i] += 1
+            row[-2] += value
+            row[-1] += 1
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._values.items()]
+        out: List[str] = []
+        for key, row in items:
+            for b, cnt in zip(self.buckets, row):
+                le = 'le="%s"' % _fmt_value(b)
+                out.append(f"{self.name}_bucket{_fmt_labels(self.labels, key, le)} {_fmt_value(cnt)}")
+            le = 'le="+Inf"'
+            out.append(f"{self.name}_bucket{_fmt_labels(self.labels, key, le)} {_fmt_value(row[-1])}")
+            out.append(f"{self.name}_sum{_fmt_labels(self.labels, key)} {_fmt_value(row[-2])}")
+            out.append(f"{self.name}_count{_fmt_labels(self.labels, key)} {_fmt_value(row[-1])}")
+        return out
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help_text: str, labels: Tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, help_text, labels))
+
+    def gauge(self, name: str, help_text: str, labels: Tuple[str, ...] = ()) -> Gauge:
+        return self.register(Gauge(name, help_text, labels))
+
+    def histogram(self, name: str, help_text: str, labels: Tuple[str, ...] = (), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help_text, labels, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for m in metrics:
+            lines.extend(m.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# ===== 공용 메트릭 =====
+MONITOR_CYCLE_SECONDS = REGISTRY.histogram("omg_monitor_cycle_seconds", "Monitoring cycle latency")
+API_REQUESTS = REGISTRY.counter("omg_api_requests_total", "HTTP API requests", ("endpoint", "status"))
+API_USED_WEIGHT = REGISTRY.gauge("omg_api_used_weight", "Binance X-MBX-USED-WEIGHT-1M after last request", ("endpoint",))
+API_ERRORS = REGISTRY.counter("omg_api_errors_total", "HTTP 429/5xx responses", ("endpoint", "code"))
+HTTP_REQUEST_SECONDS = REGISTRY.histogram("omg_http_request_seconds", "HTTP request latency per attempt", ("host",))
+HTTP_RETRIES = REGISTRY.counter("omg_http_retries_total", "HTTP retries", ("host", "reason"))
+HTTP_INFLIGHT = REGISTRY.gauge("omg_http_inflight", "In-flight HTTP requests", ("host",))
+HTTP_CIRCUIT_STATE = REGISTRY.gauge("omg_http_circuit_state", "Circuit breaker state (0 closed, 1 half-open, 2 open)", ("host",))
+ALERTS_GENERATED = REGISTRY.counter("omg_alerts_generated_total", "Alerts generated", ("kind",))
+ALERTS_DELIVERED = REGISTRY.counter("omg_alerts_delivered_total", "Alert deliveries per channel", ("channel", "result"))
+ALERT_LATENCY_SECONDS = REGISTRY.histogram("omg_alert_latency_seconds", "Exchange event to channel delivery ack", ("channel",))
+NOTIFICATION_QUEUE_DEPTH = REGISTRY.gauge("omg_notification_queue_depth", "Pending notifications")
+PLAN_AGE_SECONDS = REGISTRY.gauge("omg_plan_age_seconds", "Age of the loaded monitoring plan")
+BUILD_STAGE_SECONDS = REGISTRY.histogram("omg_build_stage_seconds", "Daily build stage duration", ("stage",))
+BUILD_LAST_DURATION = REGISTRY.gauge("omg_build_last_duration_seconds", "Duration of the last full daily build")
+
+
+def endpoint_of(url: str) -> str:
+    """URL → 메트릭 라벨용 endpoint (호스트 + 경로, 토큰/웹훅 경로는 마스킹)"""
+    u = urlparse(url)
+    path = re.sub(r"/(bot[^/]+|services/.*)", "/***", u.path)
+    return f"{u.netloc}{path}"
+
+
+def observe_response(url: str, status: int, headers: Optional[Dict[str, str]] = None) -> None:
+    """HTTP 응답 1건 기록 (요청 수, 429/5xx, Binance used weight)"""
+    endpoint = endpoint_of(url)
+    API_REQUESTS.inc(endpoint=endpoint, status=status)
+    if status == 429 or 500 <= status < 600:
+        API_ERRORS.inc(endpoint=endpoint, code=status)
+    if headers:
+        weight = headers.get("X-MBX-USED-WEIGHT-1M") or headers.get("x-mbx-used-weight-1m")
+        if weight is not None:
+            try:
+                API_USED_WEIGHT.set(float(weight), endpoint=endpoint)
+            except ValueError:
+                pass
+
+
+def observe_request_error(url: str) -> None:
+    """연결 실패 등 응답이 없는 요청 기록"""
+    API_REQUESTS.inc(endpoint=endpoint_of(url), status="error")
+
+
+# ===== HTTP 엔드포인트 =====
+
+def start_metrics_server(
+    port: int,
+    host: str = "127.0.0.1",
+    registry: Registry = REGISTRY,
+    json_routes: Optional[Dict[str, Callable[[], Any]]] = None,
+) -> ThreadingHTTPServer:
+    """
+    /metrics 를 제공하는 HTTP 서버를 데몬 스레드로 시작.
+    json_routes: {"/leaderboard": callable} 처럼 JSON 응답 경로 추가
+    """
+    import json
+
+    routes = dict(json_routes or {})
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = urlparse(self.path).path
+            if path == "/metrics":
+                body = registry.render().encode("utf-8")
+                ctype = "text/plain; version=0.0.4; charset=utf-8"
+            elif path in routes:
+                body = json.dumps(routes[path](), ensure_ascii=False, default=str).encode("utf-8")
+                ctype = "application/json; charset=utf-8"
+            else:
+                self.send_response(404)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):  # 요청 로그 생략
+            return
+
+    server = ThreadingHTTPServer((host, port), _Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    print(f"메트릭 엔드포인트: http://{host}:{port}/metrics")
+    return server
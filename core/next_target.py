@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+다음 매수 목표 일괄 계산 (전 심볼을 배열로 한 번에)
+
+CoinAnalysisExcel.get_latest_buy_progress 의 규칙을 심볼 단위 if/elif 대신 배열 마스크로 적용한다.
+  마지막 이벤트        다음 목표                                   상태
+  (없음)               B1                                          no_events_b1_target
+  BUY/ADD (stage<7)    B{stage+1}                                  buy_add_next_target_B{k}
+  BUY/ADD (stage=7)    STOP LOSS (실행 전), Stop_Loss 또는 H*0.19  buy_add_max
+  BUY/ADD (stage 없음) B2                                          buy_add_no_stage_b2
+  SELL (허용 0개)      없음                                        (→ no_target_price)
+  SELL (허용 7개/없음) B1                                          sell_no_forbidden_b1
+  SELL (허용 n개)      B{8-n}                                      sell_forbidden_next_B{k}
+  RESTART              B1                                          restart_b1_target
+  STOP LOSS            STOP LOSS (실행됨), Stop_Loss 또는 H*0.19   level_stop_loss
+  기타                 B1                                          other_event_b1_target
+  목표가 없음(NaN) → no_target_price, H 없음/0 → no_h_value
+
+- gather(): 심볼별 디버그 파일에서 마지막 행 + 마지막 이벤트 행만 읽어 배열로 (CSV 는 파일 끝에서 역방향으로 읽음,
+  압축 형식은 저장된 tail 배열만 읽음 — core.compact_debug.read_tail)
+- resolve(): 배열 → NextTargets (목표 번호/가격/이격도/상태 코드), as_dicts() 는 기존 반환 dict 와 같은 형태
+"""
+from __future__ import annotations
+
+import csv
+import pathlib
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from core import array_engine as ae
+from core.compact_debug import is_compact, read_tail
+from core.phase1_5_state import LEVEL_NAMES, STOP_LOSS_RATIO
+
+LEVEL_COLUMNS = (*LEVEL_NAMES, "Stop_Loss")  # levels 배열 열 순서 (7 = Stop_Loss)
+STOP_COLUMN = 7
+TAIL_BLOCK = 16384
+
+# 마지막 이벤트 분류
+LAST_NONE, LAST_BUY, LAST_SELL, LAST_RESTART, LAST_STOP, LAST_OTHER = range(6)
+
+# 상태 코드 (B{k} 가 붙는 상태는 목표 번호로 완성)
+(
+    ST_OK_PENDING, ST_NO_FILE, ST_EMPTY, ST_ERROR, ST_NO_H, ST_NO_PRICE,
+    ST_NO_EVENTS, ST_BUY_NEXT, ST_BUY_MAX, ST_BUY_NO_STAGE,
+    ST_SELL_ALL, ST_SELL_B1, ST_SELL_NEXT, ST_RESTART, ST_STOP, ST_OTHER,
+) = range(16)
+STATUS = (
+    "", "no_debug_file", "empty_debug", "error", "no_h_value", "no_target_price",
+    "no_events_b1_target", "buy_add_next_target_{k}", "buy_add_max", "buy_add_no_stage_b2",
+    "sell_all_forbidden", "sell_no_forbidden_b1", "sell_forbidden_next_{k}", "restart_b1_target",
+    "level_stop_loss", "other_event_b1_target",
+)
+TARGET_NONE = -1
+STOP_EXECUTED = 8  # 목표 라벨 전용 (가격은 Stop_Loss 열)
+TARGET_LABELS = (*LEVEL_NAMES, "STOP LOSS (실행 전)", "STOP LOSS (실행됨)")
+_ENGINE_EVENTS = {
+    ae.EV_NONE: LAST_NONE, ae.EV_BUY: LAST_BUY, ae.EV_ADD: LAST_BUY,
+    ae.EV_SELL: LAST_SELL, ae.EV_STOP: LAST_STOP, ae.EV_RESTART: LAST_RESTART,
+}
+
+
+def _event_code(label: str) -> int:
+    if not label:
+        return LAST_NONE
+    if label.startswith("BUY") or label.startswith("ADD"):
+        return LAST_BUY
+    if label.startswith("SELL"):
+        return LAST_SELL
+    if label == "RESTART_+98.5pct":
+        return LAST_RESTART
+    if label == "STOP LOSS":
+        return LAST_STOP
+    return LAST_OTHER
+
+
+def _num(text: str) -> float:
+    try:
+        return float(text) if text not in ("", "nan") else np.nan
+    except ValueError:
+        return np.nan
+
+
+# ===== 마지막 행 읽기 =====
+# 심볼 1개 = (close, H, [B1..B7, Stop_Loss], 마지막 이벤트 분류, stage, 허용 레벨 수) — 디버그 CSV 셀과 같은 값
+
+Latest = Tuple[float, float, List[float], int, int, int]
+
+
+def _tail_csv(path: pathlib.Path) -> Tuple[List[str], Optional[List[str]], Optional[List[str]]]:
+    """(헤더, 마지막 행, 마지막 이벤트 행) — 파일 끝에서 블록 단위로 거슬러 읽음"""
+    with open(path, "rb") as f:
+        header = next(csv.reader([f.readline().decode("utf-8")]), [])
+        start = f.tell()
+        f.seek(0, 2)
+        pos = f.tell()
+        ev_col = header.index("event") if "event" in header else -1
+        last: Optional[List[str]] = None
+        tail = b""
+        block = TAIL_BLOCK
+        while pos > start:
+            step = min(block, pos - start)
+            pos -= step
+            f.seek(pos)
+            tail = f.read(step) + tail
+            lines = tail.split(b"\n")
+            # 맨 앞 조각은 줄 중간일 수 있음 (파일 시작에 닿으면 완전한 줄)
+            complete, tail = (lines, b"") if pos == start else (lines[1:], lines[0])
+            for raw in reversed(complete):
+                line = raw.decode("utf-8").rstrip("\r")
+                if not line:
+                    continue
+                row = next(csv.reader([line]))
+                if last is None:
+                    last = row
+                if ev_col < 0 or (ev_col < len(row) and row[ev_col]):
+                    return header, last, row
+            block *= 2
+        return header, last, None
+
+
+def _from_csv(path: pathlib.Path) -> Optional[Latest]:
+    header, last_row, event_row = _tail_csv(path)
+    if last_row is None:
+        return None
+    last = dict(zip(header, last_row))
+    levels = [_num(last[c]) for c in LEVEL_COLUMNS]
+    if event_row is None:
+        return _num(last["close"]), _num(last["H"]), levels, LAST_NONE, 0, -1
+    ev = dict(zip(header, event_row))
+    stage = ev["stage"].replace(".0", "")
+    allowed = ev["forbidden_levels_above_last_sell"]
+    return (
+        _num(last["close"]), _num(last["H"]), levels, _event_code(ev["event"]),
+        int(stage) if stage.isdigit() else 0, int(allowed) if allowed.isdigit() else -1,
+    )
+
+
+def _from_compact(path: pathlib.Path) -> Optional[Latest]:
+    """저장된 tail 행 (CSV 와 같은 자릿수로 반올림)"""
+    tail = read_tail(path)
+    if not len(tail):
+        return None
+    last = tail[0]
+    ev = last if last["event"] else (tail[1] if len(tail) > 1 else None)  # 마지막 스냅샷 자체가 RESTART 행일 수 있음
+    levels = [round(x, 10) for x in last["levels"].tolist()] + [round(float(last["stop"]), 10)]
+    close, H = round(float(last["close"]), 8), round(float(last["H"]), 8)
+    if ev is None:
+        return close, H, levels, LAST_NONE, 0, -1
+    return close, H, levels, _ENGINE_EVENTS[int(ev["event"])], int(ev["stage"]), int(ev["allowed"])
+
+
+def latest(path: pathlib.Path) -> Optional[Latest]:
+    """디버그 파일(CSV/압축)의 마지막 상태 — 행이 없으면 None"""
+    return _from_compact(path) if is_compact(path) else _from_csv(path)
+
+
+# ===== 배열 =====
+
+@dataclass
+class LatestState:
+    symbols: List[str]
+    pre: np.ndarray  # 상태 코드 (ST_OK_PENDING = 규칙 적용 대상)
+    close: np.ndarray
+    H: np.ndarray
+    levels: np.ndarray  # (n, 8) B1..B7, Stop_Loss (NaN = 없음)
+    event: np.ndarray  # LAST_*
+    stage: np.ndarray  # 마지막 이벤트 행 stage (0 = 없음)
+    allowed: np.ndarray  # 마지막 이벤트 행 forbidden_levels_above_last_sell (-1 = 없음)
+
+
+def gather(paths: Mapping[str, Optional[pathlib.Path]]) -> LatestState:
+    """{심볼: 디버그 파일(없으면 None)} → LatestState"""
+    n = len(paths)
+    pre = np.zeros(n, dtype=np.int8)
+    close = np.full(n, np.nan)
+    H = np.full(n, np.nan)
+    levels = np.full((n, len(LEVEL_COLUMNS)), np.nan)
+    event = np.zeros(n, dtype=np.int8)
+    stage = np.zeros(n, dtype=np.int8)
+    allowed = np.full(n, -1, dtype=np.int8)
+    for i, (symbol, path) in enumerate(paths.items()):
+        if path is None or not path.exists():
+            pre[i] = ST_NO_FILE
+            continue
+        try:
+            row = latest(path)
+        except Exception as e:
+            print(f"{symbol} 매수 진행 상황 분석 실패: {e}")
+            pre[i] = ST_ERROR
+            continue
+        if row is None:
+            pre[i] = ST_EMPTY
+            continue
+        close[i], H[i], levels[i], event[i], stage[i], allowed[i] = row
+    return LatestState(list(paths), pre, close, H, levels, event, stage, allowed)
+
+
+@dataclass
+class NextTargets:
+    state: LatestState
+    status: np.ndarray  # ST_*
+    target: np.ndarray  # 0..6 = B1..B7, 7 = STOP LOSS(실행 전), 8 = STOP LOSS(실행됨), -1 = 없음
+    price: np.ndarray
+    distance_pct: np.ndarray
+
+    def status_text(self, i: int) -> str:
+        text = STATUS[self.status[i]]
+        return text.format(k=f"B{self.target[i] + 1}") if "{k}" in text else text
+
+    def as_dicts(self) -> List[Dict[str, Any]]:
+        """get_latest_buy_progress 와 같은 형태의 dict 목록 (심볼 순서 유지)"""
+        s = self.state
+        close, H, price, dist = s.close.tolist(), s.H.tolist(), self.price.tolist(), self.distance_pct.tolist()
+        levels = [[None if x != x else x for x in row] for row in s.levels.tolist()]
+        out = []
+        for i, code in enumerate(self.status.tolist()):
+            status = self.status_text(i)
+            if code in (ST_NO_FILE, ST_EMPTY, ST_ERROR):
+                out.append({"status": status, "next_buy_target": None, "current_price": None, "h_value": None})
+                continue
+            if code == ST_NO_H:
+                out.append({"status": status, "next_buy_target": None, "current_price": close[i], "h_value": None})
+                continue
+            buy_levels = dict(zip(LEVEL_COLUMNS, levels[i]))
+            if code == ST_NO_PRICE:
+                out.append({
+                    "status": status, "next_buy_target": None, "current_price": close[i],
+                    "h_value": H[i], "buy_levels": buy_levels,
+                })
+                continue
+            out.append({
+                "status": status,
+                "next_buy_target": TARGET_LABELS[self.target[i]],
+                "next_buy_price": price[i],
+                "current_price": close[i],
+                "h_value": H[i],
+                "buy_levels": buy_levels,
+                "distance_pct": dist[i],
+            })
+        return out
+
+
+def resolve(s: LatestState) -> NextTargets:
+    """마지막 이벤트/stage/허용 레벨 수 → 다음 목표 (전 심볼 한 번에)"""
+    n = len(s.symbols)
+    status = np.full(n, ST_OTHER, dtype=np.int8)
+    target = np.zeros(n, dtype=np.int8)  # 기본 B1
+
+    ev, stage, allowed = s.event, s.stage, s.allowed
+    status[ev == LAST_NONE] = ST_NO_EVENTS
+
+    buy = ev == LAST_BUY
+    has_stage = stage > 0
+    m = buy & has_stage & (stage < 7)
+    status[m], target[m] = ST_BUY_NEXT, stage[m]
+    m = buy & has_stage & (stage >= 7)
+    status[m], target[m] = ST_BUY_MAX, STOP_COLUMN
+    m = buy & ~has_stage
+    status[m], target[m] = ST_BUY_NO_STAGE, 1
+
+    sell = ev == LAST_SELL
+    m = sell & (allowed == 0)
+    status[m], target[m] = ST_SELL_ALL, TARGET_NONE
+    m = sell & ((allowed == 7) | (allowed < 0) | (allowed > 7))
+    status[m], target[m] = ST_SELL_B1, 0
+    m = sell & (allowed >= 1) & (allowed <= 6)
+    status[m], target[m] = ST_SELL_NEXT, 7 - allowed[m]
+
+    status[ev == LAST_RESTART] = ST_RESTART
+    m = ev == LAST_STOP
+    status[m], target[m] = ST_STOP, STOP_COLUMN
+
+    # 목표가 (Stop_Loss 가 비어 있으면 H*0.19)
+    col = np.clip(target, 0, STOP_COLUMN).astype(np.intp)
+    price = np.where(target >= 0, s.levels[np.arange(n), col], np.nan)
+    stop_fallback = (target == STOP_COLUMN) & np.isnan(price)
+    price[stop_fallback] = s.H[stop_fallback] * STOP_LOSS_RATIO
+    with np.errstate(divide="ignore", invalid="ignore"):
+        distance = (s.close - price) / price * 100
+
+    target[status == ST_STOP] = STOP_EXECUTED
+    status[np.isnan(price)] = ST_NO_PRICE
+    status[np.isnan(s.H) | (s.H == 0)] = ST_NO_H
+    pending = s.pre != ST_OK_PENDING
+    status[pending] = s.pre[pending]
+    return NextTargets(s, status, target, price, distance)
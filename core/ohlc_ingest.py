@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+OHLC 적재(ingest) 단계 — 엔진에 넣기 전 1회 검증/보정
+
+- 정렬 + 중복 타임스탬프 제거 (나중 값 우선)
+- 연속성 검사: 빠진 날짜 구간
+- 이상 캔들 탐지: low > min(open, close), high < max(open, close), 0 이하 가격,
+  시가/종가 대비 SUSPICIOUS_WICK 이하로 찍힌 순간 저가 (보정 목록에 없으면 경고만 — 가짜 STOP LOSS 예방)
+- 보정 오버레이: config/ohlc_corrections.json 의 선언적 보정표를 적용
+    {"open_date": "YYYY-MM-DD"(UTC 시가 기준), "symbols": "*" 또는 [..], "set": {"low": "close"}, "reason": ".."}
+    set 값은 다른 필드 이름(복사) 또는 숫자
+
+엔진(run_phase1_5_simulation / step_day)은 더 이상 데이터 보정을 하지 않는다.
+캔들 날짜는 openTime(UTC) 기준, openTime 이 없으면 closeTime 의 UTC 날짜.
+"""
+from __future__ import annotations
+
+import json
+import pathlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from core.timeaxis import DAY_MS, candle_day, day_str, parse_day
+
+DEFAULT_CORRECTIONS = pathlib.Path(__file__).resolve().parent.parent / "config" / "ohlc_corrections.json"
+SUSPICIOUS_WICK = 0.5  # 저가 < min(open, close) × 0.5
+
+
+def candle_date(row: Dict[str, Any]) -> str:
+    return day_str(candle_day(row))
+
+
+def _key(row: Dict[str, Any]) -> int:
+    return int(row["openTime"] if row.get("openTime") is not None else row["closeTime"])
+
+
+@dataclass
+class Correction:
+    open_date: str
+    set: Dict[str, Union[str, float]]
+    symbols: Union[str, List[str]] = "*"
+    reason: str = ""
+
+    def applies(self, symbol: str) -> bool:
+        if self.symbols == "*":
+            return True
+        base = symbol.upper().replace("USDT", "")
+        return any(s.upper() in (symbol.upper(), base) for s in self.symbols)
+
+    def apply(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        out = dict(row)
+        for fld, value in self.set.items():
+            out[fld] = float(row[value]) if isinstance(value, str) else float(value)
+        return out
+
+
+_CACHE: Dict[str, List[Correction]] = {}
+
+
+def load_corrections(path: Union[str, pathlib.Path] = DEFAULT_CORRECTIONS) -> List[Correction]:
+    key = str(path)
+    if key not in _CACHE:
+        p = pathlib.Path(path)
+        raw = json.loads(p.read_text(encoding="utf-8")) if p.exists() else {"corrections": []}
+        _CACHE[key] = [Correction(**c) for c in raw.get("corrections", [])]
+    return _CACHE[key]
+
+
+@dataclass
+class IngestReport:
+    symbol: str
+    candles: int = 0
+    duplicates: List[str] = field(default_factory=list)
+    missing: List[Tuple[str, str]] = field(default_factory=list)
+    anomalies: List[str] = field(default_factory=list)
+    corrected: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not (self.duplicates or self.missing or self.anomalies)
+
+    def summary(self) -> str:
+        parts = []
+        if self.duplicates:
+            parts.append(f"중복 {len(self.duplicates)}건")
+        if self.missing:
+            parts.append("누락 " + ", ".join(a if a == b else f"{a}~{b}" for a, b in self.missing[:5]))
+        if self.anomalies:
+            parts.append("이상 캔들 " + "; ".join(self.anomalies[:5]))
+        if self.corrected:
+            parts.append(f"보정 {len(self.corrected)}건")
+        return f"{self.symbol}: " + (", ".join(parts) if parts else "정상")
+
+
+def _check(row: Dict[str, Any]) -> Optional[str]:
+    o, h, l, c = (float(row[k]) for k in ("open", "high", "low", "close"))
+    if min(o, h, l, c) <= 0:
+        return "0 이하 가격"
+    if l > min(o, c) or h < max(o, c):
+        return f"범위 위반 (O={o} H={h} L={l} C={c})"
+    if l < min(o, c) * SUSPICIOUS_WICK:
+        return f"비정상 순간 저가 L={l} (O={o} C={c})"
+    return None
+
+
+def ingest(
+    symbol: str, rows: List[Dict[str, Any]], corrections: Optional[List[Correction]] = None
+) -> Tuple[List[Dict[str, Any]], IngestReport]:
+    """검증 + 보정된 새 행 목록과 리포트 (입력은 변경하지 않음)"""
+    corrections = load_corrections() if corrections is None else corrections
+    report = IngestReport(symbol)
+
+    by_key: Dict[int, Dict[str, Any]] = {}
+    for r in rows:
+        k = _key(r)
+        if k in by_key:
+            report.duplicates.append(candle_date(r))
+        by_key[k] = r
+    keys = sorted(by_key)
+
+    for a, b in zip(keys, keys[1:]):
+        if b - a > DAY_MS:
+            report.missing.append((candle_date({"openTime": a + DAY_MS}), candle_date({"openTime": b - DAY_MS})))
+
+    overlay: Dict[int, List[Correction]] = {}
+    for corr in corrections:
+        if corr.applies(symbol):
+            overlay.setdefault(parse_day(corr.open_date), []).append(corr)
+
+    out: List[Dict[str, Any]] = []
+    for k in keys:
+        row = by_key[k]
+        date = candle_date(row)
+        fixes = overlay.get(candle_day(row), ())
+        for corr in fixes:
+            fixed = corr.apply(row)
+            changed = {f: (row[f], fixed[f]) for f in corr.set if float(row[f]) != fixed[f]}
+            if changed:
+                report.corrected.append(
+                    f"{date} " + ", ".join(f"{f} {a}→{b}" for f, (a, b) in changed.items()) + f" ({corr.reason})"
+                )
+            row = fixed
+        problem = None if fixes else _check(row)  # 보정표에 있는 캔들은 검사 생략
+        if problem:
+            report.anomalies.append(f"{date} {problem}")
+        out.append(row)
+    report.candles = len(out)
+    return out, report
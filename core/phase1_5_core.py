@@ -31,6 +31,10 @@ import pathlib
 import csv
 import requests
 
+from core import http_client
+from core.profiling import PROFILER
+from core.timeaxis import DAY_MS, day_str
+
 # ===== Constants =====
 YEARS = 5
 TIMEOUT_SEC = 20
@@ -50,22 +54,14 @@ def ensure_output_dir():
 # ===== HTTP =====
 
 def http_get(url: str, params: Dict[str, Any]) -> Any:
-    backoff = 1.0
-    for _ in range(6):
-        try:
-            resp = requests.get(url, params=params, timeout=TIMEOUT_SEC)
-            if resp.status_code == 200:
-                return resp.json()
-            if resp.status_code == 429 or (500 <= resp.status_code < 600):
-                sleep_sec = float(resp.headers.get("Retry-After") or backoff)
-                time.sleep(sleep_sec)
-                backoff = min(backoff * 1.8, 10)
-                continue
-            raise RuntimeError(f"HTTP {resp.status_code}: {resp.text[:200]}")
-        except requests.RequestException:
-            time.sleep(backoff)
-            backoff = min(backoff * 1.8, 10)
-    raise RuntimeError("GET failed after retries")
+    """재시도/Retry-After/회로 차단은 core.http_client.DEFAULT_RETRY"""
+    try:
+        resp = http_client.get(url, params=params, timeout=TIMEOUT_SEC, retry=http_client.DEFAULT_RETRY)
+    except requests.RequestException as e:
+        raise RuntimeError(f"GET failed after retries: {e}") from e
+    if resp.status_code != 200:
+        raise RuntimeError(f"HTTP {resp.status_code}: {resp.text[:200]}")
+    return resp.json()
 
 
 # ===== OHLC =====
@@ -181,9 +177,6 @@ def run_phase1_5_simulation(
     limit_days: int = 180,
     daily_H: Optional[Dict[str, float]] = None,
 ) -> None:
-    def ts(ms: int) -> str:
-        return dt.datetime.fromtimestamp(ms / 1000, tz=dt.UTC).strftime("%Y-%m-%d")
-
     level_names = ["B1", "B2", "B3", "B4", "B5", "B6", "B7"]
 
     # initial H & levels
@@ -200,13 +193,13 @@ def run_phase1_5_simulation(
     forbidden_level_prices: set[float] = set()
 
     # re-ADD guards within a position
-    last_fill_date: dict[str, str] = {}
+    last_fill_day: dict[str, int] = {}  # 레벨 → 마지막 체결 epoch-day
     filled_levels_current: set[str] = set()
     deepest_filled_idx: int = 0
 
     ensure_output_dir()
     with open(out_csv, "w", newline="", encoding="utf-8") as f:
-        w = csv.writer(f)
+        w = PROFILER.timed_writer(csv.writer(f))
         w.writerow([
             "date","open","high","low","close",
             "mode","position","stage","event","basis",
@@ -221,12 +214,9 @@ def run_phase1_5_simulation(
             if idx == 0:
                 continue
 
-            date = ts(row["closeTime"])  # UTC → YYYY-MM-DD
-            o, h, l, c = row["open"], row["high"], row["low"], row["close"]
-            
-            # 2025-10-09 날짜의 저가 데이터를 종가로 대체 (이상 데이터 보정)
-            if date == '2025-10-09':
-                l = c
+            day = int(row["closeTime"]) // DAY_MS  # epoch-day (UTC), 문자열은 CSV 출력용으로만
+            date = day_str(day)
+            o, h, l, c = row["open"], row["high"], row["low"], row["close"]  # 보정은 core.ohlc_ingest 에서 완료
 
             # per-day buffer for event rows
             day_events: List[List[Any]] = []
@@ -282,7 +272,7 @@ def run_phase1_5_simulation(
                 position = False
                 stage = None
                 L = l  # 새 저점 기록
-                last_fill_date.clear()
+                last_fill_day.clear()
                 filled_levels_current.clear()
                 deepest_filled_idx = 0
                 last_sell_trigger_price = None  # reset cutoff
@@ -325,7 +315,7 @@ def run_phase1_5_simulation(
                     position = True
                     stage = level_names.index(nm) + 1
                     # emit
-                    last_fill_date[nm] = date
+                    last_fill_day[nm] = day
                     filled_levels_current = {nm}
                     deepest_filled_idx = stage
                     allowed_cnt = _allowed_levels_for_display(level_pairs, forbidden_level_prices, last_sell_trigger_price)
@@ -349,7 +339,7 @@ def run_phase1_5_simulation(
             if mode == "wait" and position and (lv is not None) and (l is not None) and (h is not None):
                 add_candidates: List[Tuple[str, float]] = [
                     (nm, p) for (nm, p) in level_pairs
-                    if (last_fill_date.get(nm) != date)
+                    if (last_fill_day.get(nm) != day)
                     and (l <= p <= h)
                     and (p not in forbidden_level_prices)
                     and not (last_sell_trigger_price is not None and p > last_sell_trigger_price)
@@ -358,7 +348,7 @@ def run_phase1_5_simulation(
                 ]
                 for nm, p in sorted(add_candidates, key=lambda x: _level_order.get(x[0], 99)):
                     stage = max(stage or 1, level_names.index(nm) + 1)
-                    last_fill_date[nm] = date
+                    last_fill_day[nm] = day
                     filled_levels_current.add(nm)
                     deepest_filled_idx = max(deepest_filled_idx, level_names.index(nm) + 1)
                     allowed_cnt = _allowed_levels_for_display(level_pairs, forbidden_level_prices, last_sell_trigger_price)
@@ -399,7 +389,7 @@ def run_phase1_5_simulation(
                         }
                         # SELL 이후에도 L **유지** (재시작 전까지 L_now 공백 방지)
                         stage = None
-                        last_fill_date.clear()
+                        last_fill_day.clear()
                         filled_levels_current.clear()
                         deepest_filled_idx = 0
                         allowed_cnt = _allowed_levels_for_display(level_pairs, forbidden_level_prices, last_sell_trigger_price)
@@ -425,7 +415,7 @@ def run_phase1_5_simulation(
                 if l <= stop_loss_price:
                     position = False
                     stage = None
-                    last_fill_date.clear()
+                    last_fill_day.clear()
                     filled_levels_current.clear()
                     deepest_filled_idx = 0
                     # STOP LOSS 후에는 추가 매수 금지 (사이클 초기화 전까지)
@@ -499,15 +489,16 @@ def run_phase1_5_simulation(
                 (round(next_trig,10) if next_trig is not None else None),
             ])
 
-    if limit_days:
-        lines = out_csv.read_text(encoding="utf-8").splitlines()
-        header_skipped = False
-        for ln in lines[-limit_days:]:
-            parts = ln.split(",")
-            if not parts:
-                continue
-            if not header_skipped and parts[0] == "date":
-                header_skipped = True
-                continue
-            date, _o, _h, _l, close, mode, pos, stg, evt, basis, *_ = parts
-            print(f" {date} | {close} | {mode} | pos={pos} | stg={stg} | {basis} | {evt}")
+    with PROFILER.stage("csv_echo"):
+        if limit_days:
+            lines = out_csv.read_text(encoding="utf-8").splitlines()
+            header_skipped = False
+            for ln in lines[-limit_days:]:
+                parts = ln.split(",")
+                if not parts:
+                    continue
+                if not header_skipped and parts[0] == "date":
+                    header_skipped = True
+                    continue
+                date, _o, _h, _l, close, mode, pos, stg, evt, basis, *_ = parts
+                print(f" {date} | {close} | {mode} | pos={pos} | stg={stg} | {basis} | {evt}")
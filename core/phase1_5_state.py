@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Phase 1.5 엔진 상태 + 하루 단위 스텝 함수
+
+run_phase1_5_simulation() 루프 한 바퀴(=캔들 1개)를 그대로 옮긴 것.
+- 엔진 상태는 EngineState 하나로 표현 (mode/position/stage/H/L/cutoff)
+- 금지 레벨은 cutoff 로부터 유도
+    * SELL 이후: cutoff(매도 기준가) 초과 레벨 금지
+    * STOP LOSS 이후: cutoff = inf → 전 레벨 금지
+    * RESTART 시: cutoff = None → 금지 해제
+- step_day() 는 상태를 갱신하고 CSV 와 동일한 이벤트 행/스냅샷 행을 돌려줌
+- daily_H 오버라이드는 지원하지 않음 (auto_debug_builder 경로 기준)
+
+실시간 투영(core.live_state), 상태 조회 등에서 공통으로 사용.
+"""
+from __future__ import annotations
+
+import csv
+import math
+import pathlib
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.phase1_5_core import SELL_THRESHOLDS, _level_order, _type_order, compute_levels
+from core.timeaxis import DAY_MS, day_str, parse_day
+
+LEVEL_NAMES = ["B1", "B2", "B3", "B4", "B5", "B6", "B7"]
+
+WAIT_ENTRY_RATIO = 0.56  # high → wait (고점 대비 -44%)
+RESTART_MULT = 1.985  # wait → high (저점 대비 +98.5%)
+STOP_LOSS_RATIO = 0.19  # 81% 하락
+
+CSV_HEADER = [
+    "date", "open", "high", "low", "close",
+    "mode", "position", "stage", "event", "basis",
+    "level_name", "level_price", "trigger_price", "fill_price",
+    "H", "L_now", "rebound_from_L_pct", "threshold_pct",
+    "forbidden_levels_above_last_sell",
+    "B1", "B2", "B3", "B4", "B5", "B6", "B7", "Stop_Loss",
+    "cutoff_price", "next_buy_level_name", "next_buy_level_price", "next_buy_trigger_price",
+]
+
+
+@dataclass
+class EngineState:
+    """하루 마감 시점의 Phase 1.5 엔진 상태"""
+    mode: str = "high"
+    position: bool = False
+    stage: Optional[int] = None
+    H: Optional[float] = None
+    L: Optional[float] = None
+    cutoff: Optional[float] = None  # last_sell_trigger_price
+    day: Optional[int] = None  # 마지막으로 반영된 epoch-day (core.timeaxis)
+    lv: Optional[Dict[str, float]] = None  # compute_levels(H) 캐시
+
+    @property
+    def date(self) -> Optional[str]:
+        return day_str(self.day) if self.day is not None else None
+
+    def set_H(self, H: float) -> None:
+        self.H = H
+        self.lv = compute_levels(H)
+
+    def copy(self) -> "EngineState":
+        return replace(self)
+
+    def is_forbidden(self, px: float) -> bool:
+        """SELL/STOP LOSS 이후 금지 레벨 여부"""
+        if self.cutoff is None:
+            return False
+        return math.isinf(self.cutoff) or px > self.cutoff
+
+    def forbidden_count(self) -> int:
+        if self.cutoff is None or self.lv is None:
+            return 0
+        return sum(1 for nm in LEVEL_NAMES if self.is_forbidden(self.lv[nm]))
+
+    def allowed_count(self) -> int:
+        """forbidden_levels_above_last_sell 컬럼 값 (허용 레벨 수)"""
+        if self.cutoff is None:
+            return 7
+        return max(0, min(7, 7 - self.forbidden_count()))
+
+    def level_pairs(self) -> List[Tuple[str, float]]:
+        """(레벨명, 가격) — 가격 오름차순 (B7 … B1)
+        반올림으로 가격이 같아지는 초저가 코인에서도 reference 와 같은 순서가 되도록 안정 정렬 사용"""
+        if self.lv is None:
+            return []
+        return sorted(((nm, self.lv[nm]) for nm in LEVEL_NAMES), key=lambda x: x[1])
+
+
+# ===== 시드 =====
+
+def _opt_float(v: Any) -> Optional[float]:
+    if v is None:
+        return None
+    s = str(v).strip()
+    if s == "" or s.lower() == "nan":
+        return None
+    return float(s)
+
+
+def state_from_snapshot(row: Dict[str, Any]) -> EngineState:
+    """디버그 CSV 스냅샷 행(dict)에서 EngineState 복원"""
+    st = EngineState()
+    st.mode = str(row.get("mode") or "high")
+    st.position = str(row.get("position")).strip() == "True"
+    stage = _opt_float(row.get("stage"))
+    st.stage = int(stage) if stage is not None else None
+    H = _opt_float(row.get("H"))
+    if H is not None:
+        st.set_H(H)
+    st.L = _opt_float(row.get("L_now"))
+    st.cutoff = _opt_float(row.get("cutoff_price"))
+    st.day = parse_day(row["date"]) if row.get("date") else None
+    return st
+
+
+def read_debug_rows(csv_path: pathlib.Path) -> List[Dict[str, str]]:
+    """디버그 CSV 또는 압축 디버그(.npz, core.compact_debug 가 재생)의 전체 행"""
+    if pathlib.Path(csv_path).suffix == ".npz":
+        from core.compact_debug import read_rows
+
+        return read_rows(csv_path)
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def daily_snapshots(rows: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    """날짜별 마지막 행(=스냅샷)만 추출"""
+    snaps: Dict[str, Dict[str, str]] = {}
+    for r in rows:
+        snaps[r["date"]] = r
+    return list(snaps.values())
+
+
+def seed_from_ohlc(ohlc: List[Dict[str, Any]]) -> EngineState:
+    """run_phase1_5_simulation 과 동일하게 첫 캔들을 건너뛰고 전체를 재생"""
+    st = EngineState()
+    for row in ohlc[1:]:
+        step_day(st, int(row["closeTime"]) // DAY_MS, row["open"], row["high"], row["low"], row["close"])
+    return st
+
+
+# ===== 행 생성 =====
+
+def _r(x: Optional[float], nd: int) -> Optional[float]:
+    return round(x, nd) if x is not None else None
+
+
+def _row(
+    st: EngineState, date: str, o: float, h: float, l: float, c: float,
+    event: str, basis: str, level_name: str,
+    level_price: Optional[float], trigger_price: Optional[float], fill_price: Optional[float],
+    L_now: Optional[float], rebound_pct: Optional[float], threshold_pct: Optional[float],
+    allowed_cnt: int, next_nm: str, next_px: Optional[float], next_trig: Optional[float],
+) -> List[Any]:
+    Bvals = [st.lv[n] if st.lv else None for n in LEVEL_NAMES]
+    stop_loss_price = st.H * STOP_LOSS_RATIO if st.H is not None else None
+    return [
+        date, round(o, 8), round(h, 8), round(l, 8), round(c, 8),
+        st.mode, st.position, st.stage, event, basis,
+        level_name, level_price, trigger_price, fill_price,
+        _r(st.H, 8), L_now,
+        rebound_pct, threshold_pct,
+        allowed_cnt,
+        *(_r(x, 10) for x in Bvals),
+        _r(stop_loss_price, 10),
+        _r(st.cutoff, 10),
+        next_nm, next_px, next_trig,
+    ]
+
+
+# ===== 하루 스텝 =====
+
+def step_day(
+    st: EngineState, day: int, o: float, h: float, l: float, c: float
+) -> Tuple[List[List[Any]], List[Any]]:
+    """
+    캔들 1개(epoch-day) 반영. 상태(st)를 갱신하고 (이벤트 행 목록, 스냅샷 행)을 반환.
+    이벤트 행은 BUY → ADD → SELL → STOP LOSS 순으로 정렬된 상태. 행의 date 는 문자열.
+    """
+    date = day_str(day)
+    day_events: List[List[Any]] = []
+    rebound_pct: Optional[float] = None
+    threshold_pct: Optional[float] = None
+    restart_event_for_snapshot: Optional[str] = None
+
+    # Initialize H / high 모드에서 H 갱신
+    if st.H is None and st.mode == "high" and h is not None:
+        st.set_H(h)
+    if st.mode == "high" and st.H is not None and h is not None and h > st.H:
+        st.set_H(h)
+
+    # always track L while in wait
+    if st.mode == "wait":
+        if st.L is None or (l is not None and l < st.L):
+            st.L = l
+
+    # wait → high (RESTART)
+    if st.mode == "wait" and st.L is not None and h is not None and h >= st.L * RESTART_MULT:
+        restart_trigger = st.L * RESTART_MULT
+        st.mode = "high"
+        st.set_H(h)
+        st.position = False
+        st.stage = None
+        st.L = l
+        st.cutoff = None
+        day_events.append(_row(
+            st, date, o, h, l, c, "RESTART_+98.5pct", "HIGH",
+            "", None, round(restart_trigger, 8), None,
+            None, None, None, st.allowed_count(), "", None, None,
+        ))
+        restart_event_for_snapshot = "RESTART_+98.5pct"
+
+    # high → wait
+    if st.mode == "high" and st.H is not None and l is not None and l <= st.H * WAIT_ENTRY_RATIO:
+        st.mode = "wait"
+        st.L = l
+
+    # BUY (shallowest among included levels)
+    if st.mode == "wait" and not st.position and st.lv is not None and l is not None and h is not None:
+        crossed = [(nm, p) for (nm, p) in st.level_pairs() if l <= p <= h and not st.is_forbidden(p)]
+        if crossed:
+            nm, p = max(crossed, key=lambda x: x[1])
+            st.position = True
+            st.stage = LEVEL_NAMES.index(nm) + 1
+            day_events.append(_row(
+                st, date, o, h, l, c, f"BUY {nm}", "LOW",
+                nm, round(p, 8), round(l, 8), round(p, 8),
+                _r(st.L, 8), None, None, st.allowed_count(), nm, round(p, 10), round(l, 10),
+            ))
+
+    # ADD (deeper only; included in [l,h])
+    if st.mode == "wait" and st.position and st.lv is not None and l is not None and h is not None:
+        deepest = st.stage or 0
+        adds = [
+            (nm, p) for (nm, p) in st.level_pairs()
+            if l <= p <= h and not st.is_forbidden(p) and LEVEL_NAMES.index(nm) + 1 > deepest
+        ]
+        for nm, p in sorted(adds, key=lambda x: _level_order.get(x[0], 99)):
+            st.stage = max(st.stage or 1, LEVEL_NAMES.index(nm) + 1)
+            day_events.append(_row(
+                st, date, o, h, l, c, f"ADD {nm}", "LOW",
+                nm, round(p, 8), round(l, 8), round(p, 8),
+                _r(st.L, 8), None, None, st.allowed_count(), nm, round(p, 10), round(l, 10),
+            ))
+
+    # SELL (only if holding)
+    if st.position and st.stage is not None:
+        if l is not None:
+            st.L = l if st.L is None else min(st.L, l)
+        if st.L is not None and h is not None:
+            rebound_pct = (h / st.L - 1) * 100.0
+            threshold_pct = SELL_THRESHOLDS.get(st.stage)
+            if threshold_pct is not None and rebound_pct >= threshold_pct:
+                st.position = False
+                target_sell_price = st.L * (1.0 + threshold_pct / 100.0)
+                gap_open = l is not None and l >= target_sell_price
+                fill_price = o if gap_open else target_sell_price
+                st.cutoff = max(target_sell_price, fill_price)
+                st.stage = None
+                day_events.append(_row(
+                    st, date, o, h, l, c, "SELL S", "HIGH",
+                    "", None, round(target_sell_price, 8), round(fill_price, 8),
+                    _r(st.L, 8), None, threshold_pct, st.allowed_count(), "", None, None,
+                ))
+
+    # STOP LOSS (only if holding)
+    if st.position and st.stage is not None and st.H is not None and l is not None:
+        stop_loss_price = st.H * STOP_LOSS_RATIO
+        if l <= stop_loss_price:
+            st.position = False
+            st.stage = None
+            st.cutoff = float('inf')
+            day_events.append(_row(
+                st, date, o, h, l, c, "STOP LOSS", "LOW",
+                "", None, round(stop_loss_price, 8), round(stop_loss_price, 8),
+                _r(st.L, 8), None, None, 0, "", None, None,
+            ))
+
+    if day_events:
+        day_events.sort(key=lambda r: (_type_order(str(r[8])), _level_order.get(str(r[10]), 99)))
+
+    # next_* by inclusion rule
+    next_nm = ""
+    next_px: Optional[float] = None
+    if st.lv is not None and l is not None and h is not None:
+        pairs = st.level_pairs()
+        crossed2 = [(nm, px) for (nm, px) in pairs if l <= px <= h and not st.is_forbidden(px)]
+        if crossed2 and st.mode == "wait":
+            next_nm, next_px = max(crossed2, key=lambda x: x[1])
+        else:
+            for nm, px in pairs:
+                if not st.is_forbidden(px) and l > px:
+                    next_nm, next_px = nm, px
+                    break
+
+    snapshot = _row(
+        st, date, o, h, l, c, restart_event_for_snapshot or "", "",
+        "", None, None, None,
+        _r(st.L, 8), None if rebound_pct is None else round(rebound_pct, 6), threshold_pct,
+        st.allowed_count(), next_nm, _r(next_px, 10), _r(l, 10),
+    )
+    st.day = day
+    return day_events, snapshot
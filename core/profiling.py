@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+일일 파이프라인 단계별 프로파일링 (opt-in)
+
+활성화: 환경변수 OMG_PROFILE=1 또는 각 스크립트의 --profile 옵션
+  OMG_PROFILE_TOP=N   가장 느린 N개 심볼의 cProfile 덤프(.prof) 저장 (기본 0 = 끔)
+  OMG_PROFILE_DIR     리포트 저장 폴더 (기본 output/profile)
+
+단계(stage) 는 중첩 가능하며 자기 시간(self time)만 집계한다.
+  예) simulation 안의 csv_write 시간은 simulation 에서 빠진다.
+단계 스택/현재 심볼은 스레드별(threading.local), 집계는 락으로 보호
+  → ThreadPoolExecutor 안의 http_fetch 등이 다른 스레드의 단계에 섞이지 않는다.
+
+비활성 상태에서는 stage() 가 아무 일도 하지 않는 컨텍스트를 돌려준다.
+
+리포트 (JSON, 실행 1회당 1개):
+  {"tool", "started", "wall_sec", "peak_rss_mb",
+   "stages": {stage: {"count", "total_sec", "max_sec", "mean_ms"}},
+   "symbols": [{"symbol", "total_sec", "stages": {...}}, ...  느린 순],
+   "cprofile": [{"symbol", "total_sec", "path"}]}
+"""
+from __future__ import annotations
+
+import cProfile
+import contextlib
+import heapq
+import json
+import os
+import pathlib
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import psutil
+except ImportError:  # psutil 미설치 시 RSS 기록 생략
+    psutil = None
+
+PROFILE_DIR = pathlib.Path(os.environ.get("OMG_PROFILE_DIR", "output/profile"))
+RSS_SAMPLE_SEC = 0.5
+_NULL = contextlib.nullcontext()
+
+
+class RssSampler:
+    """peak RSS 추적 — Windows 는 peak_wset, 그 외는 백그라운드 샘플링"""
+
+    def __init__(self):
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._proc = psutil.Process() if psutil else None
+
+    def sample(self) -> None:
+        if not self._proc:
+            return
+        mi = self._proc.memory_info()
+        self.peak = max(self.peak, getattr(mi, "peak_wset", 0) or mi.rss)
+
+    def _loop(self) -> None:
+        while not self._stop.wait(RSS_SAMPLE_SEC):
+            self.sample()
+
+    def start(self) -> None:
+        if self._proc and self._thread is None:
+            self.sample()
+            self._thread = threading.Thread(target=self._loop, name="rss-sampler", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self.sample()
+
+
+class PipelineProfiler:
+    def __init__(self):
+        self.enabled = False
+        self.tool = ""
+        self.top_n = 0
+        self.started = 0.0
+        self._started_at = ""
+        self._stages: Dict[str, List[float]] = {}  # stage -> [count, total, max]
+        self._by_symbol: Dict[str, Dict[str, float]] = {}
+        self._local = threading.local()  # stack: [[시작 시각, 하위 단계 누적 시간]], symbol
+        self._lock = threading.Lock()
+        self._rss = RssSampler()
+        self._slowest: List[Tuple[float, str, cProfile.Profile]] = []  # 최소 힙 (top_n 유지)
+
+    @property
+    def _stack(self) -> List[List[float]]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @property
+    def _symbol(self) -> Optional[str]:
+        return getattr(self._local, "symbol", None)
+
+    @_symbol.setter
+    def _symbol(self, symbol: Optional[str]) -> None:
+        self._local.symbol = symbol
+
+    # ----- 설정 -----
+
+    def enable(self, tool: str, top_n: Optional[int] = None) -> None:
+        self.enabled = True
+        self.tool = tool
+        self.top_n = int(os.environ.get("OMG_PROFILE_TOP", "0")) if top_n is None else top_n
+        self.started = time.perf_counter()
+        self._started_at = datetime.now().isoformat(timespec="seconds")
+        self._rss.start()
+        print(f"[PROFILE] 단계별 프로파일링 활성화 ({tool}, cProfile Top {self.top_n})")
+
+    def enable_from_env(self, tool: str, flag: bool = False) -> None:
+        if flag or os.environ.get("OMG_PROFILE", "") not in ("", "0"):
+            self.enable(tool)
+
+    # ----- 측정 -----
+
+    def stage(self, name: str):
+        """단계 시간 측정 컨텍스트 (비활성 시 no-op)"""
+        if not self.enabled:
+            return _NULL
+        return self._stage(name)
+
+    @contextlib.contextmanager
+    def _stage(self, name: str):
+        stack = self._stack
+        frame = [time.perf_counter(), 0.0]
+        stack.append(frame)
+        try:
+            yield
+        finally:
+            stack.pop()
+            elapsed = time.perf_counter() - frame[0]
+            if stack:
+                stack[-1][1] += elapsed
+            self.add(name, elapsed - frame[1])
+
+    def add(self, name: str, seconds: float) -> None:
+        symbol = self._symbol
+        with self._lock:
+            row = self._stages.setdefault(name, [0, 0.0, 0.0])
+            row[0] += 1
+            row[1] += seconds
+            row[2] = max(row[2], seconds)
+            if symbol is not None:
+                per = self._by_symbol.setdefault(symbol, {})
+                per[name] = per.get(name, 0.0) + seconds
+
+    def symbol(self, symbol: str):
+        """심볼 1개 처리 구간 (단계 시간을 심볼별로 귀속, top_n > 0 이면 cProfile)"""
+        if not self.enabled:
+            return _NULL
+        return self._symbol_ctx(symbol)
+
+    @contextlib.contextmanager
+    def _symbol_ctx(self, symbol: str):
+        self._symbol = symbol
+        prof = cProfile.Profile() if self.top_n > 0 else None
+        started = time.perf_counter()
+        if prof:
+            try:
+                prof.enable()
+            except ValueError:  # 다른 스레드의 cProfile 이 이미 활성 (Python 3.12+)
+                prof = None
+        try:
+            yield
+        finally:
+            if prof:
+                prof.disable()
+            total = time.perf_counter() - started
+            self._symbol = None
+            with self._lock:
+                self._by_symbol.setdefault(symbol, {})["_total"] = total
+                if prof:
+                    item = (total, symbol, prof)
+                    if len(self._slowest) < self.top_n:
+                        heapq.heappush(self._slowest, item)
+                    elif total > self._slowest[0][0]:
+                        heapq.heapreplace(self._slowest, item)
+            self._rss.sample()
+
+    def timed_writer(self, writer, name: str = "csv_write"):
+        """csv.writer 의 writerow 호출을 단계로 측정하는 래퍼"""
+        if not self.enabled:
+            return writer
+        profiler = self
+
+        class _TimedWriter:
+            def writerow(self, row):
+                with profiler._stage(name):
+                    return writer.writerow(row)
+
+            def writerows(self, rows):
+                with profiler._stage(name):
+                    return writer.writerows(rows)
+
+        return _TimedWriter()
+
+    # ----- 리포트 -----
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            stage_rows = {name: tuple(row) for name, row in self._stages.items()}
+            by_symbol = {sym: dict(per) for sym, per in self._by_symbol.items()}
+        stages = {
+            name: {
+                "count": int(cnt),
+                "total_sec": round(total, 4),
+                "max_sec": round(mx, 4),
+                "mean_ms": round(total / cnt * 1000, 3) if cnt else 0.0,
+            }
+            for name, (cnt, total, mx) in sorted(stage_rows.items(), key=lambda kv: -kv[1][1])
+        }
+        symbols = [
+            {
+                "symbol": sym,
+                "total_sec": round(per.get("_total", 0.0), 4),
+                "stages": {k: round(v, 4) for k, v in per.items() if k != "_total"},
+            }
+            for sym, per in by_symbol.items()
+        ]
+        symbols.sort(key=lambda d: -d["total_sec"])
+        return {
+            "tool": self.tool,
+            "started": self._started_at,
+            "argv": sys.argv,
+            "wall_sec": round(time.perf_counter() - self.started, 4),
+            "peak_rss_mb": round(self._rss.peak / 1024 / 1024, 1) if self._rss.peak else None,
+            "stages": stages,
+            "symbols": symbols,
+        }
+
+    def finish(self, out_dir: pathlib.Path = PROFILE_DIR) -> Optional[pathlib.Path]:
+        """리포트 JSON + 느린 심볼 cProfile 덤프 저장"""
+        if not self.enabled:
+            return None
+        self._rss.stop()
+        out_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        report = self.report()
+
+        dumps = []
+        for total, sym, prof in sorted(self._slowest, reverse=True):
+            path = out_dir / f"{self.tool}_{stamp}_{sym}.prof"
+            prof.dump_stats(str(path))
+            dumps.append({"symbol": sym, "total_sec": round(total, 4), "path": str(path)})
+        report["cprofile"] = dumps
+
+        path = out_dir / f"{self.tool}_{stamp}.json"
+        path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+        print(f"\n[PROFILE] {self.tool}: {report['wall_sec']:.1f}s, peak RSS {report['peak_rss_mb']} MB")
+        for name, row in list(report["stages"].items())[:8]:
+            print(f"  {name:<16} {row['total_sec']:>9.2f}s  x{row['count']:<6} (최대 {row['max_sec']:.3f}s)")
+        print(f"[PROFILE] 리포트 저장: {path}")
+        self.enabled = False
+        return path
+
+
+PROFILER = PipelineProfiler()
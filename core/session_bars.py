@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+세션 기준 봉 재구성 (저장된 1h/5m 분봉 → 임의 세션 경계의 일봉)
+
+- Session: 시간대 오프셋 + 세션 시작 시각 (+ 세션 길이, 기본 1일)
+    Session.parse("KST")            → UTC+09:00, 00:00 시작 (한국 날짜 기준 일봉)
+    Session.parse("+09:00@09:00")   → KST 09:00 시작 (= Binance UTC 일봉과 같은 경계)
+    Session.parse("UTC@00:00/4h")   → UTC 4시간 봉
+- resample(): 전체 이력을 numpy 로 한 번에 집계 (np.maximum/minimum/add.reduceat)
+  세션 라벨 = 세션 시작 시각의 현지 날짜, candles = 세션에 포함된 분봉 수
+  진행 중인 마지막 세션은 기본 제외 (include_partial=True 로 포함)
+- SessionBarCache: cache/sessions/<interval>/<session.key>/<SYMBOL>.npz
+  원본 분봉 파일의 크기/수정 시각이 같으면 재집계 없이 재사용 → 세션 변형마다 API 호출 없음
+- to_engine_ohlc(): closeTime 의 UTC 날짜가 세션 라벨이 되도록 맞춘 run_phase1_5_simulation 입력
+
+보정 오버레이(core.ohlc_ingest)는 UTC 일봉 기준이므로 세션 봉에는 적용하지 않는다.
+"""
+from __future__ import annotations
+
+import os
+import pathlib
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from core.kline_store import KlineStore
+from core.timeaxis import DAY_MS, day_str
+
+DEFAULT_CACHE = "cache/sessions"
+_ALIASES = {"UTC": "+00:00", "KST": "+09:00"}
+_SESSION_RE = re.compile(r"^([+-])(\d{2}):(\d{2})@(\d{2}):(\d{2})(?:/(\d+)([HD]))?$")
+FIELDS = ("openTime", "open", "high", "low", "close", "volume", "candles")
+
+
+@dataclass(frozen=True)
+class Session:
+    offset_min: int = 0  # UTC 대비 분
+    start_min: int = 0  # 현지 시각 기준 세션 시작 (분)
+    length_ms: int = DAY_MS
+
+    @classmethod
+    def parse(cls, text: str) -> "Session":
+        spec = text.strip().upper()
+        zone, _, rest = spec.partition("@")
+        if not rest and "/" in zone:  # "KST/4h"
+            zone, _, length = zone.partition("/")
+            rest = "00:00/" + length
+        m = _SESSION_RE.match(_ALIASES.get(zone, zone) + "@" + (rest or "00:00"))
+        if not m:
+            raise ValueError(f"세션 형식 오류: {text} (예: KST, +09:00@09:00, UTC@00:00/4h)")
+        sign = -1 if m.group(1) == "-" else 1
+        offset = sign * (int(m.group(2)) * 60 + int(m.group(3)))
+        start = int(m.group(4)) * 60 + int(m.group(5))
+        length_ms = DAY_MS
+        if m.group(6):
+            length_ms = int(m.group(6)) * (3_600_000 if m.group(7) == "H" else DAY_MS)
+        return cls(offset, start, length_ms)
+
+    @property
+    def key(self) -> str:
+        sign = "m" if self.offset_min < 0 else "p"
+        off = abs(self.offset_min)
+        return f"utc{sign}{off // 60:02d}{off % 60:02d}_{self.start_min // 60:02d}{self.start_min % 60:02d}_{self.length_ms // 60_000}m"
+
+    @property
+    def shift_ms(self) -> int:
+        """UTC 시각 + shift_ms 를 length 로 나눈 몫 = 세션 번호"""
+        return (self.offset_min - self.start_min) * 60_000
+
+    def session_start(self, index: np.ndarray) -> np.ndarray:
+        return index * self.length_ms - self.shift_ms
+
+    def label_day(self, start_ms: int) -> int:
+        """세션 시작 시각의 현지 날짜 (epoch-day)"""
+        return (int(start_ms) + self.offset_min * 60_000) // DAY_MS
+
+    def label(self, start_ms: int) -> str:
+        return day_str(self.label_day(start_ms))
+
+
+def resample(
+    open_time: np.ndarray, o: np.ndarray, h: np.ndarray, l: np.ndarray, c: np.ndarray, v: np.ndarray,
+    session: Session, step_ms: int, include_partial: bool = False, now_ms: Optional[int] = None,
+) -> Dict[str, np.ndarray]:
+    """정렬된 분봉 배열 → 세션 봉 배열 (FIELDS)"""
+    if len(open_time) == 0:
+        return {k: np.empty(0, dtype=np.int64 if k in ("openTime", "candles") else np.float64) for k in FIELDS}
+    idx = (open_time + session.shift_ms) // session.length_ms
+    starts = np.flatnonzero(np.r_[True, idx[1:] != idx[:-1]])
+    bars = {
+        "openTime": session.session_start(idx[starts]).astype(np.int64),
+        "open": o[starts],
+        "high": np.maximum.reduceat(h, starts),
+        "low": np.minimum.reduceat(l, starts),
+        "close": c[np.r_[starts[1:] - 1, len(c) - 1]],
+        "volume": np.add.reduceat(v, starts),
+        "candles": np.diff(np.r_[starts, len(open_time)]).astype(np.int64),
+    }
+    if not include_partial:
+        now_ms = now_ms if now_ms is not None else int(datetime.now(timezone.utc).timestamp() * 1000)
+        last_end = bars["openTime"][-1] + session.length_ms
+        last_covered = open_time[-1] + step_ms
+        if last_end > now_ms or last_covered < last_end:
+            bars = {k: a[:-1] for k, a in bars.items()}
+    return bars
+
+
+def to_engine_ohlc(bars: Dict[str, np.ndarray], session: Session) -> List[Dict[str, Any]]:
+    """run_phase1_5_simulation 입력 (closeTime 의 UTC 날짜 = 세션 라벨). 엔진이 날짜 단위라 1일 세션만"""
+    if session.length_ms != DAY_MS:
+        raise ValueError("Phase 1.5 엔진 입력은 1일 세션만 지원합니다")
+    out = []
+    for i in range(len(bars["openTime"])):
+        start = int(bars["openTime"][i])
+        label_ms = session.label_day(start) * DAY_MS
+        out.append({
+            "openTime": start,
+            "open": float(bars["open"][i]), "high": float(bars["high"][i]),
+            "low": float(bars["low"][i]), "close": float(bars["close"][i]),
+            "volume": float(bars["volume"][i]),
+            "closeTime": label_ms + DAY_MS - 1,
+            "candles": int(bars["candles"][i]),
+        })
+    return out
+
+
+class SessionBarCache:
+    def __init__(self, store: KlineStore, root: str = DEFAULT_CACHE):
+        self.store = store
+        self.root = pathlib.Path(root) / store.interval
+
+    def _path(self, symbol: str, session: Session) -> pathlib.Path:
+        return self.root / session.key / f"{symbol.upper()}.npz"
+
+    def _source_stamp(self, symbol: str) -> np.ndarray:
+        st = os.stat(self.store.path(symbol))
+        return np.array([st.st_size, st.st_mtime_ns], dtype=np.int64)
+
+    def _load_source(self, symbol: str) -> Dict[str, np.ndarray]:
+        import pandas as pd
+
+        df = pd.read_csv(self.store.path(symbol), usecols=["openTime", "open", "high", "low", "close", "volume"])
+        df = df.drop_duplicates("openTime", keep="last").sort_values("openTime")
+        return {col: df[col].to_numpy(np.int64 if col == "openTime" else np.float64) for col in df.columns}
+
+    def bars(self, symbol: str, session: Session, include_partial: bool = False) -> Dict[str, np.ndarray]:
+        """캐시된 세션 봉 (원본 분봉이 바뀌었으면 다시 집계). 원본이 없으면 FileNotFoundError"""
+        path = self._path(symbol, session)
+        stamp = self._source_stamp(symbol)
+        if path.exists() and not include_partial:
+            with np.load(path) as cached:
+                if np.array_equal(cached["source"], stamp):
+                    return {k: cached[k] for k in FIELDS}
+        src = self._load_source(symbol)
+        bars = resample(
+            src["openTime"], src["open"], src["high"], src["low"], src["close"], src["volume"],
+            session, self.store.step_ms, include_partial,
+        )
+        if not include_partial:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp.npz")
+            np.savez(tmp, source=stamp, **bars)
+            os.replace(tmp, path)
+        return bars
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+시점 상태 조회 (as-of) — 주기적 체크포인트 + 일자 인덱스
+
+  state_as_of("ARBUSDT", "2024-08-04")   → 그날 마감 EngineState
+      .mode / .position / .stage / .H / .L / .cutoff / .allowed_count() / .forbidden_count()
+
+- 인덱스 = core.compact_debug 형식 (일자 축 + OHLC + CHECKPOINT_DAYS 일마다 엔진 상태)
+  조회: 일자 축 이진 탐색 O(log n) → 직전 체크포인트 복원 → 최대 CHECKPOINT_DAYS 캔들 재생
+- 압축 디버그(.npz)는 그 자체가 인덱스 (빌드 때 기록됨)
+- CSV 디버그는 cache/state_index/<BASE>.npz
+    auto_debug_builder 가 CSV 를 쓸 때 같은 엔진 입력으로 함께 기록 (record)
+    없거나 CSV 크기/수정 시각이 바뀌었으면 CSV 의 OHLC 로 다시 만든다
+- 장중 모니터가 D일에 알고 있던 확정 상태 = state_as_of(symbol, D-1) (전일 마감 스냅샷으로 시드)
+"""
+from __future__ import annotations
+
+import pathlib
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from core.array_engine import ArrayEngine
+from core.compact_debug import CHECKPOINT_DAYS, CompactDebug, Day, find_debug, is_compact, ohlc_from_rows, read_rows
+from core.phase1_5_state import EngineState
+
+DEFAULT_DEBUG_DIR = "debug"
+DEFAULT_CACHE = "cache/state_index"
+
+
+def _base(symbol: str) -> str:
+    s = symbol.strip().upper()
+    return s[: -len("USDT")] if s.endswith("USDT") else s
+
+
+def _stamp(path: pathlib.Path) -> Tuple[int, int]:
+    st = path.stat()
+    return st.st_size, st.st_mtime_ns
+
+
+class StateIndex:
+    def __init__(self, debug_dir: str = DEFAULT_DEBUG_DIR, cache: str = DEFAULT_CACHE, checkpoint_days: int = CHECKPOINT_DAYS):
+        self.debug_dir = pathlib.Path(debug_dir)
+        self.cache_dir = pathlib.Path(cache)
+        self.checkpoint_days = checkpoint_days
+        self._loaded: Dict[str, Tuple[Tuple[pathlib.Path, Tuple[int, int]], Optional[CompactDebug]]] = {}
+        self._lock = threading.Lock()
+
+    def cache_path(self, symbol: str) -> pathlib.Path:
+        return self.cache_dir / f"{_base(symbol)}.npz"
+
+    # ----- 기록 -----
+
+    def record(self, symbol: str, ohlc: List[Dict[str, Any]], csv_path: pathlib.Path) -> CompactDebug:
+        """디버그 CSV 를 쓴 직후 같은 엔진 입력으로 체크포인트 인덱스 저장"""
+        engine = ArrayEngine(capacity=len(ohlc) + len(ohlc) // 4).run(ohlc)
+        packed = CompactDebug.from_engine(symbol, engine, self.checkpoint_days)
+        packed.save(self.cache_path(symbol), source=np.array(_stamp(csv_path), dtype=np.int64))
+        return packed
+
+    def _from_csv(self, symbol: str, csv_path: pathlib.Path, stamp: Tuple[int, int]) -> Optional[CompactDebug]:
+        cached = self.cache_path(symbol)
+        if cached.exists():
+            with np.load(cached) as z:
+                fresh = "source" in z.files and tuple(z["source"].tolist()) == stamp
+            if fresh:
+                return CompactDebug.load(cached)
+        ohlc = ohlc_from_rows(read_rows(csv_path))
+        if not ohlc:
+            return None
+        return self.record(symbol, ohlc, csv_path)
+
+    # ----- 조회 -----
+
+    def index(self, symbol: str) -> Optional[CompactDebug]:
+        """심볼의 체크포인트 인덱스 (디버그 파일이 바뀌지 않았으면 프로세스 내 재사용)"""
+        base = _base(symbol)
+        path = find_debug(self.debug_dir, base)
+        if not path.exists():
+            return None
+        key = (path, _stamp(path))
+        with self._lock:
+            hit = self._loaded.get(base)
+            if hit is not None and hit[0] == key:
+                return hit[1]
+            packed = CompactDebug.load(path) if is_compact(path) else self._from_csv(base + "USDT", path, key[1])
+            self._loaded[base] = (key, packed)
+            return packed
+
+    def state_as_of(self, symbol: str, date: Day) -> Optional[EngineState]:
+        """date(포함) 이전 마지막 일자의 마감 상태. 디버그 파일이 없거나 첫 일자보다 이르면 None"""
+        packed = self.index(symbol)
+        return packed.state_as_of(date) if packed is not None else None
+
+
+_INDEX: Optional[StateIndex] = None
+
+
+def state_index() -> StateIndex:
+    """프로세스 공용 인덱스 (debug/ + cache/state_index)"""
+    global _INDEX
+    if _INDEX is None:
+        _INDEX = StateIndex()
+    return _INDEX
+
+
+def state_as_of(symbol: str, date: Day) -> Optional[EngineState]:
+    return state_index().state_as_of(symbol, date)
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Binance 심볼 가용성 인덱스 (exchangeInfo 1회 일괄 조회 + TTL 캐시)
+
+- pair → status / base / quote / tickSize / listed(상장일)
+- 캐시 파일: cache/exchange_info.json (기본 TTL 6시간, OMG_SYMBOL_INDEX_TTL 초)
+- 조회 실패 시 만료된 캐시라도 사용, 캐시도 없으면 available=False → 필터가 전부 통과시킨다
+  (인덱스 장애가 일일 빌드를 막지 않도록)
+
+사용 예:
+  idx = symbol_index()
+  idx.is_trading("BTCUSDT")                      # O(1)
+  ok, rejected = idx.filter_tradable(symbols)    # rejected: {pair: 사유}
+  idx.resolve("ADA")                             # "ADAUSDT" 또는 None
+"""
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core import http_client
+from core.timeaxis import ms_str
+
+BINANCE_BASE = "https://api.binance.com"
+DEFAULT_CACHE = "cache/exchange_info.json"
+DEFAULT_TTL_SEC = 6 * 3600
+QUOTES = ("USDT",)
+
+
+@dataclass
+class SymbolInfo:
+    symbol: str
+    status: str
+    base: str
+    quote: str
+    tick_size: Optional[float] = None
+    listed: Optional[str] = None  # YYYY-MM-DD (onboardDate 또는 빌드 중 관측한 첫 일봉)
+
+    @property
+    def trading(self) -> bool:
+        return self.status == "TRADING"
+
+
+def _parse_exchange_info(data: Dict) -> Dict[str, SymbolInfo]:
+    out: Dict[str, SymbolInfo] = {}
+    for s in data.get("symbols", []):
+        tick = next(
+            (float(f["tickSize"]) for f in s.get("filters", []) if f.get("filterType") == "PRICE_FILTER" and f.get("tickSize")),
+            None,
+        )
+        listed = None
+        if s.get("onboardDate"):
+            listed = ms_str(s["onboardDate"])
+        out[s["symbol"]] = SymbolInfo(
+            symbol=s["symbol"],
+            status=s.get("status", ""),
+            base=s.get("baseAsset", ""),
+            quote=s.get("quoteAsset", ""),
+            tick_size=tick,
+            listed=listed,
+        )
+    return out
+
+
+class SymbolIndex:
+    def __init__(self, path: str = DEFAULT_CACHE, ttl_sec: Optional[float] = None):
+        self.path = pathlib.Path(path)
+        self.ttl_sec = float(ttl_sec if ttl_sec is not None else os.environ.get("OMG_SYMBOL_INDEX_TTL", DEFAULT_TTL_SEC))
+        self.fetched_at = 0.0
+        self._symbols: Dict[str, SymbolInfo] = {}
+        self._listed: Dict[str, str] = {}  # 관측한 상장일 (exchangeInfo 에 없을 때)
+        self._lock = threading.Lock()
+
+    # ----- 로드 -----
+
+    @property
+    def available(self) -> bool:
+        return bool(self._symbols)
+
+    @property
+    def age_sec(self) -> float:
+        return time.time() - self.fetched_at if self.fetched_at else float("inf")
+
+    def _read_cache(self) -> bool:
+        if not self.path.exists():
+            return False
+        try:
+            cached = json.loads(self.path.read_text(encoding="utf-8"))
+            self._symbols = {k: SymbolInfo(**v) for k, v in cached["symbols"].items()}
+            self._listed = dict(cached.get("listed", {}))
+            self.fetched_at = float(cached["fetched_at"])
+            return True
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"[심볼 인덱스] 캐시 읽기 실패 ({self.path}): {e}")
+            return False
+
+    def _write_cache(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({
+            "fetched_at": self.fetched_at,
+            "symbols": {k: asdict(v) for k, v in self._symbols.items()},
+            "listed": self._listed,
+        }, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def refresh(self) -> bool:
+        """exchangeInfo 일괄 조회 (weight 20, 요청 1회)"""
+        try:
+            data = http_client.get_json(f"{BINANCE_BASE}/api/v3/exchangeInfo", timeout=20)
+        except Exception as e:
+            print(f"[심볼 인덱스] exchangeInfo 조회 실패: {e}")
+            return False
+        self._symbols = _parse_exchange_info(data)
+        self.fetched_at = time.time()
+        self._write_cache()
+        trading = sum(1 for s in self._symbols.values() if s.trading)
+        print(f"[심볼 인덱스] {len(self._symbols)}개 페어 (TRADING {trading}개) → {self.path}")
+        return True
+
+    def ensure_fresh(self) -> "SymbolIndex":
+        with self._lock:
+            if not self._symbols:
+                self._read_cache()
+            if self.age_sec > self.ttl_sec and not self.refresh() and self._symbols:
+                print(f"[심볼 인덱스] 만료된 캐시 사용 ({self.age_sec / 3600:.1f}시간 경과)")
+        return self
+
+    # ----- 조회 -----
+
+    def get(self, pair: str) -> Optional[SymbolInfo]:
+        info = self._symbols.get(pair.upper())
+        if info is not None and info.listed is None and info.symbol in self._listed:
+            info.listed = self._listed[info.symbol]
+        return info
+
+    def __contains__(self, pair: str) -> bool:
+        return pair.upper() in self._symbols
+
+    def is_trading(self, pair: str) -> bool:
+        info = self._symbols.get(pair.upper())
+        return info is not None and info.trading
+
+    def resolve(self, base_or_pair: str, quotes: Iterable[str] = QUOTES) -> Optional[str]:
+        """베이스 심볼(ADA) 또는 페어(ADAUSDT) → 거래 가능한 페어"""
+        s = base_or_pair.strip().upper()
+        if self.is_trading(s):
+            return s
+        return next((s + q for q in quotes if self.is_trading(s + q)), None)
+
+    def pairs(self, quote: str = "USDT", trading_only: bool = True) -> List[SymbolInfo]:
+        return sorted(
+            (s for s in self._symbols.values() if s.quote == quote and (s.trading or not trading_only)),
+            key=lambda s: s.symbol,
+        )
+
+    def rejection(self, pair: str) -> Optional[str]:
+        """거래 불가 사유 (거래 가능하거나 인덱스가 없으면 None)"""
+        if not self.available:
+            return None
+        info = self._symbols.get(pair.upper())
+        if info is None:
+            return "미상장"
+        if not info.trading:
+            return f"상태 {info.status}"
+        return None
+
+    def filter_tradable(self, pairs: Iterable[str]) -> Tuple[List[str], Dict[str, str]]:
+        ok: List[str] = []
+        rejected: Dict[str, str] = {}
+        for p in pairs:
+            reason = self.rejection(p)
+            if reason is None:
+                ok.append(p)
+            else:
+                rejected[p] = reason
+        return ok, rejected
+
+    def note_listing(self, pair: str, date: str) -> None:
+        """exchangeInfo 에 상장일이 없는 페어의 첫 일봉 날짜 기록 (다음 캐시 저장 시 유지)"""
+        pair = pair.upper()
+        if pair in self._symbols and self._listed.get(pair) != date:
+            with self._lock:
+                self._listed[pair] = date
+                if self.fetched_at:
+                    self._write_cache()
+
+
+_INDEX: Optional[SymbolIndex] = None
+
+
+def symbol_index() -> SymbolIndex:
+    """프로세스 공용 인덱스 (TTL 지나면 다음 호출 시 갱신)"""
+    global _INDEX
+    if _INDEX is None:
+        _INDEX = SymbolIndex()
+    return _INDEX.ensure_fresh()
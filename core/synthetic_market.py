@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+결정적(seed 고정) 합성 일봉 생성기 — 오프라인 벤치마크/동등성 검증용
+
+- 기본 흐름: GBM (일간 로그수익률 = drift + sigma × N(0,1))
+- 급락 구간(crash): 수일~수십일에 걸쳐 -45% ~ -92%  → wait 진입, B1~B7 체결, STOP LOSS(-81%)
+- 반등 구간(rebound): +100% ~ +250%                → SELL, RESTART(+98.5%)
+- 같은 (symbol, seed) 는 항상 같은 캔들을 만든다 (zlib.crc32 로 심볼별 seed 파생)
+
+반환 형식은 get_binance_1d_ohlc_5y 와 동일한 dict 리스트
+  {"openTime", "open", "high", "low", "close", "volume", "closeTime"}
+"""
+from __future__ import annotations
+
+import datetime as dt
+import zlib
+from typing import Any, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from core.timeaxis import DAY_MS
+DEFAULT_START = "2019-01-01"
+
+
+def symbol_seed(symbol: str, seed: int = 0) -> int:
+    return (zlib.crc32(symbol.encode("utf-8")) ^ (seed * 0x9E3779B1)) & 0xFFFFFFFF
+
+
+def _apply_regimes(
+    logret: np.ndarray,
+    rng: np.random.Generator,
+    prob: float,
+    total_range: Tuple[float, float],
+    len_range: Tuple[int, int],
+) -> None:
+    """구간 시작일을 확률적으로 뽑고, 구간 전체 로그수익률을 일자별로 균등 배분"""
+    days = len(logret)
+    starts = np.flatnonzero(rng.random(days) < prob)
+    for i in starts:
+        k = int(rng.integers(len_range[0], len_range[1] + 1))
+        total = float(rng.uniform(*total_range))
+        logret[i:i + k] += np.log(total) / k
+
+
+def generate_ohlc(
+    days: int,
+    seed: int = 0,
+    symbol: str = "SYNUSDT",
+    start: str = DEFAULT_START,
+    start_price: float = 100.0,
+    drift: float = 0.0004,
+    sigma: float = 0.045,
+    crash_prob: float = 0.004,
+    rebound_prob: float = 0.005,
+) -> List[Dict[str, Any]]:
+    """days 개의 일봉 생성"""
+    rng = np.random.default_rng(symbol_seed(symbol, seed))
+    logret = drift - 0.5 * sigma * sigma + sigma * rng.standard_normal(days)
+    _apply_regimes(logret, rng, crash_prob, (0.08, 0.55), (3, 40))  # 잔존 비율 8~55%
+    _apply_regimes(logret, rng, rebound_prob, (2.0, 3.5), (5, 60))  # 2~3.5배
+
+    close = start_price * np.exp(np.cumsum(logret))
+    prev = np.concatenate(([start_price], close[:-1]))
+    open_ = prev * (1.0 + 0.002 * rng.standard_normal(days))
+    wick = np.abs(rng.standard_normal((2, days))) * sigma * 0.6
+    high = np.maximum(open_, close) * (1.0 + wick[0])
+    low = np.minimum(open_, close) * np.maximum(1.0 - wick[1], 0.05)
+    volume = np.exp(rng.normal(13.0, 1.0, days))
+
+    t0 = int(dt.datetime.fromisoformat(start).replace(tzinfo=dt.timezone.utc).timestamp() * 1000)
+    open_time = t0 + np.arange(days, dtype=np.int64) * DAY_MS
+    return [
+        {
+            "openTime": int(ot),
+            "open": float(o),
+            "high": float(h),
+            "low": float(lo),
+            "close": float(c),
+            "volume": float(v),
+            "closeTime": int(ot) + DAY_MS - 1,
+        }
+        for ot, o, h, lo, c, v in zip(open_time, open_, high, low, close, volume)
+    ]
+
+
+def to_klines(rows: List[Dict[str, Any]]) -> List[List[Any]]:
+    """Binance /api/v3/klines 응답 형식 (가격/수량은 문자열)"""
+    return [
+        [
+            r["openTime"], f"{r['open']:.8f}", f"{r['high']:.8f}", f"{r['low']:.8f}", f"{r['close']:.8f}",
+            f"{r['volume']:.8f}", r["closeTime"], f"{r['volume'] * r['close']:.8f}", 0, "0", "0", "0",
+        ]
+        for r in rows
+    ]
+
+
+def synthetic_symbols(n: int) -> List[str]:
+    return [f"SYN{i:05d}USDT" for i in range(n)]
+
+
+def synthetic_universe(n: int, days: int, seed: int = 0, **kwargs: Any) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    """(symbol, ohlc) 를 하나씩 생성 (메모리에 전체를 올리지 않음)"""
+    for sym in synthetic_symbols(n):
+        yield sym, generate_ohlc(days, seed=seed, symbol=sym, **kwargs)
+
+
+def event_counts(csv_rows: List[List[str]], event_col: int = 8) -> Dict[str, int]:
+    """디버그 CSV 행 → 이벤트 종류별 건수 (BUY/ADD/SELL/STOP LOSS/RESTART)"""
+    counts: Dict[str, int] = {}
+    for row in csv_rows:
+        evt = row[event_col] if len(row) > event_col else ""
+        if not evt:
+            continue
+        kind = next((k for k in ("BUY", "ADD", "SELL", "STOP LOSS", "RESTART") if evt.startswith(k)), evt)
+        counts[kind] = counts.get(kind, 0) + 1
+    return counts
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+공통 시간축 — 저장/조인/엔진 상태는 정수, 문자열은 내보낼 때만
+
+  epoch-ms  (int64)  Binance openTime/closeTime 그대로
+  epoch-day (int32)  1970-01-01(UTC) 부터의 일수 = ms // DAY_MS   (2025-10-09 → 20370)
+
+- 캔들의 날짜 = 시가(openTime)의 UTC 날짜. openTime 이 없으면 closeTime 의 UTC 날짜
+  (Binance 일봉은 UTC 00:00 = KST 09:00 에 시작하므로 KST 기준으로 봐도 같은 날짜)
+- day_str()/parse_day() 는 캐시됨: 전체 스윕에서도 날짜당 1회만 datetime 을 만든다
+- 배열 버전(days_of_ms / day_strs / parse_days)은 numpy datetime64[D] 로 한 번에 변환
+- align(): 여러 심볼의 epoch-day 배열 → 공통 축 + 심볼별 위치 (크로스 심볼 정렬)
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Dict, Iterable, Sequence, Tuple, Union
+
+import numpy as np
+
+DAY_MS = 86_400_000
+KST_OFFSET_MS = 9 * 3_600_000
+DAY_DTYPE = np.int32
+MS_DTYPE = np.int64
+
+
+# ===== 스칼라 =====
+
+def day_of_ms(ms: int) -> int:
+    return int(ms) // DAY_MS
+
+
+def day_to_ms(day: int) -> int:
+    """epoch-day 의 UTC 00:00 (epoch-ms)"""
+    return int(day) * DAY_MS
+
+
+@lru_cache(maxsize=None)
+def day_str(day: int) -> str:
+    return datetime.fromtimestamp(int(day) * 86_400, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+@lru_cache(maxsize=None)
+def parse_day(text: str) -> int:
+    """'YYYY-MM-DD' (뒤에 시각이 붙어 있으면 무시) → epoch-day"""
+    return int(np.datetime64(text[:10], "D").astype(np.int64))
+
+
+def ms_str(ms: int) -> str:
+    return day_str(int(ms) // DAY_MS)
+
+
+def today(now_ms: Union[int, None] = None) -> int:
+    """현재 UTC epoch-day"""
+    if now_ms is None:
+        now_ms = int(datetime.now(timezone.utc).timestamp() * 1000)
+    return int(now_ms) // DAY_MS
+
+
+def candle_day(row: Dict) -> int:
+    ms = row["openTime"] if row.get("openTime") is not None else row["closeTime"]
+    return int(ms) // DAY_MS
+
+
+# ===== 배열 =====
+
+def days_of_ms(ms: Union[Sequence[int], np.ndarray]) -> np.ndarray:
+    return (np.asarray(ms, dtype=MS_DTYPE) // DAY_MS).astype(DAY_DTYPE)
+
+
+def day_strs(days: Union[Sequence[int], np.ndarray]) -> np.ndarray:
+    return np.datetime_as_string(np.asarray(days, dtype=np.int64).astype("datetime64[D]"), unit="D")
+
+
+def parse_days(texts: Iterable[str]) -> np.ndarray:
+    """문자열 날짜 배열 → epoch-day 배열 (pd.to_datetime 재파싱 대신)"""
+    arr = np.asarray(list(texts) if not isinstance(texts, np.ndarray) else texts)
+    if arr.size == 0:
+        return np.empty(0, dtype=DAY_DTYPE)
+    return np.asarray(arr.astype("U10"), dtype="datetime64[D]").astype(np.int64).astype(DAY_DTYPE)
+
+
+def years(days: np.ndarray) -> np.ndarray:
+    return np.asarray(days, dtype=np.int64).astype("datetime64[D]").astype("datetime64[Y]").astype(np.int64) + 1970
+
+
+def months(days: np.ndarray) -> np.ndarray:
+    """'YYYY-MM' 문자열 배열"""
+    return np.datetime_as_string(np.asarray(days, dtype=np.int64).astype("datetime64[D]").astype("datetime64[M]"), unit="M")
+
+
+def align(series: Dict[str, np.ndarray]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """{심볼: epoch-day 배열(정렬)} → (공통 축, {심볼: 축에서의 위치})"""
+    if not series:
+        return np.empty(0, dtype=DAY_DTYPE), {}
+    axis = np.unique(np.concatenate([np.asarray(d, dtype=DAY_DTYPE) for d in series.values()]))
+    return axis, {sym: np.searchsorted(axis, d).astype(np.int64) for sym, d in series.items()}
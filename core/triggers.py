@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+통합 트리거 테이블 (BUY / SELL / STOP LOSS / RESTART)
+
+심볼별 Phase 1.5 상태(EngineState)에서 네 종류의 가격 트리거를 미리 계산해
+하나의 테이블로 보관하고, 가격 업데이트마다 한 번의 순회로 평가한다.
+
+- BUY      : 허용된 B1~B7 (금지 레벨 제외, 보유 중이면 현재 stage 보다 깊은 레벨만)  가격 ≤ 트리거
+- SELL     : 보유 중일 때 L × (1 + SELL_THRESHOLDS[stage]%)                        가격 ≥ 트리거
+- STOP     : 보유 중일 때 H × 0.19 (81% 하락)                                      가격 ≤ 트리거
+- RESTART  : wait 모드에서 L × 1.985 (저점 대비 +98.5%)                             가격 ≥ 트리거
+
+L 이 새 저점을 만들면 SELL/RESTART 가격만 제자리에서 갱신(on_new_low),
+mode/position/stage/H/cutoff 가 바뀌면 해당 심볼만 재컴파일(sync).
+
+fixed_point=True (또는 OMG_FIXED_POINT=1): tickSize 를 아는 심볼은 트리거 가격을 틱 격자에 맞춘
+정수(core.fixed_point)로도 보관하고, 평가 때 현재가를 한 번 정수로 바꿔 정수끼리 통과 여부를 비교한다.
+(BUY/STOP 은 내림, SELL/RESTART 는 올림)
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from core.fixed_point import TickScale, enabled as fixed_point_enabled, scale_for
+from core.phase1_5_core import SELL_THRESHOLDS
+from core.phase1_5_state import LEVEL_NAMES, RESTART_MULT, STOP_LOSS_RATIO, EngineState
+
+BUY = "BUY"
+SELL = "SELL"
+STOP = "STOP"
+RESTART = "RESTART"
+
+# 트리거 종류별 알림 제목 (텔레그램/Slack 공용)
+ALERT_TITLES = {
+    BUY: "매수 목표 접근 알림",
+    SELL: "매도 목표 접근 알림",
+    STOP: "손절선 접근 알림",
+    RESTART: "재시작 기준 접근 알림",
+}
+
+DOWN = -1  # 가격이 트리거 이하로 내려오면 발동
+UP = 1  # 가격이 트리거 이상으로 올라가면 발동
+
+
+@dataclass
+class Trigger:
+    kind: str  # BUY / SELL / STOP / RESTART
+    name: str  # "B3", "S2", "STOP LOSS", "RESTART"
+    price: float
+    direction: int  # DOWN / UP
+    ticks: Optional[int] = None  # 고정소수점 모드의 정수 가격
+
+
+@dataclass
+class TriggerHit:
+    symbol: str
+    trigger: Trigger
+    current_price: float
+    divergence: float  # 현재가 기준 트리거까지 거리 (%)
+    hit: bool  # 직전 평가 이후 트리거 가격을 통과했는지 여부
+
+
+class TriggerTable:
+    """심볼별 트리거 목록 + 상태 시그니처"""
+
+    def __init__(self, near_pct: float = 5.0, fixed_point: bool = False):
+        self.near_pct = near_pct
+        self.fixed_point = fixed_point_enabled(fixed_point)
+        self._triggers: Dict[str, List[Trigger]] = {}
+        self._signature: Dict[str, Tuple] = {}
+        self._L: Dict[str, Optional[float]] = {}
+        self._stage: Dict[str, Optional[int]] = {}
+        self._last_price: Dict[str, float] = {}
+        self._scale: Dict[str, Optional[TickScale]] = {}
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._triggers
+
+    def __len__(self) -> int:
+        return len(self._triggers)
+
+    def triggers(self, symbol: str) -> List[Trigger]:
+        return self._triggers.get(symbol, [])
+
+    def scale(self, symbol: str) -> Optional[TickScale]:
+        """고정소수점 모드에서 심볼의 TickScale (tickSize 를 모르면 None → float 비교)"""
+        if not self.fixed_point:
+            return None
+        if symbol not in self._scale:
+            self._scale[symbol] = scale_for(symbol)
+        return self._scale[symbol]
+
+    @staticmethod
+    def _snap(trg: Trigger, scale: Optional[TickScale]) -> Trigger:
+        if scale is not None:
+            v = scale.to_int(trg.price)
+            trg.ticks = scale.floor(v) if trg.direction == DOWN else scale.ceil(v)
+            trg.price = scale.to_float(trg.ticks)
+        return trg
+
+    @staticmethod
+    def _state_signature(st: EngineState) -> Tuple:
+        return (st.mode, st.position, st.stage, st.H, st.cutoff)
+
+    # ----- 컴파일 -----
+
+    def compile(self, symbol: str, st: EngineState) -> None:
+        """상태로부터 심볼의 트리거 목록을 새로 생성"""
+        triggers: List[Trigger] = []
+        if st.lv is not None:
+            deepest = st.stage if st.position and st.stage else 0
+            for idx, nm in enumerate(LEVEL_NAMES, start=1):
+                px = st.lv[nm]
+                if idx > deepest and not st.is_forbidden(px):
+                    triggers.append(Trigger(BUY, nm, px, DOWN))
+        if st.position and st.stage is not None:
+            if st.L is not None and st.stage in SELL_THRESHOLDS:
+                sell_px = st.L * (1.0 + SELL_THRESHOLDS[st.stage] / 100.0)
+                triggers.append(Trigger(SELL, f"S{st.stage}", sell_px, UP))
+            if st.H is not None:
+                triggers.append(Trigger(STOP, "STOP LOSS", st.H * STOP_LOSS_RATIO, DOWN))
+        if st.mode == "wait" and st.L is not None:
+            triggers.append(Trigger(RESTART, "RESTART", st.L * RESTART_MULT, UP))
+
+        scale = self.scale(symbol)
+        self._triggers[symbol] = [self._snap(t, scale) for t in triggers]
+        self._signature[symbol] = self._state_signature(st)
+        self._L[symbol] = st.L
+        self._stage[symbol] = st.stage
+
+    def on_new_low(self, symbol: str, L: float) -> None:
+        """L 갱신 시 SELL/RESTART 가격만 제자리 갱신"""
+        self._L[symbol] = L
+        stage = self._stage.get(symbol)
+        scale = self.scale(symbol)
+        for trg in self._triggers.get(symbol, []):
+            if trg.kind == SELL and stage in SELL_THRESHOLDS:
+                trg.price = L * (1.0 + SELL_THRESHOLDS[stage] / 100.0)
+                self._snap(trg, scale)
+            elif trg.kind == RESTART:
+                trg.price = L * RESTART_MULT
+                self._snap(trg, scale)
+
+    def sync(self, symbol: str, st: EngineState) -> None:
+        """상태 변화 반영: 구조가 바뀌었으면 재컴파일, L 만 바뀌었으면 부분 갱신"""
+        if self._signature.get(symbol) != self._state_signature(st):
+            self.compile(symbol, st)
+        elif st.L is not None and st.L != self._L.get(symbol):
+            self.on_new_low(symbol, st.L)
+
+    def next_buy(self, symbol: str) -> Optional[Trigger]:
+        """가장 얕은 허용 BUY 트리거 (= 다음 매수 목표)"""
+        for trg in self._triggers.get(symbol, []):
+            if trg.kind == BUY:
+                return trg
+        return None
+
+    def remove(self, symbol: str) -> None:
+        for d in (self._triggers, self._signature, self._L, self._stage, self._last_price, self._scale):
+            d.pop(symbol, None)
+
+    # ----- 평가 -----
+
+    def evaluate(self, symbol: str, price: float, near_pct: Optional[float] = None) -> List[TriggerHit]:
+        """
+        가격 1개로 심볼의 전체 트리거를 한 번에 평가.
+        직전 가격 → 현재 가격 사이에 트리거를 통과(hit)했거나
+        near_pct 이내로 접근한 항목만 반환.
+        """
+        near = self.near_pct if near_pct is None else near_pct
+        prev = self._last_price.get(symbol)
+        self._last_price[symbol] = price
+        scale = self._scale.get(symbol)
+        if scale is not None:
+            # 정수 비교: 현재가/직전가를 한 번만 변환
+            p_t = scale.to_int(price)
+            prev_t = scale.to_int(prev) if prev is not None else None
+        hits: List[TriggerHit] = []
+        for trg in self._triggers.get(symbol, []):
+            if trg.price <= 0:
+                continue
+            divergence = abs(price - trg.price) / trg.price * 100.0
+            if prev is None:
+                hit = False
+            elif trg.ticks is not None:
+                hit = prev_t > trg.ticks >= p_t if trg.direction == DOWN else prev_t < trg.ticks <= p_t
+            elif trg.direction == DOWN:
+                hit = prev > trg.price >= price
+            else:
+                hit = prev < trg.price <= price
+            if hit or divergence <= near:
+                hits.append(TriggerHit(symbol, trg, price, divergence, hit))
+        return hits
+
+    def evaluate_all(self, prices: Dict[str, float], near_pct: Optional[float] = None) -> List[TriggerHit]:
+        hits: List[TriggerHit] = []
+        for symbol, price in prices.items():
+            hits.extend(self.evaluate(symbol, price, near_pct))
+        return hits
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+유니버스 스냅샷 저장소 (CoinGecko markets 페이지 캐시 + 버전 관리 + diff)
+
+- 스냅샷 = CoinGecko /coins/markets 원본 페이지들 + 선정된 유니버스(Top N 목록)
+- cache/universe/v00012_20261019T083000Z.json 처럼 버전/시각이 붙은 파일로 누적 저장
+- TTL(기본 30분, OMG_UNIVERSE_TTL 초) 안에서는 네트워크 호출 없이 최신 스냅샷 재사용
+  → get_top30_coins() 와 coin_analysis_excel 이 같은 페이지를 다시 받지 않는다
+- diff(): 이전 유니버스 대비 신규 편입 / 이탈 / 순위 변동
+  신규 편입만 전체 이력 백필이 필요하고, 이탈 심볼은 재빌드 없이 은퇴 처리할 수 있다
+- diff_since(consumer) / advance(consumer, version): 소비자(예: 일일 빌드)가 마지막으로 처리한 유니버스 이후의 diff
+  (cache/universe/cursor_<consumer>.json). 새 유니버스 버전이 없으면 None → 같은 편입/이탈을 반복 처리하지 않음
+
+사용 예:
+  store = universe_store()
+  snap = store.fresh()                 # TTL 안의 최신 스냅샷 또는 None
+  d = store.diff()                     # 최신 유니버스 vs 직전 유니버스
+  print(d.summary()); d.entered, d.exited, d.rank_changes
+"""
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_ROOT = "cache/universe"
+DEFAULT_TTL_SEC = 30 * 60
+KEEP_VERSIONS = 200  # save() 때마다 이보다 오래된 스냅샷 정리
+_FILE_RE = re.compile(r"^v(\d{5,})_(\d{8}T\d{6}Z)\.json$")
+
+
+@dataclass
+class Snapshot:
+    version: int
+    taken_at: float
+    pages: Dict[int, List[Dict[str, Any]]]
+    universe: Optional[List[Dict[str, Any]]] = None  # [{"Rank", "Symbol", "Name", "MarketCap(USD)"}]
+    path: Optional[pathlib.Path] = None
+
+    @property
+    def age_sec(self) -> float:
+        return time.time() - self.taken_at
+
+    def ranks(self) -> Dict[str, int]:
+        return {row["Symbol"]: int(row["Rank"]) for row in self.universe or []}
+
+
+@dataclass
+class UniverseDiff:
+    from_version: Optional[int]
+    to_version: int
+    entered: List[str] = field(default_factory=list)
+    exited: List[str] = field(default_factory=list)
+    rank_changes: Dict[str, Tuple[int, int]] = field(default_factory=dict)  # symbol → (이전, 현재)
+
+    def __bool__(self) -> bool:
+        return bool(self.entered or self.exited or self.rank_changes)
+
+    def summary(self) -> str:
+        if self.from_version is None:
+            return f"유니버스 v{self.to_version}: 이전 스냅샷 없음 (전체 {len(self.entered)}개 신규)"
+        head = f"유니버스 v{self.from_version} → v{self.to_version}: "
+        if not self:
+            return head + "변동 없음"
+        parts = []
+        if self.entered:
+            parts.append(f"편입 {len(self.entered)}개 ({', '.join(self.entered)})")
+        if self.exited:
+            parts.append(f"이탈 {len(self.exited)}개 ({', '.join(self.exited)})")
+        if self.rank_changes:
+            parts.append(f"순위 변동 {len(self.rank_changes)}개")
+        return head + ", ".join(parts)
+
+
+def diff_universe(old: Optional[Snapshot], new: Snapshot) -> UniverseDiff:
+    new_ranks = new.ranks()
+    if old is None:
+        return UniverseDiff(None, new.version, entered=list(new_ranks))
+    old_ranks = old.ranks()
+    return UniverseDiff(
+        from_version=old.version,
+        to_version=new.version,
+        entered=[s for s in new_ranks if s not in old_ranks],
+        exited=[s for s in old_ranks if s not in new_ranks],
+        rank_changes={s: (old_ranks[s], r) for s, r in new_ranks.items() if s in old_ranks and old_ranks[s] != r},
+    )
+
+
+class UniverseStore:
+    def __init__(self, root: str = DEFAULT_ROOT, ttl_sec: Optional[float] = None):
+        self.root = pathlib.Path(root)
+        self.ttl_sec = float(ttl_sec if ttl_sec is not None else os.environ.get("OMG_UNIVERSE_TTL", DEFAULT_TTL_SEC))
+        self._lock = threading.Lock()
+
+    # ----- 조회 -----
+
+    def versions(self) -> List[Tuple[int, pathlib.Path]]:
+        if not self.root.exists():
+            return []
+        found = []
+        for p in self.root.iterdir():
+            m = _FILE_RE.match(p.name)
+            if m:
+                found.append((int(m.group(1)), p))
+        return sorted(found)
+
+    @staticmethod
+    def _read(path: pathlib.Path) -> Snapshot:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+        return Snapshot(
+            version=int(raw["version"]),
+            taken_at=float(raw["taken_at"]),
+            pages={int(k): v for k, v in raw["pages"].items()},
+            universe=raw.get("universe"),
+            path=path,
+        )
+
+    def load(self, version: int) -> Snapshot:
+        for v, p in self.versions():
+            if v == version:
+                return self._read(p)
+        raise KeyError(f"유니버스 스냅샷 v{version} 없음")
+
+    def latest(self, with_universe: bool = False, before: Optional[int] = None) -> Optional[Snapshot]:
+        for v, p in reversed(self.versions()):
+            if before is not None and v >= before:
+                continue
+            try:
+                snap = self._read(p)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"[유니버스] 스냅샷 읽기 실패 ({p.name}): {e}")
+                continue
+            if not with_universe or snap.universe is not None:
+                return snap
+        return None
+
+    def fresh(self) -> Optional[Snapshot]:
+        """TTL 안의 최신 스냅샷 (없으면 None)"""
+        snap = self.latest()
+        if snap is not None and snap.age_sec <= self.ttl_sec:
+            return snap
+        return None
+
+    # ----- 저장 -----
+
+    def save(self, pages: Dict[int, List[Dict[str, Any]]], universe: Optional[List[Dict[str, Any]]] = None) -> Snapshot:
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            existing = self.versions()
+            version = existing[-1][0] + 1 if existing else 1
+            now = time.time()
+            stamp = datetime.fromtimestamp(now, tz=timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+            path = self.root / f"v{version:05d}_{stamp}.json"
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps({
+                "version": version,
+                "taken_at": now,
+                "pages": {str(k): v for k, v in sorted(pages.items())},
+                "universe": universe,
+            }, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, path)
+            self.prune()
+        return Snapshot(version, now, dict(pages), universe, path)
+
+    def diff(self, old_version: Optional[int] = None, new_version: Optional[int] = None) -> Optional[UniverseDiff]:
+        """유니버스 diff (기본: 최신 유니버스 vs 그 직전 유니버스). 유니버스 스냅샷이 없으면 None"""
+        new = self.load(new_version) if new_version else self.latest(with_universe=True)
+        if new is None or new.universe is None:
+            return None
+        if old_version:
+            old = self.load(old_version)
+        else:
+            old = self.latest(with_universe=True, before=new.version)
+        return diff_universe(old, new)
+
+    # ----- 소비자 커서 -----
+
+    def _cursor_path(self, consumer: str) -> pathlib.Path:
+        return self.root / f"cursor_{consumer}.json"
+
+    def diff_since(self, consumer: str) -> Optional[UniverseDiff]:
+        """consumer 가 마지막으로 처리한 유니버스 → 최신 유니버스 diff. 새 유니버스가 없으면 None
+        (커서가 없거나 그 스냅샷이 정리됐으면 직전 유니버스 기준)"""
+        new = self.latest(with_universe=True)
+        if new is None:
+            return None
+        try:
+            done = int(json.loads(self._cursor_path(consumer).read_text(encoding="utf-8"))["version"])
+        except (OSError, ValueError, KeyError):
+            done = None
+        if done is not None and done >= new.version:
+            return None
+        try:
+            old = self.load(done) if done is not None else None
+        except (KeyError, OSError, ValueError):
+            old = None
+        if old is None or old.universe is None:
+            old = self.latest(with_universe=True, before=new.version)
+        return diff_universe(old, new)
+
+    def advance(self, consumer: str, version: int) -> None:
+        """consumer 가 version 까지 처리했음을 기록"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self._cursor_path(consumer)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"version": version, "at": time.time()}), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def prune(self, keep: int = KEEP_VERSIONS) -> int:
+        """오래된 스냅샷 정리 (최근 keep 개 유지)"""
+        old = self.versions()[:-keep] if keep > 0 else []
+        for _, p in old:
+            p.unlink(missing_ok=True)
+        return len(old)
+
+
+_STORE: Optional[UniverseStore] = None
+
+
+def universe_store() -> UniverseStore:
+    global _STORE
+    if _STORE is None:
+        _STORE = UniverseStore()
+    return _STORE
@@ -0,0 +1,476 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+암호화폐 실시간 모니터 - 샤딩 모드 (1,000+ 심볼)
+
+구조:
+1. 심볼을 해시 링(가상 노드)으로 N개 워커 프로세스에 분할
+   - 샤드 ID 는 "host/index" 형식 → 추후 여러 호스트로 확장 시 링에 호스트만 추가
+   - 샤드 수가 바뀌어도 이동하는 심볼이 최소화됨 (재배치 계획 출력)
+2. 워커마다 자체 가격 조회(일괄 ticker 1회), 트리거 테이블, 중복 방지 이력 보유
+3. 코디네이터가 워커들의 알람을 하나의 알림 outbox(Queue)로 받아 텔레그램/Slack 전송
+   - 전송 결과를 워커별 ack 큐로 돌려줌 → 워커는 전송 성공 ack 를 받은 뒤에만 중복 방지 이력 기록
+     (실패/무응답이면 다음 사이클에 다시 알람)
+4. 워커별 부하(심볼 수, 사이클 시간, 알람 수)를 주기적으로 출력
+5. --all-usdt 는 디버그 파일이 있는 심볼만 활성 — --build-missing 이면 코디네이터가 없거나 오래된 심볼의
+   디버그 파일을 auto_debug_builder(압축 형식)로 배치 생성하고, 워커는 파일이 생기면 자동으로 시드
+
+실행 예시:
+  python crypto_monitor_shards.py --shards 4 --plan        # 분할/재배치 계획만 출력
+  python crypto_monitor_shards.py --shards 4 --all-usdt --build-missing   # Binance 전체 USDT 페어 모니터링
+"""
+
+import argparse
+import bisect
+import json
+import multiprocessing as mp
+import os
+import pathlib
+import queue
+import subprocess
+import sys
+import threading
+import time
+import zlib
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+
+from crypto_realtime_monitor import CryptoRealtimeMonitor
+from core import http_client
+from core.analysis_archive import DEFAULT_ROOT as ANALYSIS_ARCHIVE_ROOT, AnalysisArchive
+from core.change_feed import DEFAULT_ROOT as CHANGE_FEED_ROOT
+from core.compact_debug import debug_files, find_debug
+from core.symbol_index import symbol_index
+from core.alert_trace import AlertTrace, exchange_time_from_headers
+from core.live_state import LiveStateProjector, ProvisionalEvent
+from core.metrics import ALERTS_GENERATED, MONITOR_CYCLE_SECONDS, NOTIFICATION_QUEUE_DEPTH, start_metrics_server
+from core.universe_store import DEFAULT_ROOT as UNIVERSE_ROOT, UniverseStore
+
+BINANCE_BASE = "https://api.binance.com"
+VNODES = 64  # 샤드당 가상 노드 수
+PLAN_FILE = "shard_plan.json"
+STATS_PRINT_SEC = 300
+BUILDER = pathlib.Path(__file__).with_name("auto_debug_builder.py")
+BUILD_BATCH = 50  # auto_debug_builder 1회 실행당 심볼 수
+BUILD_MAX_AGE_SEC = 26 * 3600  # 이보다 오래된 디버그 파일은 다시 생성 (일일 빌드 대상은 그 전에 갱신됨)
+BUILD_INTERVAL_SEC = 6 * 3600
+ACK_TIMEOUT_SEC = 600  # 코디네이터 ack 가 이 시간 안에 없으면 미전송으로 보고 다시 알람
+
+
+# -----------------------------
+# 해시 링 / 분할 계획
+# -----------------------------
+def _hash(key: str) -> int:
+    # 프로세스 간 안정적인 해시 (내장 hash() 는 실행마다 달라짐)
+    return zlib.crc32(key.encode("utf-8"))
+
+
+class HashRing:
+    """가상 노드 기반 일관 해시 링"""
+
+    def __init__(self, shard_ids: List[str], vnodes: int = VNODES):
+        points = sorted((_hash(f"{sid}#{v}"), sid) for sid in shard_ids for v in range(vnodes))
+        self._keys = [p for p, _ in points]
+        self._owners = [sid for _, sid in points]
+
+    def owner(self, symbol: str) -> str:
+        i = bisect.bisect(self._keys, _hash(symbol)) % len(self._keys)
+        return self._owners[i]
+
+
+def make_shard_ids(n_shards: int, hosts: Optional[List[str]] = None) -> List[str]:
+    hosts = hosts or ["local"]
+    return [f"{host}/{i}" for host in hosts for i in range(n_shards)]
+
+
+def plan_shards(symbols: List[str], shard_ids: List[str]) -> Dict[str, List[str]]:
+    ring = HashRing(shard_ids)
+    plan: Dict[str, List[str]] = {sid: [] for sid in shard_ids}
+    for sym in sorted(set(symbols)):
+        plan[ring.owner(sym)].append(sym)
+    return plan
+
+
+def rebalance_moves(old_plan: Dict[str, List[str]], new_plan: Dict[str, List[str]]) -> List[Tuple[str, str, str]]:
+    """이전 계획 대비 이동하는 심볼 목록 [(symbol, from, to)]"""
+    old_owner = {sym: sid for sid, syms in old_plan.items() for sym in syms}
+    moves = []
+    for sid, syms in new_plan.items():
+        for sym in syms:
+            prev = old_owner.get(sym)
+            if prev is not None and prev != sid:
+                moves.append((sym, prev, sid))
+    return moves
+
+
+def load_plan(path: str = PLAN_FILE) -> Dict[str, List[str]]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("plan", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def save_plan(plan: Dict[str, List[str]], path: str = PLAN_FILE):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"updated_at": datetime.now().isoformat(timespec="seconds"), "plan": plan},
+                  f, ensure_ascii=False, indent=2)
+
+
+def print_plan(plan: Dict[str, List[str]], moves: List[Tuple[str, str, str]]):
+    total = sum(len(v) for v in plan.values())
+    print("=" * 60)
+    print(f"샤드 분할 계획: {len(plan)}개 샤드 / {total}개 심볼")
+    print("-" * 60)
+    for sid, syms in plan.items():
+        share = len(syms) / total * 100 if total else 0
+        print(f"{sid:<12} | {len(syms):>5}개 | {share:5.1f}% | {', '.join(syms[:5])}{' …' if len(syms) > 5 else ''}")
+    print("-" * 60)
+    print(f"재배치: {len(moves)}개 심볼 이동")
+    for sym, src, dst in moves[:20]:
+        print(f"  {sym:<10} {src} → {dst}")
+    if len(moves) > 20:
+        print(f"  … 외 {len(moves) - 20}개")
+    print("=" * 60)
+
+
+# -----------------------------
+# 유니버스
+# -----------------------------
+def list_usdt_symbols() -> List[str]:
+    """Binance 전체 USDT 현물 페어 (TRADING) — 베이스 심볼만 반환 (core.symbol_index 캐시)"""
+    index = symbol_index()
+    if not index.available:
+        raise RuntimeError("exchangeInfo 인덱스를 불러오지 못했습니다")
+    return sorted(s.base for s in index.pairs("USDT"))
+
+
+def list_debug_symbols(debug_dir: pathlib.Path) -> List[str]:
+    return list(debug_files(debug_dir))
+
+
+def stale_debug_symbols(debug_dir: pathlib.Path, symbols: List[str], max_age_sec: float = BUILD_MAX_AGE_SEC) -> List[str]:
+    """디버그 파일이 없거나 max_age_sec 보다 오래된 심볼"""
+    cutoff = time.time() - max_age_sec
+    out = []
+    for sym in symbols:
+        path = find_debug(debug_dir, sym)
+        if not path.exists() or path.stat().st_mtime < cutoff:
+            out.append(sym)
+    return out
+
+
+def build_missing(root_dir: pathlib.Path, symbols: List[str], stop: threading.Event):
+    """디버그 파일이 없거나 오래된 심볼을 auto_debug_builder 로 배치 생성 (BUILD_INTERVAL_SEC 마다 반복)"""
+    while not stop.is_set():
+        todo = stale_debug_symbols(root_dir / "debug", symbols)
+        if todo:
+            print(f"[빌드] 디버그 파일 없음/오래됨: {len(todo)}개 심볼 → {BUILD_BATCH}개씩 생성")
+        for i in range(0, len(todo), BUILD_BATCH):
+            if stop.is_set():
+                return
+            batch = todo[i:i + BUILD_BATCH]
+            cmd = [sys.executable, str(BUILDER), "--compact", "--symbols", *[f"{sym}USDT" for sym in batch]]
+            result = subprocess.run(cmd, cwd=root_dir, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+            if result.returncode != 0:
+                print(f"[빌드] 실패 (exit {result.returncode}): {result.stderr.strip()[-200:]}")
+            built = len(batch) - len(stale_debug_symbols(root_dir / "debug", batch))
+            print(f"[빌드] {i + len(batch)}/{len(todo)} — 이번 배치 {built}/{len(batch)}개 생성")
+        stop.wait(BUILD_INTERVAL_SEC)
+
+
+def load_coin_info(root_dir: pathlib.Path) -> Dict[str, Tuple[int, str]]:
+    """심볼 → (시총 순위, 코인명) — 최신 분석 run(core.analysis_archive) 위에 최신 CoinGecko 스냅샷(core.universe_store)"""
+    info: Dict[str, Tuple[int, str]] = {}
+    try:
+        archive = AnalysisArchive(str(root_dir / ANALYSIS_ARCHIVE_ROOT))
+        runs = archive.runs()
+        if len(runs):
+            cols = archive.run_rows(runs[-1])
+            for sym, rank, name in zip(cols["symbol"], cols["rank"], cols["name"]):
+                info[str(sym)] = (int(rank), str(name) or str(sym))
+    except Exception as e:
+        print(f"분석 이력에서 코인 정보 로드 실패: {e}")
+    try:
+        snap = UniverseStore(str(root_dir / UNIVERSE_ROOT)).latest()
+        latest: Dict[str, Tuple[int, str]] = {}
+        for page in (snap.pages.values() if snap else []):
+            for coin in page:
+                sym = str(coin.get("symbol") or "").upper()
+                rank = coin.get("market_cap_rank")
+                if sym and rank and (sym not in latest or rank < latest[sym][0]):  # 같은 티커는 상위 코인
+                    latest[sym] = (int(rank), coin.get("name") or sym)
+        info.update(latest)
+    except Exception as e:
+        print(f"유니버스 스냅샷에서 코인 정보 로드 실패: {e}")
+    return info
+
+
+# -----------------------------
+# 워커
+# -----------------------------
+class ShardMonitor(CryptoRealtimeMonitor):
+    """샤드 1개를 담당하는 모니터 — 알림은 직접 보내지 않고 outbox 로 전달"""
+
+    def __init__(self, shard_id: str, symbols: List[str], outbox, root_dir: pathlib.Path, acks=None):
+        safe_id = shard_id.replace("/", "_")
+        super().__init__(alert_history_file=f"alert_history_{safe_id}.json")
+        self.omg_dir = root_dir
+        self.shard_id = shard_id
+        self.symbols = symbols
+        self.outbox = outbox
+        self.acks = acks
+        self._pending: Dict[Tuple[str, str], float] = {}  # 전송 대기 중인 알람 (symbol, target) → 보낸 시각
+        self._debug_mtime = 0.0
+
+    def _debug_files_mtime(self) -> float:
+        paths = [self.debug_csv_path(sym) for sym in self.symbols]
+        paths.append(self.omg_dir / CHANGE_FEED_ROOT / "latest.json")  # 빌드 종료 시점 (피드는 마지막에 기록)
+        return max((p.stat().st_mtime for p in paths if p.exists()), default=0.0)
+
+    def load_shard(self) -> bool:
+        """디버그 파일/변경 피드가 갱신됐으면 재시드 (피드가 이어지면 상태가 바뀐 심볼만)"""
+        mtime = self._debug_files_mtime()
+        if mtime <= self._debug_mtime:
+            return False
+        self._debug_mtime = mtime
+        self.reconcile_live_projectors()
+        self.sync_live_projectors(self.symbols)
+        coin_info = load_coin_info(self.omg_dir)
+        self.monitoring_data = [
+            self.coin_data_from_projector(sym, proj, *coin_info.get(sym, (0, sym)))
+            for sym, proj in self.live_projectors.items()
+        ]
+        return True
+
+    @staticmethod
+    def coin_data_from_projector(symbol: str, projector: LiveStateProjector, rank: int = 0, name: Optional[str] = None) -> Dict:
+        st = projector.state
+        buy_levels = {nm: px for nm, px in (st.lv or {}).items() if nm != "Stop"}
+        if st.lv:
+            buy_levels['Stop_Loss'] = st.lv["Stop"]
+        next_target, _ = projector.next_buy_target()
+        return {
+            'symbol': symbol,
+            'next_target': next_target or 'B1',
+            'buy_levels': buy_levels,
+            'rank': rank,
+            'name': name or symbol,
+            'current_price': projector.last_price or 0,
+            'h_value': st.H or 0,
+        }
+
+    def fetch_prices(self) -> Dict[str, float]:
+        """전체 ticker 일괄 조회 1회 → 담당 심볼만 추출"""
+        resp = http_client.get(f"{BINANCE_BASE}/api/v3/ticker/price", timeout=10, retry=http_client.QUICK_RETRY)
+        received = time.time()
+        resp.raise_for_status()
+        wanted = {f"{sym}USDT": sym for sym in self.symbols}
+        prices = {wanted[t["symbol"]]: float(t["price"]) for t in resp.json() if t["symbol"] in wanted}
+        # 일괄 ticker 에는 이벤트 시각이 없어 응답 Date 헤더를 거래소 시각으로 사용
+        exchange_ts = exchange_time_from_headers(resp.headers)
+        for sym in prices:
+            self.price_observations[sym] = (exchange_ts, received)
+        return prices
+
+    def _mark_sent(self, symbol: str, key: str):
+        today = datetime.now().strftime("%Y-%m-%d")
+        if not isinstance(self.alert_history.get(symbol), dict):
+            self.alert_history[symbol] = {}
+        self.alert_history[symbol][key] = today
+        self.save_alert_history()
+
+    def send_alert(self, alert: Dict) -> bool:
+        """outbox 로 넘기고 ack 대기 — 이력은 drain_acks() 에서 전송 성공 시에만 기록"""
+        if alert.get('trace'):
+            alert['trace'].mark("enqueued")
+        self._pending[(alert['symbol'], alert['target'])] = time.time()
+        self.outbox.put(("alert", self.shard_id, alert))
+        return True
+
+    def drain_acks(self):
+        """코디네이터 전송 결과 반영 + 오래된 대기 항목 만료"""
+        while self.acks is not None:
+            try:
+                symbol, target, delivered = self.acks.get_nowait()
+            except queue.Empty:
+                break
+            self._pending.pop((symbol, target), None)
+            if delivered:
+                self._mark_sent(symbol, target)
+        deadline = time.time() - ACK_TIMEOUT_SEC
+        for key, sent_at in list(self._pending.items()):
+            if sent_at < deadline:
+                del self._pending[key]
+
+    def send_provisional_event_alert(self, event: ProvisionalEvent, trace: Optional[AlertTrace] = None):
+        if trace:
+            trace.mark("enqueued")
+        self.outbox.put(("provisional", self.shard_id, (event, trace)))
+
+    def run_shard_cycle(self) -> Dict:
+        started = time.time()
+        alerts_sent = 0
+        self.drain_acks()
+        prices = self.fetch_prices()
+        for coin_data in self.monitoring_data:
+            symbol = coin_data['symbol']
+            current_price = prices.get(symbol)
+            if current_price is None:
+                continue
+            try:
+                for event in self.update_live_projection(symbol, current_price):
+                    self.send_provisional_event_alert(event, self.start_trace(symbol, "PROVISIONAL", event.event))
+                    alerts_sent += 1
+                for alert in self.check_alert_condition(coin_data, current_price):
+                    if (symbol, alert['target']) in self._pending:
+                        continue  # 전송 결과 대기 중
+                    alert['trace'] = self.start_trace(symbol, alert.get('kind', 'BUY'), alert['target'])
+                    self.send_alert(alert)
+                    alerts_sent += 1
+                self.update_leaderboard(coin_data, current_price)
+            except Exception as e:
+                print(f"[{self.shard_id}] {symbol} 모니터링 오류: {e}")
+        return {
+            'shard': self.shard_id,
+            'symbols': len(self.monitoring_data),
+            'priced': len(prices),
+            'cycle_sec': round(time.time() - started, 3),
+            'alerts': alerts_sent,
+            'leaderboard': self.leaderboard.as_dicts(5),
+            'at': time.time(),
+        }
+
+
+def shard_worker(shard_id: str, symbols: List[str], outbox, acks, interval_sec: int, root_dir: str):
+    """워커 프로세스 진입점"""
+    monitor = ShardMonitor(shard_id, symbols, outbox, pathlib.Path(root_dir), acks)
+    while True:
+        started = time.time()
+        try:
+            monitor.load_shard()
+            outbox.put(("stats", shard_id, monitor.run_shard_cycle()))
+        except Exception as e:
+            outbox.put(("error", shard_id, str(e)))
+        time.sleep(max(1.0, interval_sec - (time.time() - started)))
+
+
+# -----------------------------
+# 코디네이터
+# -----------------------------
+def print_load(stats: Dict[str, Dict]):
+    print(f"[{datetime.now()}] 샤드 부하")
+    for sid in sorted(stats):
+        st = stats[sid]
+        age = time.time() - st['at']
+        print(f"  {sid:<12} | {st['symbols']:>5}개 | 사이클 {st['cycle_sec']:>7.2f}s | 알람 {st['alerts']:>3} | {age:5.0f}s 전")
+
+
+def _queue_depth(q) -> Optional[int]:
+    try:
+        return q.qsize()
+    except NotImplementedError:  # macOS 는 mp.Queue.qsize 미지원
+        return None
+
+
+def run_coordinator(
+    plan: Dict[str, List[str]], interval_sec: int, root_dir: pathlib.Path, metrics_port: Optional[int] = None,
+    build_symbols: Optional[List[str]] = None,
+):
+    outbox = mp.Queue()
+    dispatcher = CryptoRealtimeMonitor(alert_history_file="alert_history_outbox.json")
+    if metrics_port:
+        start_metrics_server(metrics_port)
+    procs: Dict[str, mp.Process] = {}
+    acks: Dict[str, mp.Queue] = {}  # 워커별 전송 결과 (재시작해도 같은 큐)
+
+    def _spawn(sid: str):
+        ack_queue = acks.setdefault(sid, mp.Queue())
+        proc = mp.Process(target=shard_worker, args=(sid, plan[sid], outbox, ack_queue, interval_sec, str(root_dir)), daemon=True)
+        proc.start()
+        procs[sid] = proc
+
+    for sid, syms in plan.items():
+        if syms:
+            _spawn(sid)
+    print(f"샤드 워커 {len(procs)}개 시작")
+    stop_build = threading.Event()
+    if build_symbols:
+        threading.Thread(target=build_missing, args=(root_dir, build_symbols, stop_build), daemon=True).start()
+
+    stats: Dict[str, Dict] = {}
+    last_print = time.time()
+    try:
+        while True:
+            try:
+                kind, sid, payload = outbox.get(timeout=1.0)
+            except queue.Empty:
+                kind = None
+            if kind == "alert":
+                ALERTS_GENERATED.inc(kind=payload.get('kind', 'BUY'))
+                delivered = dispatcher.send_alert(payload)
+                if sid in acks:
+                    acks[sid].put((payload['symbol'], payload['target'], delivered))
+            elif kind == "provisional":
+                ALERTS_GENERATED.inc(kind="PROVISIONAL")
+                dispatcher.send_provisional_event_alert(*payload)
+            elif kind == "stats":
+                stats[sid] = payload
+                MONITOR_CYCLE_SECONDS.observe(payload['cycle_sec'])
+            elif kind == "error":
+                print(f"[{sid}] 워커 오류: {payload}")
+            depth = _queue_depth(outbox)
+            if depth is not None:
+                NOTIFICATION_QUEUE_DEPTH.set(depth)
+
+            for sid, proc in list(procs.items()):
+                if not proc.is_alive():
+                    print(f"[{sid}] 워커 종료 감지 → 재시작")
+                    _spawn(sid)
+
+            if time.time() - last_print >= STATS_PRINT_SEC and stats:
+                print_load(stats)
+                last_print = time.time()
+    except KeyboardInterrupt:
+        print("샤딩 모니터 중단")
+    finally:
+        stop_build.set()
+        for proc in procs.values():
+            proc.terminate()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="암호화폐 실시간 모니터 - 샤딩 모드")
+    parser.add_argument("--shards", type=int, default=max(1, (os.cpu_count() or 2) - 1), help="호스트당 워커 프로세스 수")
+    parser.add_argument("--hosts", nargs="+", default=["local"], help="링에 참여하는 호스트 ID 목록")
+    parser.add_argument("--host-id", default="local", help="이 호스트의 ID (자기 샤드만 실행)")
+    parser.add_argument("--root", default=".", help="debug/ 폴더가 있는 OMG 디렉토리")
+    parser.add_argument("--interval", type=int, default=300, help="사이클 간격(초)")
+    parser.add_argument("--all-usdt", action="store_true",
+                        help="Binance 전체 USDT 페어 대상 (디버그 파일 있는 심볼만 활성, 나머지는 --build-missing 으로 생성)")
+    parser.add_argument("--build-missing", action="store_true",
+                        help="이 호스트 샤드 심볼 중 디버그 파일이 없거나 오래된 것을 auto_debug_builder 로 백그라운드 생성")
+    parser.add_argument("--plan", action="store_true", help="분할/재배치 계획만 출력")
+    parser.add_argument("--metrics-port", type=int, help="메트릭 HTTP 엔드포인트 포트 (/metrics)")
+    args = parser.parse_args()
+
+    root_dir = pathlib.Path(args.root)
+    symbols = list_debug_symbols(root_dir / "debug")
+    if args.all_usdt:
+        symbols = sorted(set(symbols) | set(list_usdt_symbols()))
+
+    plan = plan_shards(symbols, make_shard_ids(args.shards, args.hosts))
+    moves = rebalance_moves(load_plan(), plan)
+    print_plan(plan, moves)
+    if args.plan:
+        return
+    save_plan(plan)
+
+    local_plan = {sid: syms for sid, syms in plan.items() if sid.split("/")[0] == args.host_id}
+    build_symbols = sorted(sym for syms in local_plan.values() for sym in syms) if args.build_missing else None
+    run_coordinator(local_plan, args.interval, root_dir, args.metrics_port, build_symbols)
+
+
+if __name__ == "__main__":
+    main()
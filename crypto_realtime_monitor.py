@@ -8,12 +8,12 @@
 2. 00:00에 ANALYSIS 파일에서 B1~B7 값 저장
 3. 5분 간격으로 실시간 가격과 비교하여 알람 전송
 4. 중복 알람 방지 (코인별, 매수목표별 하루 1회)
+5. 장중 Phase 1.5 상태 투영 (잠정 BUY/ADD/SELL/STOP LOSS/RESTART, 마감 후 대조)
 """
 
 import os
 import sys
 import pandas as pd
-import requests
 import time
 import json
 import schedule
@@ -25,21 +25,48 @@ import pathlib
 # S12 디렉토리의 모듈 import
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from telegram_notifier import send_telegram_message
+from core.change_feed import DEFAULT_ROOT as CHANGE_FEED_ROOT, changes_since, latest_feed
+from core.compact_debug import find_debug, source as debug_source
+from core.live_state import LiveStateProjector, ProvisionalEvent
+from core.triggers import ALERT_TITLES, BUY, RESTART, SELL, STOP, TriggerTable
+from core.leaderboard import DivergenceLeaderboard
+from core import http_client
+from core.metrics import (
+    ALERT_LATENCY_SECONDS, ALERTS_DELIVERED, ALERTS_GENERATED, MONITOR_CYCLE_SECONDS, PLAN_AGE_SECONDS,
+    start_metrics_server,
+)
+from core.alert_trace import AlertTrace, AlertTraceLog, exchange_time_from_headers, print_summary
 
 try:
-    from slack_notifier import send_slack_alert, send_slack_buy_execution_alert
+    from slack_notifier import send_slack_alert, send_slack_buy_execution_alert, send_slack_leaderboard_digest
 except ImportError:
     print(f"Warning: Could not import slack_notifier. Slack 알림은 건너뜁니다.")
     send_slack_alert = None
     send_slack_buy_execution_alert = None
+    send_slack_leaderboard_digest = None
+
+LEADERBOARD_FILE = "leaderboard.json"
+
+# 트리거 종류별 알람 표시 이름 (제목은 core.triggers.ALERT_TITLES)
+TRIGGER_TARGET_NAMES = {
+    STOP: 'STOP LOSS (실행 전)',
+    RESTART: 'RESTART',
+}
 
 class CryptoRealtimeMonitor:
-    def __init__(self):
+    def __init__(self, alert_history_file: str = "alert_history.json"):
         self.omg_dir = pathlib.Path("C:/Coding/OMG")
         self.analysis_file = None
         self.monitoring_data = {}  # {symbol: {next_target, buy_levels, rank, name}}
         self.alert_history = {}  # {symbol: {target: sent_date}}
-        self.alert_history_file = "alert_history.json"
+        self.alert_history_file = alert_history_file
+        self.live_projectors = {}  # {symbol: LiveStateProjector} 장중 Phase 1.5 상태 투영
+        self.feed_run = None  # 마지막으로 반영한 변경 피드 run (core.change_feed)
+        self.trigger_table = TriggerTable(near_pct=5.0)  # BUY/SELL/STOP/RESTART 통합 트리거 (OMG_FIXED_POINT=1 이면 정수 비교)
+        self.leaderboard = DivergenceLeaderboard()  # 다음 매수 목표 근접 Top-K
+        self.leaderboard_file = LEADERBOARD_FILE
+        self.trace_log = AlertTraceLog()  # 알람 지연 추적 (alert_traces.jsonl)
+        self.price_observations = {}  # {symbol: (거래소 이벤트 시각, 수신 시각)}
         
         # 알람 이력 로드
         self.load_alert_history()
@@ -78,11 +105,11 @@ class CryptoRealtimeMonitor:
             bool: 이 레벨의 "첫 자리" 알림이면 True
         """
         try:
-            debug_file = f"debug/{symbol.lower()}_debug.csv"
-            if not os.path.exists(debug_file):
+            debug_file = find_debug(pathlib.Path("debug"), symbol.lower())
+            if not debug_file.exists():
                 return False
 
-            df = pd.read_csv(debug_file)
+            df = pd.read_csv(debug_source(debug_file))
 
             # 1. 마지막 RESTART 찾기
             restart_events = df[df['event'].str.contains('RESTART', na=False)]
@@ -175,6 +202,10 @@ class CryptoRealtimeMonitor:
             # ANALYSIS 파일에서 모니터링 데이터 로드
             self.load_monitoring_data()
             
+            # 장중 잠정 이벤트를 공식 재빌드 결과와 대조 후 재시드
+            self.reconcile_live_projectors()
+            self.sync_live_projectors()
+            
             # 알람 이력 초기화 (새로운 날)
             today = datetime.now().strftime("%Y-%m-%d")
             for symbol in list(self.alert_history.keys()):
@@ -285,18 +316,145 @@ class CryptoRealtimeMonitor:
         except Exception as e:
             print(f"모니터링 데이터 로드 실패: {e}")
     
+    def debug_csv_path(self, symbol: str) -> pathlib.Path:
+        """디버그 CSV 또는 압축 디버그(.npz) 중 최근 것"""
+        return find_debug(self.omg_dir / "debug", symbol)
+
+    def load_live_projectors(self, symbols: Optional[List[str]] = None):
+        """디버그 CSV의 마지막 일자 상태로 장중 상태 투영기 시드"""
+        if symbols is None:
+            symbols = [coin_data['symbol'] for coin_data in self.monitoring_data]
+        projectors = {}
+        for symbol in symbols:
+            projector = self._seed_projector(symbol)
+            if projector is not None:
+                projectors[symbol] = projector
+        self.live_projectors = projectors
+        self.trigger_table = TriggerTable(near_pct=self.trigger_table.near_pct, fixed_point=self.trigger_table.fixed_point)
+        for symbol, projector in projectors.items():
+            self.trigger_table.compile(symbol, projector.state)
+        print(f"장중 상태 투영기 시드 완료: {len(self.live_projectors)}개 코인")
+
+    def _seed_projector(self, symbol: str) -> Optional[LiveStateProjector]:
+        debug_file = self.debug_csv_path(symbol)
+        if not debug_file.exists():
+            return None
+        try:
+            return LiveStateProjector.from_debug_csv(symbol, debug_file)
+        except Exception as e:
+            print(f"{symbol} 상태 투영기 시드 실패: {e}")
+            return None
+
+    def sync_live_projectors(self, symbols: Optional[List[str]] = None):
+        """일일 재빌드 후 재시드 — 변경 피드가 이어지면 상태가 바뀐 심볼만, 아니면 전체"""
+        feed_root = str(self.omg_dir / CHANGE_FEED_ROOT)
+        since = changes_since(self.feed_run, feed_root)
+        latest = latest_feed(feed_root)
+        self.feed_run = latest["run"] if latest else None
+        if since is None or not self.live_projectors:
+            self.load_live_projectors(symbols)
+            return
+        _, changed, _ = since
+        if symbols is None:
+            symbols = [coin_data['symbol'] for coin_data in self.monitoring_data]
+        for symbol in set(self.live_projectors) - set(symbols):
+            del self.live_projectors[symbol]
+            self.trigger_table.remove(symbol)
+        reseeded = 0
+        for symbol in symbols:
+            if symbol in self.live_projectors and symbol not in changed:
+                continue
+            projector = self._seed_projector(symbol)
+            if projector is None:
+                self.live_projectors.pop(symbol, None)
+                self.trigger_table.remove(symbol)
+                continue
+            self.live_projectors[symbol] = projector
+            self.trigger_table.compile(symbol, projector.state)
+            reseeded += 1
+        print(f"장중 상태 투영기 재시드: 변경 {reseeded}개 / 유지 {len(self.live_projectors) - reseeded}개")
+
+    def reconcile_live_projectors(self):
+        """잠정 이벤트 ↔ 일일 재빌드 공식 이벤트 대조 결과 출력"""
+        for symbol, projector in self.live_projectors.items():
+            if not projector.pending:
+                continue
+            debug_file = self.debug_csv_path(symbol)
+            if not debug_file.exists():
+                continue
+            try:
+                result = projector.reconcile(debug_file)
+            except Exception as e:
+                print(f"{symbol} 잠정 이벤트 대조 실패: {e}")
+                continue
+            print(
+                f"[대조] {symbol}: 확정 {len(result['confirmed'])} / "
+                f"누락 {result['missed']} / 오탐 {result['spurious']}"
+            )
+
+    def update_live_projection(self, symbol: str, current_price: float) -> List[ProvisionalEvent]:
+        """현재가로 장중 상태 투영 갱신, 새로 발생한 잠정 이벤트 반환"""
+        projector = self.live_projectors.get(symbol)
+        if projector is None:
+            return []
+        try:
+            events = projector.on_update(current_price)
+            self.trigger_table.sync(symbol, projector.state)
+            return events
+        except Exception as e:
+            print(f"{symbol} 상태 투영 갱신 실패: {e}")
+            return []
+
+    def send_provisional_event_alert(self, event: ProvisionalEvent, trace: Optional[AlertTrace] = None):
+        """잠정 이벤트(BUY/ADD/SELL/STOP LOSS/RESTART) 알림 전송 (하루 1회)"""
+        today = datetime.now().strftime("%Y-%m-%d")
+        history_key = f"{event.event}_PROVISIONAL"
+        history = self.alert_history.get(event.symbol)
+        if isinstance(history, dict) and history.get(history_key) == today:
+            return
+
+        price = event.fill_price if event.fill_price is not None else event.trigger_price
+        h_value = event.row[14] if event.row else None
+        price_str = f"${self.format_price(price, h_value)}" if price is not None else "-"
+        message = (
+            f"📡 <b>장중 잠정 이벤트</b>\n"
+            f"────────────\n"
+            f"코인: {event.symbol}\n"
+            f"이벤트: <b>{event.event}</b>\n"
+            f"기준가: {price_str}\n"
+            f"────────────\n"
+            f"<i>일봉 마감 후 일일 재빌드로 확정됩니다</i>"
+        )
+        if trace:
+            trace.mark("enqueued")
+        try:
+            telegram_success = send_telegram_message(message, recipients=["me"])
+            self.record_delivery("telegram", telegram_success, trace)
+            self.finish_trace(trace)
+            if telegram_success:
+                if not isinstance(self.alert_history.get(event.symbol), dict):
+                    self.alert_history[event.symbol] = {}
+                self.alert_history[event.symbol][history_key] = today
+                self.save_alert_history()
+                print(f"잠정 이벤트 알림 전송: {event.symbol} {event.event}")
+        except Exception as e:
+            print(f"잠정 이벤트 알림 전송 오류: {e}")
+
     def get_current_price(self, symbol: str) -> Optional[float]:
-        """현재가 조회 (Binance Ticker API)"""
+        """현재가 조회 (Binance 24hr Ticker API - 단일 심볼 weight 는 ticker/price 와 동일, 이벤트 시각 포함)"""
         try:
-            url = "https://api.binance.com/api/v3/ticker/price"
+            url = "https://api.binance.com/api/v3/ticker/24hr"
             params = {"symbol": f"{symbol}USDT"}
 
-            response = requests.get(url, params=params, timeout=10)
+            response = http_client.get(url, params=params, timeout=10, retry=http_client.QUICK_RETRY)
+            received = time.time()
             response.raise_for_status()
             data = response.json()
 
-            if data and 'price' in data:
-                return float(data['price'])
+            if data and 'lastPrice' in data:
+                exchange_ts = data['closeTime'] / 1000 if data.get('closeTime') else exchange_time_from_headers(response.headers)
+                self.price_observations[symbol] = (exchange_ts, received)
+                return float(data['lastPrice'])
             return None
 
         except Exception as e:
@@ -313,7 +471,7 @@ class CryptoRealtimeMonitor:
                 "limit": 1  # 최근 1개 봉
             }
 
-            response = requests.get(url, params=params, timeout=10)
+            response = http_client.get(url, params=params, timeout=10, retry=http_client.QUICK_RETRY)
             response.raise_for_status()
             data = response.json()
 
@@ -408,6 +566,9 @@ class CryptoRealtimeMonitor:
     def check_alert_condition(self, coin_data: Dict, current_price: float) -> List[Dict]:
         """알람 조건 확인"""
         symbol = coin_data['symbol']
+        if symbol in self.trigger_table:
+            return self.check_trigger_alerts(coin_data, current_price)
+
         next_target = coin_data['next_target']
         buy_levels = coin_data['buy_levels']
         
@@ -445,6 +606,92 @@ class CryptoRealtimeMonitor:
         
         return alerts
     
+    def check_trigger_alerts(self, coin_data: Dict, current_price: float) -> List[Dict]:
+        """통합 트리거 테이블 1회 평가로 BUY/SELL/STOP LOSS/RESTART 알람 생성"""
+        symbol = coin_data['symbol']
+        today = datetime.now().strftime("%Y-%m-%d")
+        history = self.alert_history.get(symbol)
+        if not isinstance(history, dict):
+            history = {}
+
+        alerts = []
+        for hit in self.trigger_table.evaluate(symbol, current_price):
+            trigger = hit.trigger
+            if trigger.kind == SELL:
+                target = f"SELL {trigger.name}"
+            else:
+                target = TRIGGER_TARGET_NAMES.get(trigger.kind, trigger.name)
+
+            # 중복 알람 확인
+            if history.get(target) == today:
+                continue
+
+            alerts.append({
+                'symbol': symbol,
+                'kind': trigger.kind,
+                'target': target,
+                'target_price': trigger.price,
+                'current_price': current_price,
+                'divergence': hit.divergence,
+                'hit': hit.hit,
+                'rank': coin_data['rank'],
+                'name': coin_data['name'],
+                'h_value': coin_data['h_value']
+            })
+        return alerts
+    
+    def update_leaderboard(self, coin_data: Dict, current_price: float):
+        """다음 매수 목표 대비 이격도를 리더보드에 반영 (O(log n))"""
+        symbol = coin_data['symbol']
+        trigger = self.trigger_table.next_buy(symbol)
+        if trigger is not None:
+            target, target_price = trigger.name, trigger.price
+        else:
+            target = coin_data['next_target']
+            target_price = coin_data['buy_levels'].get(target)
+        if not target_price:
+            self.leaderboard.remove(symbol)
+            return
+        self.leaderboard.update(
+            symbol, current_price, target, target_price,
+            name=coin_data['name'], market_rank=coin_data['rank'], h_value=coin_data['h_value'],
+        )
+
+    def save_leaderboard(self, k: int = 20):
+        """리더보드 Top-K 를 JSON 으로 저장 (--top 조회용)"""
+        try:
+            payload = {
+                "updated_at": datetime.now().isoformat(timespec="seconds"),
+                "entries": self.leaderboard.as_dicts(k),
+            }
+            with open(self.leaderboard_file, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            print(f"리더보드 저장 실패: {e}")
+
+    def send_leaderboard_digest(self, k: int = 10):
+        """리더보드 Top-K 정기 다이제스트 전송"""
+        entries = self.leaderboard.as_dicts(k)
+        if not entries:
+            return
+        lines = [
+            f"{e['rank']:>2}. {e['symbol']:<6} {e['target']} "
+            f"${self.format_price(e['target_price'], e.get('h_value'))} ({e['divergence']:+.2f}%)"
+            for e in entries
+        ]
+        body = "\n".join(lines)
+        message = (
+            f"🏁 <b>매수 목표 근접 Top {len(entries)}</b>\n"
+            f"────────────\n"
+            f"<pre>{body}</pre>"
+        )
+        try:
+            send_telegram_message(message, recipients=["me"])
+            if send_slack_leaderboard_digest:
+                send_slack_leaderboard_digest(entries)
+        except Exception as e:
+            print(f"리더보드 다이제스트 전송 오류: {e}")
+
     def format_price(self, price: float, h_value: float = None) -> str:
         """가격을 천 단위 콤마로 포맷팅 (H값에 따라 소수점 자릿수 조정)"""
         if price is None:
@@ -472,8 +719,11 @@ class CryptoRealtimeMonitor:
         }
         return sell_thresholds.get(buy_level)
     
-    def send_alert(self, alert: Dict):
-        """텔레그램 알람 전송"""
+    def send_alert(self, alert: Dict) -> bool:
+        """텔레그램 알람 전송 — 한 채널이라도 전송되면 True (알람 이력 기록)"""
+        trace = alert.get('trace')
+        if trace:
+            trace.mark("enqueued")
         try:
             # "첫 자리" 확인
             is_first = self.is_first_entry_for_level(alert['symbol'], alert['target'])
@@ -495,14 +745,19 @@ class CryptoRealtimeMonitor:
             if sell_threshold:
                 sell_criteria_text = f"\n매도 기준: +{sell_threshold}%"
 
+            # 트리거 종류별 제목 (기본: 매수 목표)
+            kind = alert.get('kind', BUY)
+            title = ALERT_TITLES.get(kind, ALERT_TITLES[BUY])
+            target_label = "매수목표" if kind == BUY else "트리거"
+
             # 알람 메시지 포맷팅 (새로운 형식)
             message = (
-                f"🪙 <b>매수 목표 접근 알림</b>\n"
+                f"🪙 <b>{title}</b>\n"
                 f"────────────\n"
                 f"코인명: {coin_display}\n"
                 f"시총 순위: {alert['rank']}\n\n"
                 f"현재가: ${current_price_str}\n"
-                f"매수목표: <b>{alert['target']} - ${target_price_str}</b>{sell_criteria_text}\n"
+                f"{target_label}: <b>{alert['target']} - ${target_price_str}</b>{sell_criteria_text}\n"
                 f"이격도: <b>{alert['divergence']:.2f}%</b>\n"
                 f"────────────\n"
                 f"<tg-spoiler>* 기준 고점: ${h_value_str}</tg-spoiler>"
@@ -510,6 +765,7 @@ class CryptoRealtimeMonitor:
             
             # 텔레그램 전송 (모든 수신자에게)
             telegram_success = send_telegram_message(message, recipients=["all"])
+            self.record_delivery("telegram", telegram_success, trace)
             
             # Slack 전송 (선택적)
             slack_success = True
@@ -518,6 +774,8 @@ class CryptoRealtimeMonitor:
                 alert_with_first = alert.copy()
                 alert_with_first['is_first'] = is_first
                 slack_success = send_slack_alert(alert_with_first)
+                self.record_delivery("slack", slack_success, trace)
+            self.finish_trace(trace)
             
             if telegram_success or slack_success:
                 # 알람 이력 업데이트
@@ -535,11 +793,11 @@ class CryptoRealtimeMonitor:
                 if slack_success:
                     status.append("Slack")
                 print(f"알람 전송 성공: {alert['symbol']} {alert['target']} ({', '.join(status)})")
-            else:
-                print(f"알람 전송 실패: {alert['symbol']} {alert['target']}")
-                
+                return True
+            print(f"알람 전송 실패: {alert['symbol']} {alert['target']}")
         except Exception as e:
             print(f"알람 전송 오류: {e}")
+        return False
     
     def send_buy_execution_alert(self, execution_data: Dict):
         """매수 실행 알림 전송"""
@@ -576,11 +834,13 @@ class CryptoRealtimeMonitor:
             
             # 텔레그램 전송 (모든 수신자에게)
             telegram_success = send_telegram_message(message, recipients=["all"])
+            self.record_delivery("telegram", telegram_success)
             
             # Slack 전송 (선택적)
             slack_success = True
             if send_slack_buy_execution_alert:
                 slack_success = send_slack_buy_execution_alert(execution_data, price_data, current_price)
+                self.record_delivery("slack", slack_success)
             
             if telegram_success or slack_success:
                 # 매수 실행 이력 업데이트
@@ -610,13 +870,40 @@ class CryptoRealtimeMonitor:
         except Exception as e:
             print(f"매수 실행 알림 전송 실패: {e}")
     
+    def start_trace(self, symbol: str, kind: str, target: str = "") -> AlertTrace:
+        """마지막 가격 관측 시각으로 알람 추적 시작"""
+        exchange_ts, received = self.price_observations.get(symbol, (None, None))
+        trace = AlertTrace(symbol=symbol, kind=kind, target=target, exchange=exchange_ts, received=received)
+        trace.mark("evaluated")
+        return trace
+
+    def finish_trace(self, trace: Optional[AlertTrace]):
+        if trace and trace.acks:
+            self.trace_log.append(trace)
+
+    @staticmethod
+    def record_delivery(channel: str, success: bool, trace: Optional[AlertTrace] = None):
+        """채널별 알림 전송 결과 메트릭 (+ 추적 전송 완료 시각)"""
+        ALERTS_DELIVERED.inc(channel=channel, result="ok" if success else "fail")
+        if trace:
+            trace.ack(channel, success)
+            latency = trace.latency(channel)
+            if latency is not None:
+                ALERT_LATENCY_SECONDS.observe(latency, channel=channel)
+
     def run_monitoring_cycle(self):
         """5분 간격 모니터링 사이클"""
         if not self.monitoring_data:
             print("모니터링 데이터가 없습니다.")
             return
         
+        with MONITOR_CYCLE_SECONDS.time():
+            self._run_monitoring_cycle()
+
+    def _run_monitoring_cycle(self):
         print(f"[{datetime.now()}] 모니터링 사이클 시작...")
+        if self.analysis_file and self.analysis_file.exists():
+            PLAN_AGE_SECONDS.set(time.time() - self.analysis_file.stat().st_mtime)
         
         for coin_data in self.monitoring_data:
             try:
@@ -626,11 +913,19 @@ class CryptoRealtimeMonitor:
                 if current_price is None:
                     continue
                 
+                # 장중 상태 투영 (잠정 BUY/ADD/SELL/STOP LOSS/RESTART)
+                for event in self.update_live_projection(symbol, current_price):
+                    ALERTS_GENERATED.inc(kind="PROVISIONAL")
+                    self.send_provisional_event_alert(event, self.start_trace(symbol, "PROVISIONAL", event.event))
+                
                 # 알람 조건 확인 (접근 알림)
                 alerts = self.check_alert_condition(coin_data, current_price)
+                self.update_leaderboard(coin_data, current_price)
                 
                 # 알람 전송
                 for alert in alerts:
+                    ALERTS_GENERATED.inc(kind=alert.get('kind', BUY))
+                    alert['trace'] = self.start_trace(symbol, alert.get('kind', BUY), alert['target'])
                     self.send_alert(alert)
                 
                 # 매수 실행 감지 (30분봉 저가 기준)
@@ -647,6 +942,7 @@ class CryptoRealtimeMonitor:
                         execution_key not in self.alert_history[symbol] or
                         self.alert_history[symbol][execution_key] != today):
                         
+                        ALERTS_GENERATED.inc(kind="EXECUTION")
                         self.send_buy_execution_alert(execution_data)
                 
                 # API 제한 방지
@@ -655,6 +951,7 @@ class CryptoRealtimeMonitor:
             except Exception as e:
                 print(f"{symbol} 모니터링 오류: {e}")
         
+        self.save_leaderboard()
         print(f"[{datetime.now()}] 모니터링 사이클 완료")
     
     def start_monitoring(self):
@@ -664,6 +961,7 @@ class CryptoRealtimeMonitor:
         # 스케줄 설정
         schedule.every().day.at("00:00").do(self.run_daily_update)
         schedule.every(5).minutes.do(self.run_monitoring_cycle)  # 5분 간격으로 변경
+        schedule.every(30).minutes.do(self.send_leaderboard_digest)  # 근접 Top-K 다이제스트
         
         # 초기 실행 (테스트용)
         print("초기 데이터 로드...")
@@ -683,8 +981,42 @@ class CryptoRealtimeMonitor:
         except Exception as e:
             print(f"모니터링 오류: {e}")
 
+def print_leaderboard(k: int, path: str = LEADERBOARD_FILE):
+    """실행 중인 모니터가 저장한 리더보드 Top-K 출력"""
+    if not os.path.exists(path):
+        print(f"리더보드 파일이 없습니다: {path}")
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        payload = json.load(f)
+    print(f"매수 목표 근접 Top {k} (갱신: {payload.get('updated_at')})")
+    print("-" * 60)
+    for e in payload.get("entries", [])[:k]:
+        print(f"{e['rank']:>3} | {e['symbol']:<8} | {e['target']:<4} | {e['target_price']:>14,.6f} | {e['divergence']:+8.2f}%")
+
+
 def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="암호화폐 실시간 모니터링")
+    parser.add_argument("--top", type=int, help="저장된 리더보드 Top-K 만 출력하고 종료")
+    parser.add_argument("--metrics-port", type=int, help="메트릭 HTTP 엔드포인트 포트 (/metrics, /leaderboard, /latency)")
+    parser.add_argument("--latency", nargs="?", const=24.0, type=float, metavar="HOURS",
+                        help="알람 지연 요약(p50/p95/p99, 채널별)만 출력하고 종료 (기본: 최근 24시간)")
+    args = parser.parse_args()
+
+    if args.top:
+        print_leaderboard(args.top)
+        return
+    if args.latency is not None:
+        print_summary(hours=args.latency or None)
+        return
+
     monitor = CryptoRealtimeMonitor()
+    if args.metrics_port:
+        start_metrics_server(args.metrics_port, json_routes={
+            "/leaderboard": lambda: monitor.leaderboard.as_dicts(20),
+            "/latency": lambda: monitor.trace_log.summary(since=time.time() - 86400),
+        })
     monitor.start_monitoring()
 
 if __name__ == "__main__":
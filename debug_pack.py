@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+압축 디버그 형식 관리 (core.compact_debug)
+
+- 기본: debug/ 의 심볼별 형식/크기/일수/이벤트 수 요약
+- --pack: 기존 *_debug.csv → *_debug.npz
+  CSV 의 OHLC 로 재생한 결과가 원본 CSV 와 행 단위로 같을 때만 저장 (다르면 건너뜀)
+  --remove 면 변환된 CSV 와 xlsx 삭제
+- --unpack: 압축 파일에서 날짜 구간의 전체 31컬럼 CSV 재구성 (--excel 이면 xlsx 도)
+
+사용 예:
+  python debug_pack.py
+  python debug_pack.py --pack --remove
+  python debug_pack.py --unpack ADA --from 2025-01-01 --to 2025-03-31 --excel
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import os
+import pathlib
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.compact_debug import CHECKPOINT_DAYS, COMPACT_SUFFIX, CSV_SUFFIX, CompactDebug, debug_files, is_compact, write_compact
+from core.equivalence import recorded_series
+from core.phase1_5_state import CSV_HEADER, read_debug_rows
+from core.timeaxis import day_str
+
+DEBUG_DIR = pathlib.Path("debug")
+OUTPUT_DIR = pathlib.Path("output/debug_ranges")
+
+
+def _csv_rows(text: str):
+    return list(csv.reader(io.StringIO(text)))
+
+
+def pack(debug_dir: pathlib.Path, bases: list[str], remove: bool, checkpoint_days: int) -> None:
+    total_before = total_after = 0
+    latest = debug_files(debug_dir)
+    for symbol, ohlc in recorded_series(debug_dir):
+        base = symbol[: -len("USDT")]
+        src = debug_dir / f"{base}{CSV_SUFFIX}"
+        if (bases and base not in bases) or is_compact(latest[base]):
+            continue
+        dst = debug_dir / f"{base}{COMPACT_SUFFIX}"
+        packed = write_compact(symbol, ohlc, dst, checkpoint_days)
+        with open(src, newline="", encoding="utf-8") as f:
+            original = list(csv.reader(f))
+        if _csv_rows(packed.csv_text()) != original:
+            dst.unlink()
+            reason = "구 형식 헤더" if original and original[0] != CSV_HEADER else "재생 결과가 원본 CSV 와 다름 (보정/수동 편집?)"
+            print(f"  {base:<8} 건너뜀: {reason}")
+            continue
+        before, after = src.stat().st_size, dst.stat().st_size
+        total_before += before
+        total_after += after
+        print(f"  {base:<8} {before / 1024:8.1f} KB → {after / 1024:6.1f} KB  ({len(packed)}일, 이벤트 {len(packed.events)})")
+        if remove:
+            src.unlink()
+            src.with_suffix(".xlsx").unlink(missing_ok=True)
+    if total_after:
+        print(f"합계 {total_before / 1024:,.0f} KB → {total_after / 1024:,.0f} KB ({total_before / total_after:.1f}배)")
+
+
+def unpack(debug_dir: pathlib.Path, base: str, start: str | None, end: str | None, out: str | None, excel: bool) -> None:
+    path = debug_files(debug_dir).get(base)
+    if path is None or not is_compact(path):
+        raise SystemExit(f"압축 디버그 파일 없음: {debug_dir / (base + COMPACT_SUFFIX)}")
+    packed = CompactDebug.load(path)
+    out_csv = pathlib.Path(out) if out else OUTPUT_DIR / f"{base}_{start or 'start'}_{end or 'end'}.csv"
+    packed.write_csv(out_csv, start, end)
+    print(f"{base}: {out_csv} ({len(read_debug_rows(out_csv))}행)")
+    if excel:
+        from auto_debug_builder import convert_csv_to_excel
+
+        print(f"{base}: {convert_csv_to_excel(out_csv)}")
+
+
+def summary(debug_dir: pathlib.Path) -> None:
+    files = debug_files(debug_dir)
+    if not files:
+        print(f"디버그 파일 없음: {debug_dir}")
+        return
+    print(f"{'심볼':<8} {'형식':<4} {'크기(KB)':>9} {'기간':<23} {'이벤트':>6}")
+    for base, path in files.items():
+        size = path.stat().st_size / 1024
+        if is_compact(path):
+            packed = CompactDebug.load(path)
+            span = f"{day_str(int(packed.day[0]))} ~ {day_str(int(packed.day[-1]))}" if len(packed) else "-"
+            print(f"{base:<8} {'npz':<4} {size:9.1f} {span:<23} {len(packed.events):6d}")
+        else:
+            rows = read_debug_rows(path)
+            span = f"{rows[0]['date']} ~ {rows[-1]['date']}" if rows else "-"
+            events = sum(1 for r in rows if r["basis"])
+            print(f"{base:<8} {'csv':<4} {size:9.1f} {span:<23} {events:6d}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="압축 디버그 형식 (이벤트 + 체크포인트) 변환/재구성")
+    parser.add_argument("--dir", default=str(DEBUG_DIR), help="디버그 폴더")
+    parser.add_argument("--pack", action="store_true", help="*_debug.csv → *_debug.npz (재생 결과 검증 후)")
+    parser.add_argument("--symbols", nargs="+", help="--pack 대상 베이스 심볼 (기본: 전체)")
+    parser.add_argument("--remove", action="store_true", help="--pack 성공 시 원본 CSV/xlsx 삭제")
+    parser.add_argument("--checkpoint-days", type=int, default=CHECKPOINT_DAYS, help="체크포인트 간격 (일)")
+    parser.add_argument("--unpack", metavar="BASE", help="압축 파일에서 전체 CSV 재구성 (예: ADA)")
+    parser.add_argument("--from", dest="start", help="--unpack 시작일 (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="end", help="--unpack 종료일 (YYYY-MM-DD)")
+    parser.add_argument("--out", help="--unpack 출력 CSV 경로")
+    parser.add_argument("--excel", action="store_true", help="--unpack 결과를 xlsx 로도 저장")
+    args = parser.parse_args()
+
+    debug_dir = pathlib.Path(args.dir)
+    if args.pack:
+        pack(debug_dir, [s.upper() for s in args.symbols or []], args.remove, args.checkpoint_days)
+    elif args.unpack:
+        unpack(debug_dir, args.unpack.upper(), args.start, args.end, args.out, args.excel)
+    else:
+        summary(debug_dir)
+
+
+if __name__ == "__main__":
+    main()
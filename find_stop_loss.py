@@ -1,18 +1,20 @@
 import os
-import glob
+import pathlib
 import pandas as pd
 
+from core.compact_debug import debug_files as debug_paths, source as debug_source
+
 # DEBUG 파일들 찾기
-debug_files = glob.glob('debug/*_debug.csv')
+debug_files = [str(p) for p in debug_paths(pathlib.Path('debug')).values()]  # CSV 또는 압축(.npz)
 stop_loss_coins = []
 
 for file in debug_files:
     try:
-        df = pd.read_csv(file)
+        df = pd.read_csv(debug_source(file))
         # STOP LOSS 이벤트가 있는지 확인
         stop_loss_events = df[df['event'] == 'STOP LOSS']
         if not stop_loss_events.empty:
-            coin_name = os.path.basename(file).replace('_debug.csv', '')
+            coin_name = os.path.basename(file).rsplit('_debug.', 1)[0]
             stop_loss_count = len(stop_loss_events)
             stop_loss_dates = stop_loss_events['date'].tolist()
             stop_loss_coins.append({
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+특정 날짜 마감 시점의 Phase 1.5 상태 조회 (core.state_index)
+
+디버그 파일 전체를 읽지 않고 직전 체크포인트에서 최대 CHECKPOINT_DAYS 캔들만 재생한다.
+
+사용 예:
+  python query_state.py ARB 2024-08-04
+  python query_state.py ARB BTC ETH --date 2025-03-01
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.state_index import StateIndex
+from core.timeaxis import parse_day
+
+
+def main():
+    parser = argparse.ArgumentParser(description="날짜 기준 Phase 1.5 엔진 상태 조회 (as-of)")
+    parser.add_argument("args", nargs="+", help="심볼들 [날짜] (예: ARB 2024-08-04)")
+    parser.add_argument("--date", help="조회 날짜 YYYY-MM-DD (마지막 인자로 줘도 됨)")
+    parser.add_argument("--debug-dir", default="debug", help="디버그 폴더")
+    args = parser.parse_args()
+
+    symbols, date = list(args.args), args.date
+    if date is None and len(symbols) > 1:
+        try:
+            parse_day(symbols[-1])
+            date = symbols.pop()
+        except ValueError:
+            pass
+    if date is None:
+        parser.error("날짜가 필요합니다 (예: ARB 2024-08-04)")
+
+    index = StateIndex(debug_dir=args.debug_dir)
+    print(f"{'심볼':<8} {'기준일':<10} {'mode':<4} {'pos':<5} {'stage':>5} {'H':>14} {'L':>14} {'cutoff':>14} {'허용':>4}")
+    for sym in symbols:
+        st = index.state_as_of(sym, date)
+        if st is None:
+            print(f"{sym.upper():<8} 상태 없음 (디버그 파일 없음 또는 {date} 이전)")
+            continue
+        fmt = lambda x: "-" if x is None else f"{x:.8g}"
+        print(
+            f"{sym.upper():<8} {st.date:<10} {st.mode:<4} {str(st.position):<5} {st.stage or '-':>5} "
+            f"{fmt(st.H):>14} {fmt(st.L):>14} {fmt(st.cutoff):>14} {st.allowed_count():>4}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,14 @@ REM 로그 파일 설정
 set LOG_FILE=logs\omg_daily_%date:~0,4%%date:~5,2%%date:~8,2%.log
 if not exist "logs" mkdir "logs"
 
+REM 단계별 프로파일링 리포트가 필요하면 주석 해제 (output\profile\*.json)
+REM set OMG_PROFILE=1
+REM set OMG_PROFILE_TOP=5
+
+REM 오프라인 재현 실행: record 로 한 번 녹화 후 replay 로 네트워크 없이 재실행 (cassettes\omg.jsonl.gz)
+REM set OMG_HTTP_MODE=record
+REM set OMG_REPLAY_LATENCY=recorded
+
 echo ======================================== >> "%LOG_FILE%"
 echo OMG Daily Analysis - %date% %time% >> "%LOG_FILE%"
 echo ======================================== >> "%LOG_FILE%"
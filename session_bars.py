@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+세션 기준 일봉 재구성 + Phase 1.5 재실행 (API 호출 없음)
+
+backfill_klines.py --interval 1h 로 저장해 둔 분봉에서 원하는 세션 경계의 봉을 만든다.
+결과는 cache/sessions/<interval>/<세션 키>/ 에 캐시되어, 같은 세션을 다시 요청하면 재집계하지 않는다.
+
+사용 예:
+  python backfill_klines.py --interval 1h --top-n 30          # 먼저 분봉 백필
+  python session_bars.py --symbols BTCUSDT --session KST      # 한국 날짜(00:00 KST) 기준 일봉 요약
+  python session_bars.py --top-n 30 --session "+09:00@09:00" --simulate
+  python session_bars.py --symbols ETHUSDT --source 5m --session "UTC@00:00/4h" --show 10
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import pathlib
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.kline_store import DEFAULT_ROOT, INTERVAL_MS, KlineStore
+from core.session_bars import DEFAULT_CACHE, Session, SessionBarCache, to_engine_ohlc
+from core.timeaxis import DAY_MS
+
+OUTPUT_ROOT = pathlib.Path("output/sessions")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="저장된 분봉 → 세션 기준 봉 (+ Phase 1.5 재실행)")
+    parser.add_argument("--symbols", nargs="+", help="대상 페어 (예: BTCUSDT ETHUSDT)")
+    parser.add_argument("--top-n", type=int, help="분봉 저장소에 있는 심볼 중 유니버스 Top N")
+    parser.add_argument("--source", default="1h", choices=sorted(k for k in INTERVAL_MS if k != "1d"), help="원본 분봉 간격")
+    parser.add_argument("--session", default="KST", help="세션 정의: KST, UTC, ±HH:MM@HH:MM[/Nh] (기본 KST)")
+    parser.add_argument("--root", default=DEFAULT_ROOT, help="분봉 저장소 경로")
+    parser.add_argument("--cache", default=DEFAULT_CACHE, help="세션 봉 캐시 경로")
+    parser.add_argument("--simulate", action="store_true", help="세션 봉으로 Phase 1.5 디버그 CSV 생성")
+    parser.add_argument("--show", type=int, default=3, help="심볼별로 출력할 마지막 봉 수")
+    args = parser.parse_args()
+
+    try:
+        session = Session.parse(args.session)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.simulate and session.length_ms != DAY_MS:
+        parser.error("--simulate 는 1일 세션만 지원합니다 (엔진이 날짜 단위)")
+
+    store = KlineStore(args.root, args.source)
+    if args.symbols:
+        symbols = [s.upper() for s in args.symbols]
+    elif args.top_n:
+        from universe_selector import get_top30_coins
+
+        symbols = [c["Symbol"] for c in get_top30_coins()[: args.top_n]]
+    else:
+        symbols = store.symbols()
+    if not symbols:
+        print(f"{store.dir} 에 분봉이 없습니다. 먼저 backfill_klines.py --interval {args.source} 를 실행하세요.")
+        return
+
+    cache = SessionBarCache(store, args.cache)
+    out_dir = OUTPUT_ROOT / session.key
+    print(f"세션 {args.session} → {session.key}  (원본 {args.source}, {len(symbols)}개 심볼)")
+    started = time.perf_counter()
+    for sym in symbols:
+        try:
+            bars = cache.bars(sym, session)
+        except FileNotFoundError:
+            print(f"  {sym:<14} 분봉 없음 — 건너뜀")
+            continue
+        n = len(bars["openTime"])
+        if n == 0:
+            print(f"  {sym:<14} 마감된 세션 없음")
+            continue
+        expected = session.length_ms // store.step_ms
+        short = int((bars["candles"] < expected).sum())
+        print(f"  {sym:<14} {n:>5}개 세션 {session.label(int(bars['openTime'][0]))}~{session.label(int(bars['openTime'][-1]))}"
+              + (f"  (분봉 부족 세션 {short}개)" if short else ""))
+        for i in range(max(0, n - args.show), n):
+            print(f"      {session.label(int(bars['openTime'][i]))}  O={bars['open'][i]:g} H={bars['high'][i]:g} "
+                  f"L={bars['low'][i]:g} C={bars['close'][i]:g}  ({bars['candles'][i]}봉)")
+        if args.simulate:
+            from core.phase1_5_core import run_phase1_5_simulation
+
+            out_dir.mkdir(parents=True, exist_ok=True)
+            out_csv = out_dir / f"{sym.replace('USDT', '')}_debug.csv"
+            run_phase1_5_simulation(symbol=sym, ohlc=to_engine_ohlc(bars, session), seed_H=None, out_csv=out_csv, limit_days=0)
+            print(f"      → {out_csv}")
+    print(f"완료 {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,463 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+로컬 모의 거래소 (Binance / CoinGecko 호환 일부) + 부하 테스트
+
+합성 시장(core.synthetic_market)으로 아래 엔드포인트를 제공한다.
+  /api/v3/klines          interval=1d 는 합성 일봉, 그 외(5m/30m/1h…)는 현재가 주변 캔들
+  /api/v3/ticker/price    단일/전체
+  /api/v3/ticker/24hr     단일/전체 (closeTime 포함)
+  /api/v3/exchangeInfo    USDT 페어, PRICE_FILTER tickSize 포함
+  /api/v3/coins/markets   CoinGecko 시총 순위 (per_page/page)
+  /sim/stats              서버 측 통계 (상태 코드별 응답 수, 지연)
+  /sim/config?key=value   실행 중 장애 설정 변경
+
+장애 주입:
+  --latency-ms / --jitter-ms     응답 지연
+  --weight-limit                 분당 weight 한도 (초과 시 429 + Retry-After, X-MBX-USED-WEIGHT-1M 헤더)
+  --p429 / --retry-after         무작위 429 비율
+  --p5xx                         무작위 5xx 비율
+  --burst-every / --burst-len    주기적 5xx 폭주 구간 (초)
+  --cg-limit                     CoinGecko 분당 호출 한도
+
+파이프라인을 모의 거래소로 돌리려면 OMG_SIM_EXCHANGE=http://127.0.0.1:8900 (core.http_client)
+
+사용 예:
+  python sim_exchange.py serve --symbols 300 --latency-ms 40 --p429 0.02
+  python sim_exchange.py loadtest --target monitor --concurrency 16 --duration 60 --burst-every 20 --burst-len 3
+  python sim_exchange.py loadtest --target klines --url http://127.0.0.1:8900   # 외부에서 띄운 서버 사용
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.alert_trace import percentile
+from core.synthetic_market import DAY_MS, generate_ohlc, synthetic_symbols
+
+DEFAULT_PORT = 8900
+INTERVAL_MS = {
+    "1m": 60_000, "3m": 180_000, "5m": 300_000, "15m": 900_000, "30m": 1_800_000,
+    "1h": 3_600_000, "2h": 7_200_000, "4h": 14_400_000, "6h": 21_600_000, "12h": 43_200_000,
+    "1d": DAY_MS,
+}
+# Binance 요청 weight (단일 심볼 / 전체)
+WEIGHTS = {
+    "/api/v3/klines": (2, 2),
+    "/api/v3/ticker/price": (2, 4),
+    "/api/v3/ticker/24hr": (2, 80),
+    "/api/v3/exchangeInfo": (20, 20),
+}
+
+
+@dataclass
+class FaultConfig:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    weight_limit: int = 6000
+    p429: float = 0.0
+    retry_after: int = 1
+    p5xx: float = 0.0
+    burst_every: float = 0.0
+    burst_len: float = 0.0
+    burst_status: int = 503
+    cg_limit: int = 0
+
+    def update(self, values: Dict[str, str]) -> None:
+        for f in fields(self):
+            if f.name in values:
+                setattr(self, f.name, type(getattr(self, f.name))(values[f.name]))
+
+
+# ===== 합성 시장 =====
+
+class SimMarket:
+    def __init__(self, n_symbols: int = 100, days: int = 1500, seed: int = 0):
+        self.days = days
+        self.seed = seed
+        self.symbols = synthetic_symbols(n_symbols)
+        self._index = {s: i for i, s in enumerate(self.symbols)}
+        today = datetime.now(timezone.utc).date()
+        self.start = (today - timedelta(days=days - 1)).isoformat()  # 마지막 일봉 = 오늘(진행 중)
+        self._candles: Dict[str, List[Dict[str, Any]]] = {}
+        self._live: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._index
+
+    def candles(self, symbol: str) -> List[Dict[str, Any]]:
+        rows = self._candles.get(symbol)
+        if rows is None:
+            rows = generate_ohlc(self.days, seed=self.seed, symbol=symbol, start=self.start)
+            with self._lock:
+                self._candles.setdefault(symbol, rows)
+        return rows
+
+    def price(self, symbol: str) -> float:
+        """현재가 — 호출마다 마지막 일봉 종가에서 작은 랜덤워크"""
+        last_close = self.candles(symbol)[-1]["close"]  # 락 밖에서 (candles 도 같은 락을 잡음)
+        with self._lock:
+            p = self._live.get(symbol, last_close)
+            p *= math.exp(self._rng.gauss(0.0, 0.002))
+            self._live[symbol] = p
+            return p
+
+    def tick_size(self, symbol: str) -> float:
+        p = self.candles(symbol)[0]["close"]
+        return 10.0 ** (math.floor(math.log10(p)) - 4)
+
+    def klines(self, symbol: str, interval: str, start: Optional[int], end: Optional[int], limit: int) -> List[List[Any]]:
+        step = INTERVAL_MS.get(interval)
+        if step is None:
+            raise ValueError("Invalid interval.")
+        if step == DAY_MS:
+            rows = [r for r in self.candles(symbol)
+                    if (start is None or r["openTime"] >= start) and (end is None or r["openTime"] <= end)]
+            rows = rows[:limit] if start is not None else rows[-limit:]
+        else:
+            now = int(time.time() * 1000)
+            last_open = (min(end, now) if end else now) // step * step
+            first_open = max(start // step * step, last_open - (limit - 1) * step) if start else last_open - (limit - 1) * step
+            base = self.price(symbol)
+            rows = []
+            for ot in range(first_open, last_open + 1, step):
+                rng = random.Random(hash((symbol, ot)))
+                o = base * math.exp(rng.gauss(0, 0.004))
+                c = base * math.exp(rng.gauss(0, 0.004))
+                rows.append({
+                    "openTime": ot, "open": o, "high": max(o, c) * (1 + abs(rng.gauss(0, 0.003))),
+                    "low": min(o, c) * (1 - abs(rng.gauss(0, 0.003))), "close": c,
+                    "volume": rng.uniform(1e3, 1e5), "closeTime": ot + step - 1,
+                })
+        return [
+            [r["openTime"], f"{r['open']:.8f}", f"{r['high']:.8f}", f"{r['low']:.8f}", f"{r['close']:.8f}",
+             f"{r['volume']:.8f}", r["closeTime"], f"{r['volume'] * r['close']:.8f}", 0, "0", "0", "0"]
+            for r in rows
+        ]
+
+    def ticker_24hr(self, symbol: str) -> Dict[str, Any]:
+        last = self.candles(symbol)[-1]
+        price = self.price(symbol)
+        now = int(time.time() * 1000)
+        return {
+            "symbol": symbol,
+            "openPrice": f"{last['open']:.8f}",
+            "highPrice": f"{max(last['high'], price):.8f}",
+            "lowPrice": f"{min(last['low'], price):.8f}",
+            "lastPrice": f"{price:.8f}",
+            "priceChangePercent": f"{(price / last['open'] - 1) * 100:.3f}",
+            "volume": f"{last['volume']:.8f}",
+            "quoteVolume": f"{last['volume'] * price:.8f}",
+            "openTime": now - DAY_MS,
+            "closeTime": now,
+        }
+
+    def exchange_info(self) -> Dict[str, Any]:
+        return {
+            "timezone": "UTC",
+            "serverTime": int(time.time() * 1000),
+            "symbols": [
+                {
+                    "symbol": s, "status": "TRADING", "baseAsset": s[:-4], "quoteAsset": "USDT",
+                    "filters": [
+                        {"filterType": "PRICE_FILTER", "minPrice": f"{self.tick_size(s):.12f}",
+                         "maxPrice": "1000000.00000000", "tickSize": f"{self.tick_size(s):.12f}"},
+                        {"filterType": "LOT_SIZE", "minQty": "0.00100000", "maxQty": "9000000.00000000", "stepSize": "0.00100000"},
+                    ],
+                }
+                for s in self.symbols
+            ],
+        }
+
+    def coin_markets(self, per_page: int, page: int) -> List[Dict[str, Any]]:
+        ranked = self.symbols[(page - 1) * per_page: page * per_page]
+        out = []
+        for i, s in enumerate(ranked, start=(page - 1) * per_page + 1):
+            price = self.price(s)
+            out.append({
+                "id": s[:-4].lower(), "symbol": s[:-4].lower(), "name": f"Synthetic {s[:-4]}",
+                "current_price": price, "market_cap": price * 1e9 / i, "market_cap_rank": i,
+                "price_change_percentage_24h": (price / self.candles(s)[-1]["open"] - 1) * 100,
+            })
+        return out
+
+
+# ===== 서버 =====
+
+class SimExchange:
+    def __init__(self, market: SimMarket, faults: FaultConfig):
+        self.market = market
+        self.faults = faults
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._minute = -1
+        self._weight = 0
+        self._cg_minute = -1
+        self._cg_calls = 0
+        self._rng = random.Random(market.seed + 1)
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, path: str, status: int) -> None:
+        with self._lock:
+            per = self.stats.setdefault(path, {})
+            per[str(status)] = per.get(str(status), 0) + 1
+
+    def _in_burst(self, now: float) -> bool:
+        f = self.faults
+        return f.burst_every > 0 and f.burst_len > 0 and (now - self.started) % f.burst_every < f.burst_len
+
+    def admit(self, path: str, all_symbols: bool) -> Tuple[Optional[int], Dict[str, str]]:
+        """(오류 상태 코드 또는 None, 응답 헤더)"""
+        f = self.faults
+        now = time.time()
+        minute = int(now // 60)
+        retry_after = str(max(f.retry_after, 1))
+        with self._lock:
+            if path == "/api/v3/coins/markets":
+                if minute != self._cg_minute:
+                    self._cg_minute, self._cg_calls = minute, 0
+                self._cg_calls += 1
+                if f.cg_limit and self._cg_calls > f.cg_limit:
+                    return 429, {"Retry-After": str(60 - int(now % 60))}
+                headers: Dict[str, str] = {}
+            else:
+                if minute != self._minute:
+                    self._minute, self._weight = minute, 0
+                single, bulk = WEIGHTS.get(path, (1, 1))
+                self._weight += bulk if all_symbols else single
+                headers = {"X-MBX-USED-WEIGHT-1M": str(self._weight)}
+                if f.weight_limit and self._weight > f.weight_limit:
+                    headers["Retry-After"] = str(60 - int(now % 60))
+                    return 429, headers
+            r = self._rng.random()
+        if r < f.p429:
+            headers["Retry-After"] = retry_after
+            return 429, headers
+        if self._in_burst(now) or r < f.p429 + f.p5xx:
+            return f.burst_status if self._in_burst(now) else 500, headers
+        return None, headers
+
+    def handle(self, path: str, q: Dict[str, str]) -> Tuple[int, Any, Dict[str, str]]:
+        m = self.market
+        if path == "/sim/stats":
+            return 200, {"uptime_sec": round(time.time() - self.started, 1), "faults": asdict(self.faults),
+                         "used_weight": self._weight, "responses": self.stats}, {}
+        if path == "/sim/config":
+            self.faults.update(q)
+            return 200, asdict(self.faults), {}
+
+        symbol = q.get("symbol")
+        if path not in WEIGHTS and path != "/api/v3/coins/markets":
+            return 404, {"code": -1, "msg": "Not found."}, {}
+        status, headers = self.admit(path, all_symbols=symbol is None)
+        if self.faults.latency_ms or self.faults.jitter_ms:
+            delay = self.faults.latency_ms + self._rng.expovariate(1.0 / self.faults.jitter_ms) if self.faults.jitter_ms else self.faults.latency_ms
+            time.sleep(delay / 1000.0)
+        if status is not None:
+            msg = "Too many requests." if status == 429 else "Service unavailable."
+            return status, {"code": -1003 if status == 429 else -1001, "msg": msg}, headers
+        if symbol is not None and symbol not in m:
+            return 400, {"code": -1121, "msg": "Invalid symbol."}, headers
+
+        if path == "/api/v3/klines":
+            if symbol is None:
+                return 400, {"code": -1102, "msg": "Mandatory parameter 'symbol' was not sent."}, headers
+            try:
+                limit = min(1500, int(q.get("limit", 500)))
+                start = int(q["startTime"]) if "startTime" in q else None
+                end = int(q["endTime"]) if "endTime" in q else None
+                return 200, m.klines(symbol, q.get("interval", "1d"), start, end, limit), headers
+            except ValueError as e:
+                return 400, {"code": -1120, "msg": str(e)}, headers
+        if path == "/api/v3/ticker/price":
+            if symbol:
+                return 200, {"symbol": symbol, "price": f"{m.price(symbol):.8f}"}, headers
+            return 200, [{"symbol": s, "price": f"{m.price(s):.8f}"} for s in m.symbols], headers
+        if path == "/api/v3/ticker/24hr":
+            if symbol:
+                return 200, m.ticker_24hr(symbol), headers
+            return 200, [m.ticker_24hr(s) for s in m.symbols], headers
+        if path == "/api/v3/exchangeInfo":
+            return 200, m.exchange_info(), headers
+        per_page = int(q.get("per_page", 100))
+        page = int(q.get("page", 1))
+        return 200, m.coin_markets(per_page, page), headers
+
+
+def start_server(exchange: SimExchange, port: int = DEFAULT_PORT, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    class _Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True  # 헤더/본문 분리 전송 시 delayed-ACK 40ms 지연 방지
+
+        def do_GET(self):
+            u = urlparse(self.path)
+            q = {k: v[-1] for k, v in parse_qs(u.query).items()}
+            try:
+                status, payload, headers = exchange.handle(u.path, q)
+            except Exception as e:  # 서버 내부 오류도 5xx 로 응답
+                status, payload, headers = 500, {"code": -1000, "msg": str(e)}, {}
+            exchange._count(u.path, status)
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json;charset=UTF-8")
+            self.send_header("Content-Length", str(len(body)))
+            for k, v in headers.items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            return
+
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="sim-exchange", daemon=True).start()
+    print(f"모의 거래소: http://{host}:{port} (심볼 {len(exchange.market.symbols)}개, {exchange.market.days}일)")
+    return server
+
+
+# ===== 부하 테스트 =====
+
+LOADTEST_BACKOFF = 0.05
+LOADTEST_MAX_BACKOFF = 2.0
+
+def _workload(target: str):
+    """대상별 (작업 함수, 설명) — 실제 파이프라인 코드 경로를 그대로 호출"""
+    if target == "klines":
+        from core.phase1_5_core import get_binance_1d_ohlc_5y
+
+        return (lambda sym: bool(get_binance_1d_ohlc_5y(sym))), "core.phase1_5_core.get_binance_1d_ohlc_5y"
+    if target == "universe":
+        from universe_selector import URL_TOP, http_get
+
+        params = {"vs_currency": "usd", "order": "market_cap_desc", "per_page": 100, "page": 1}
+        return (lambda sym: bool(http_get(URL_TOP, params))), "universe_selector.http_get"
+    if target == "monitor":
+        from crypto_realtime_monitor import CryptoRealtimeMonitor
+
+        monitor = CryptoRealtimeMonitor(alert_history_file=os.devnull)
+
+        def _price_and_low(sym: str) -> bool:
+            base = sym[:-4]
+            return monitor.get_current_price(base) is not None and monitor.get_candle_low(base) is not None
+
+        return _price_and_low, "CryptoRealtimeMonitor.get_current_price + get_candle_low"
+    raise ValueError(target)
+
+
+def run_loadtest(target: str, symbols: List[str], concurrency: int, duration: float) -> Dict[str, Any]:
+    func, label = _workload(target)
+    latencies: List[float] = []
+    failures = 0
+    lock = threading.Lock()
+    deadline = time.time() + duration
+    counter = iter(range(10 ** 12))
+
+    def _worker() -> None:
+        nonlocal failures
+        backoff = 0.0
+        while time.time() < deadline:
+            sym = symbols[next(counter) % len(symbols)]
+            t0 = time.perf_counter()
+            try:
+                ok = func(sym)
+            except Exception:
+                ok = False
+            elapsed = time.perf_counter() - t0
+            with lock:
+                latencies.append(elapsed)
+                failures += 0 if ok else 1
+            # 실패 시 지수 백오프 (회로 차단 등 즉시 실패가 반복될 때 빈 루프 방지), 성공하면 초기화
+            backoff = 0.0 if ok else min(max(backoff * 2, LOADTEST_BACKOFF), LOADTEST_MAX_BACKOFF)
+            if backoff:
+                time.sleep(min(backoff, max(0.0, deadline - time.time())))
+
+    print(f"부하 테스트: {label} — 동시성 {concurrency}, {duration:.0f}초")
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(_worker)
+    wall = time.perf_counter() - started
+    return {
+        "target": target,
+        "calls": len(latencies),
+        "failures": failures,
+        "calls_per_sec": round(len(latencies) / wall, 2) if wall else None,
+        **{f"p{q}_ms": round((percentile(latencies, q) or 0) * 1000, 1) for q in (50, 95, 99)},
+        "max_ms": round(max(latencies) * 1000, 1) if latencies else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 모의 거래소 (Binance/CoinGecko 호환) + 부하 테스트")
+    parser.add_argument("command", choices=["serve", "loadtest"])
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--url", help="loadtest: 이미 실행 중인 모의 거래소 주소 (없으면 내부에서 시작)")
+    parser.add_argument("--symbols", type=int, default=100, help="합성 심볼 수")
+    parser.add_argument("--days", type=int, default=1500, help="심볼당 일봉 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--target", choices=["klines", "universe", "monitor"], default="monitor", help="loadtest 대상 코드 경로")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=30.0, help="loadtest 시간(초)")
+    for f in fields(FaultConfig):
+        parser.add_argument(f"--{f.name.replace('_', '-')}", type=type(f.default), default=f.default)
+    args = parser.parse_args()
+
+    faults = FaultConfig(**{f.name: getattr(args, f.name) for f in fields(FaultConfig)})
+    market = SimMarket(args.symbols, args.days, args.seed)
+
+    if args.command == "serve":
+        start_server(SimExchange(market, faults), args.port)
+        print(f"장애 설정: {asdict(faults)}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            print("모의 거래소 종료")
+        return
+
+    exchange = None
+    url = args.url
+    if not url:
+        exchange = SimExchange(market, faults)
+        start_server(exchange, args.port)
+        url = f"http://127.0.0.1:{args.port}"
+
+    from core import http_client
+    from core.metrics import API_ERRORS, API_REQUESTS, HTTP_RETRIES
+
+    http_client.configure(sim_exchange=url)
+    result = run_loadtest(args.target, market.symbols, args.concurrency, args.duration)
+
+    print(f"\n{'='*60}")
+    print(f"호출 {result['calls']:,}건 ({result['calls_per_sec']}/s), 실패 {result['failures']:,}건")
+    print(f"지연 p50 {result['p50_ms']}ms / p95 {result['p95_ms']}ms / p99 {result['p99_ms']}ms / max {result['max_ms']}ms")
+    errors = sum(API_ERRORS._values.values())
+    if errors:
+        print(f"클라이언트가 받은 429/5xx: {errors:.0f}건")
+    retries = sum(HTTP_RETRIES._values.values())
+    no_response = sum(v for k, v in API_REQUESTS._values.items() if k[-1] == "error")
+    print(f"재시도 {retries:.0f}건, 응답 없음(연결 실패/회로 차단) {no_response:.0f}건")
+    if exchange:
+        print(f"서버 응답 통계: {json.dumps(exchange.stats, ensure_ascii=False)}")
+    print(f"{'='*60}")
+
+
+if __name__ == "__main__":
+    main()
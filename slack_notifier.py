@@ -2,11 +2,13 @@
 Slack 알람 전송 모듈
 """
 import os
-import requests
 import logging
 from typing import Optional
 from dotenv import load_dotenv
 
+from core import http_client
+from core.triggers import ALERT_TITLES, BUY
+
 # 환경 변수 로드
 load_dotenv()
 
@@ -56,7 +58,7 @@ def _send_slack_message(message: str, parse_html: bool = True, blocks: list = No
                 "text": slack_message
             }
         
-        response = requests.post(SLACK_WEBHOOK_URL, json=payload, timeout=10)
+        response = http_client.post(SLACK_WEBHOOK_URL, json=payload, timeout=10)
         response.raise_for_status()
         
         logger.info("✓ Slack 전송 성공")
@@ -156,10 +158,11 @@ def _send_slack_alert(alert_data: dict) -> bool:
         # Block Kit blocks 생성
         blocks = []
         
-        # Header
-        header_text = "✅ 매수 목표 접근 알림"
+        # Header (트리거 종류별 제목, 기본: 매수 목표)
+        title = ALERT_TITLES.get(alert_data.get('kind', BUY), ALERT_TITLES[BUY])
+        header_text = f"✅ {title}"
         if is_first:
-            header_text = "✅ 매수 목표 접근 알림 (첫 자리)"
+            header_text = f"✅ {title} (첫 자리)"
         
         blocks.append({
             "type": "header",
@@ -243,7 +246,7 @@ def _send_slack_alert(alert_data: dict) -> bool:
         })
         
         # Fallback 텍스트
-        fallback_text = f"매수 목표 접근 알림: {alert_data.get('name', '')} ({alert_data.get('symbol', '')})"
+        fallback_text = f"{title}: {alert_data.get('name', '')} ({alert_data.get('symbol', '')})"
         
         return _send_slack_message(fallback_text, parse_html=False, blocks=blocks)
         
@@ -320,17 +323,57 @@ def _send_slack_buy_execution_alert(execution_data: dict, price_data: dict, curr
         return False
 
 
+def _send_slack_leaderboard_digest(entries: list) -> bool:
+    """
+    매수 목표 근접 Top-K 다이제스트를 Slack으로 전송
+
+    Args:
+        entries: DivergenceLeaderboard.as_dicts() 결과
+
+    Returns:
+        bool: 전송 성공 여부
+    """
+    try:
+        lines = [
+            f"{e['rank']:>2}. {e['symbol']:<6} {e['target']:<3} "
+            f"${format_price(e['target_price'], e.get('h_value'))} ({e['divergence']:+.2f}%)"
+            for e in entries
+        ]
+        blocks = [
+            {
+                "type": "header",
+                "text": {"type": "plain_text", "text": f"🏁 매수 목표 근접 Top {len(entries)}", "emoji": True}
+            },
+            {
+                "type": "rich_text",
+                "elements": [
+                    {
+                        "type": "rich_text_preformatted",
+                        "elements": [{"type": "text", "text": "\n".join(lines)}]
+                    }
+                ]
+            },
+        ]
+        return _send_slack_message(f"매수 목표 근접 Top {len(entries)}", parse_html=False, blocks=blocks)
+
+    except Exception as e:
+        logger.error(f"Slack 리더보드 다이제스트 포맷팅 실패: {e}")
+        return False
+
+
 # Slack Webhook URL이 없으면 함수들을 None으로 설정
 if not SLACK_WEBHOOK_URL:
     logger.info("Slack Webhook URL이 설정되지 않았습니다. Slack 알림 기능을 비활성화합니다.")
     send_slack_alert = None
     send_slack_buy_execution_alert = None
+    send_slack_leaderboard_digest = None
     send_slack_message = None
 else:
     # 함수들을 export
     send_slack_message = _send_slack_message
     send_slack_alert = _send_slack_alert
     send_slack_buy_execution_alert = _send_slack_buy_execution_alert
+    send_slack_leaderboard_digest = _send_slack_leaderboard_digest
 
 
 # 테스트용
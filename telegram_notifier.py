@@ -2,11 +2,12 @@
 텔레그램 알람 전송 모듈
 """
 import os
-import requests
 import logging
 from typing import List, Optional
 from dotenv import load_dotenv
 
+from core import http_client
+
 # 환경 변수 로드
 load_dotenv()
 
@@ -70,7 +71,7 @@ def send_telegram_message(message: str, recipients: List[str] = None, parse_mode
                 "parse_mode": parse_mode
             }
             
-            response = requests.post(TELEGRAM_API_URL, json=payload, timeout=10)
+            response = http_client.post(TELEGRAM_API_URL, json=payload, timeout=10)
             response.raise_for_status()
             
             logger.info(f"✓ 텔레그램 전송 성공: {recipient}")
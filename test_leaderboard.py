@@ -0,0 +1,89 @@
+"""
+매수 목표 근접 리더보드 테스트 (core.leaderboard)
+"""
+import sys
+import os
+import random
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from core.leaderboard import DivergenceLeaderboard
+
+
+def test_ranks_are_board_positions():
+    """info 에 시총 순위(market_rank / rank)가 있어도 rank 는 1..N"""
+    board = DivergenceLeaderboard()
+    for i, (sym, price) in enumerate([("SOL", 104.0), ("ETH", 101.0), ("ADA", 110.0), ("XRP", 99.5)]):
+        board.update(sym, price, "B1", 100.0, name=sym, market_rank=57 + i, rank=57 + i)
+    entries = board.as_dicts(10)
+    assert [e["rank"] for e in entries] == [1, 2, 3, 4]
+    assert [e["symbol"] for e in entries] == ["XRP", "ETH", "SOL", "ADA"]
+    assert entries[0]["market_rank"] == 60
+
+
+def test_update_replaces_previous_entry():
+    board = DivergenceLeaderboard()
+    board.update("SOL", 120.0, "B1", 100.0)
+    board.update("ETH", 105.0, "B1", 100.0)
+    board.update("SOL", 101.0, "B2", 100.0)
+    entries = board.as_dicts(10)
+    assert [(e["rank"], e["symbol"], e["target"]) for e in entries] == [(1, "SOL", "B2"), (2, "ETH", "B1")]
+
+
+def test_top_is_read_only_and_matches_sort():
+    board = DivergenceLeaderboard()
+    rng = random.Random(0)
+    prices = {}
+    for _ in range(2000):
+        sym = f"S{rng.randrange(300)}"
+        prices[sym] = rng.uniform(50, 150)
+        board.update(sym, prices[sym], "B1", 100.0)
+    heap_before = list(board._heap)
+    expected = sorted(prices, key=lambda s: abs(prices[s] - 100.0))[:20]
+    assert [e.symbol for e in board.top(20)] == expected
+    assert board._heap == heap_before
+
+
+def test_concurrent_update_and_read():
+    """모니터 스레드 update 와 HTTP 스레드 as_dicts 를 동시에"""
+    board = DivergenceLeaderboard()
+    symbols = [f"S{i}" for i in range(200)]
+    stop = threading.Event()
+    errors = []
+
+    def _writer(seed):
+        rng = random.Random(seed)
+        while not stop.is_set():
+            board.update(rng.choice(symbols), rng.uniform(50, 150), "B1", 100.0)
+
+    def _reader():
+        while not stop.is_set():
+            try:
+                entries = board.as_dicts(20)
+                dists = [abs(e["divergence"]) for e in entries]
+                assert dists == sorted(dists)
+                assert len({e["symbol"] for e in entries}) == len(entries)
+            except Exception as e:
+                errors.append(e)
+                return
+
+    threads = [threading.Thread(target=_writer, args=(i,)) for i in range(2)] + [threading.Thread(target=_reader) for _ in range(2)]
+    for t in threads:
+        t.start()
+    threading.Event().wait(1.0)
+    stop.set()
+    for t in threads:
+        t.join()
+    assert not errors, errors[0]
+    final = {e.symbol: e.distance for e in board.top(len(symbols))}
+    assert len(final) == len(board)
+    assert sorted(final.values())[:20] == [e.distance for e in board.top(20)]
+
+
+if __name__ == "__main__":
+    test_ranks_are_board_positions()
+    test_update_replaces_previous_entry()
+    test_top_is_read_only_and_matches_sort()
+    test_concurrent_update_and_read()
+    print("[성공] 리더보드 테스트 통과")
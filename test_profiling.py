@@ -0,0 +1,55 @@
+"""
+단계별 프로파일러 테스트 (core.profiling) — 여러 스레드가 동시에 단계를 중첩할 때
+"""
+import sys
+import os
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from core.profiling import PipelineProfiler
+
+OUTER_SEC = 0.05
+INNER_SEC = 0.10
+ROUNDS = 5
+
+
+def test_two_threads_nesting_stages():
+    """스레드마다 outer 안에 inner — self time 이 서로 섞이거나 음수가 되지 않는지"""
+    profiler = PipelineProfiler()
+    profiler.enable("test", top_n=0)
+    barrier = threading.Barrier(2)
+
+    def _work(symbol: str, inner: str):
+        barrier.wait()
+        with profiler.symbol(symbol):
+            for _ in range(ROUNDS):
+                with profiler.stage("outer"):
+                    time.sleep(OUTER_SEC)
+                    with profiler.stage(inner):
+                        time.sleep(INNER_SEC)
+
+    threads = [threading.Thread(target=_work, args=(f"SYM{i}", f"inner{i}")) for i in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    report = profiler.report()
+    stages = report["stages"]
+    assert stages["outer"]["count"] == 2 * ROUNDS
+    assert stages["inner0"]["count"] == stages["inner1"]["count"] == ROUNDS
+    # outer 의 self time 에는 inner 시간이 빠져야 한다 (두 스레드 합)
+    assert 2 * ROUNDS * OUTER_SEC * 0.9 <= stages["outer"]["total_sec"] < 2 * ROUNDS * (OUTER_SEC + INNER_SEC * 0.5)
+    for row in report["symbols"]:
+        i = row["symbol"][-1]
+        assert set(row["stages"]) == {"outer", f"inner{i}"}
+        assert all(v > 0 for v in row["stages"].values())
+        assert row["stages"][f"inner{i}"] >= ROUNDS * INNER_SEC * 0.9
+        assert row["stages"]["outer"] < ROUNDS * (OUTER_SEC + INNER_SEC * 0.5)
+
+
+if __name__ == "__main__":
+    test_two_threads_nesting_stages()
+    print("[성공] 프로파일러 테스트 통과")
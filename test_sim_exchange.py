@@ -0,0 +1,58 @@
+"""
+모의 거래소 핸들러 테스트 — 새 시장에서 엔드포인트마다 한 번씩 호출 (처음 보는 심볼에서 멈추지 않는지)
+"""
+import sys
+import os
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sim_exchange import FaultConfig, SimExchange, SimMarket
+
+TIMEOUT = 10.0
+
+ENDPOINTS = [
+    ("/api/v3/ticker/price", {"symbol": 0}),
+    ("/api/v3/ticker/price", {}),
+    ("/api/v3/ticker/24hr", {"symbol": 1}),
+    ("/api/v3/ticker/24hr", {}),
+    ("/api/v3/klines", {"symbol": 2, "interval": "1d", "limit": "30"}),
+    ("/api/v3/klines", {"symbol": 3, "interval": "5m", "limit": "12"}),
+    ("/api/v3/exchangeInfo", {}),
+    ("/api/v3/coins/markets", {"per_page": "5", "page": "1"}),
+]
+
+
+def _call(exchange, path, q):
+    """다른 스레드에서 handle() — TIMEOUT 안에 끝나지 않으면 멈춘 것으로 본다"""
+    result = {}
+    t = threading.Thread(target=lambda: result.setdefault("out", exchange.handle(path, q)), daemon=True)
+    t.start()
+    t.join(TIMEOUT)
+    assert "out" in result, f"{path} {q}: {TIMEOUT}초 안에 응답 없음"
+    return result["out"]
+
+
+def test_each_handler_on_fresh_market():
+    """엔드포인트별로 새 시장을 만들어 첫 호출이 200 으로 끝나는지"""
+    for path, q in ENDPOINTS:
+        market = SimMarket(5, 100)
+        exchange = SimExchange(market, FaultConfig())
+        q = {k: market.symbols[v] if k == "symbol" else v for k, v in q.items()}
+        status, body, _ = _call(exchange, path, q)
+        assert status == 200, f"{path} {q}: {status} {body}"
+        assert body, f"{path} {q}: 빈 응답"
+
+
+def test_price_on_fresh_symbol():
+    market = SimMarket(5, 100)
+    sym = market.symbols[0]
+    status, body, _ = _call(SimExchange(market, FaultConfig()), "/api/v3/ticker/price", {"symbol": sym})
+    assert status == 200
+    assert abs(float(body["price"]) / market.candles(sym)[-1]["close"] - 1) < 0.05
+
+
+if __name__ == "__main__":
+    test_each_handler_on_fresh_market()
+    test_price_on_fresh_symbol()
+    print("[성공] 모의 거래소 핸들러 테스트 통과")
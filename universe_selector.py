@@ -16,7 +16,10 @@
 from typing import List, Tuple, Dict, Any
 import requests
 import os
-import time
+
+from core import http_client
+from core.symbol_index import symbol_index
+from core.universe_store import universe_store
 
 try:
     import pandas as pd
@@ -33,6 +36,13 @@ URL_TOP = "https://api.coingecko.com/api/v3/coins/markets"
 
 EXCLUDE_SYMBOLS = {"WBTC", "WETH", "WBETH", "STETH", "WSTETH", "WEETH", "USD1", "BFUSD", "BNSOL", "BNB", "ENA"}
 EXCLUDE_NAME_KEYWORDS = {"WRAPPED", "BRIDGE"}
+MARKET_PARAMS = {
+    "vs_currency": VS_CURRENCY,
+    "order": "market_cap_desc",
+    "per_page": 100,  # CoinGecko API 한 번에 최대 250개까지 가능
+    "price_change_percentage": "24h",
+    "locale": "en",
+}
 
 
 # -----------------------------
@@ -40,45 +50,52 @@ EXCLUDE_NAME_KEYWORDS = {"WRAPPED", "BRIDGE"}
 # -----------------------------
 def http_get(url: str, params: dict) -> list:
     headers = {"User-Agent": "Mozilla/5.0"}
-    backoff = 1.0
-    for _ in range(6):
-        try:
-            resp = requests.get(url, params=params, headers=headers, timeout=20)
-            if resp.status_code == 200:
-                return resp.json()
-            if resp.status_code in (429, 500, 502, 503, 504):
-                time.sleep(backoff)
-                backoff = min(backoff * 1.8, 10)
-                continue
-            print(f"[HTTP {resp.status_code}] {resp.text[:100]}")
-            return []
-        except requests.RequestException:
-            time.sleep(backoff)
-            backoff = min(backoff * 1.8, 10)
+    try:
+        resp = http_client.get(url, params=params, headers=headers, timeout=20, retry=http_client.DEFAULT_RETRY)
+    except requests.RequestException as e:
+        print(f"[HTTP] {e}")
+        return []
+    if resp.status_code == 200:
+        return resp.json()
+    print(f"[HTTP {resp.status_code}] {resp.text[:100]}")
     return []
 
 
 # -----------------------------
 # 코인: CoinGecko 기준 시가총액 Top 30
 # -----------------------------
-def get_top30_coins() -> List[Dict[str, Any]]:
-    """CoinGecko 기준 시가총액 Top 100 코인 + CSV 저장"""
+def get_market_page(page: int = 1) -> list:
+    """CoinGecko markets 페이지 1개 (유니버스 스냅샷 TTL 안이면 재사용)"""
+    store = universe_store()
+    snap = store.fresh()
+    if snap and page in snap.pages:
+        return snap.pages[page]
+    data = http_get(URL_TOP, {**MARKET_PARAMS, "page": page})
+    if data and isinstance(data, list):
+        pages = dict(snap.pages) if snap else {}
+        pages[page] = data
+        store.save(pages, snap.universe if snap else None)
+    return data
+
+
+def get_top30_coins(refresh: bool = False) -> List[Dict[str, Any]]:
+    """CoinGecko 기준 시가총액 Top 100 코인 + CSV 저장 (TTL 안이면 유니버스 스냅샷 재사용)"""
     coins = []
+    index = symbol_index()  # Binance 미상장/거래중지 페어는 Top N 에 넣지 않음
+    store = universe_store()
+    snap = None if refresh else store.fresh()
+    pages = dict(snap.pages) if snap else {}
+    fetched = False
     page = 1
-    per_page = 100  # CoinGecko API 한 번에 최대 250개까지 가능
-    
+
     # 필터링 후 TOP_N개 수집될 때까지 반복
     while len(coins) < TOP_N:
-        params = {
-            "vs_currency": VS_CURRENCY,
-            "order": "market_cap_desc",
-            "per_page": per_page,
-            "page": page,
-            "price_change_percentage": "24h",
-            "locale": "en",
-        }
-
-        data = http_get(URL_TOP, params)
+        data = pages.get(page)
+        if data is None:
+            data = http_get(URL_TOP, {**MARKET_PARAMS, "page": page})
+            if data and isinstance(data, list):
+                pages[page] = data
+                fetched = True
         if not data or not isinstance(data, list):
             print(f"CoinGecko page {page} failed")
             break
@@ -103,6 +120,8 @@ def get_top30_coins() -> List[Dict[str, Any]]:
                 continue
             if any(k in name.upper() for k in EXCLUDE_NAME_KEYWORDS):
                 continue
+            if index.rejection(sym):
+                continue
 
             rank = row.get("market_cap_rank", len(coins) + 1)
             coins.append({
@@ -122,6 +141,15 @@ def get_top30_coins() -> List[Dict[str, Any]]:
         if page > 3:
             break
 
+    # 유니버스 스냅샷 (새로 받은 페이지가 있거나 선정 결과가 바뀐 경우만 새 버전)
+    if coins and (fetched or snap is None or snap.universe != coins):
+        snap = store.save(pages, coins)
+        diff = store.diff()
+        if diff is not None:
+            print(diff.summary())
+    elif snap is not None:
+        print(f"유니버스 스냅샷 v{snap.version} 재사용 ({snap.age_sec / 60:.0f}분 전)")
+
     # CSV 저장
     os.makedirs("debug", exist_ok=True)
     csv_path = os.path.join("debug", "top_list_coin.csv")
@@ -205,9 +233,23 @@ if __name__ == "__main__":
 
     ap = argparse.ArgumentParser()
     ap.add_argument("--asset", choices=["coin", "us"], default="coin")
+    ap.add_argument("--refresh", action="store_true", help="스냅샷 TTL 무시하고 CoinGecko 재조회 (coin)")
+    ap.add_argument("--diff", nargs="*", type=int, metavar="VERSION",
+                    help="유니버스 diff 만 출력 (인자 없음: 최신 vs 직전, 2개: OLD NEW)")
     args = ap.parse_args()
 
-    data = get_universe(args.asset)
+    if args.diff is not None:
+        versions = (args.diff + [None, None])[:2] if len(args.diff) == 2 else [None, None]
+        d = universe_store().diff(*versions)
+        if d is None:
+            print("유니버스 스냅샷이 없습니다.")
+        else:
+            print(d.summary())
+            for sym, (old, new) in sorted(d.rank_changes.items(), key=lambda x: x[1][1]):
+                print(f"  {sym:<12} {old:>3} → {new:>3}")
+        raise SystemExit(0)
+
+    data = get_top30_coins(refresh=args.refresh) if args.asset == "coin" else get_universe(args.asset)
 
     print("=" * 60)
     print(f"{args.asset.upper()} 리스트 ({len(data)}개)")